@@ -15,6 +15,7 @@
 """
 import sys
 
+from cibyl.exceptions.output import OutputError
 from cibyl.orchestrator import Orchestrator
 
 
@@ -51,8 +52,26 @@ def main():
     # from the CI models
     orchestrator.parser.app_args, orchestrator.parser.ci_args = \
         orchestrator.parser.parse()
-    orchestrator.run_query()
-    orchestrator.publisher.publish(orchestrator.environments)
+    # Systems are published while they are still being queried
+    queries = orchestrator.start_query()
+    try:
+        orchestrator.publisher.stream(
+            orchestrator.environments, queries,
+            dest=orchestrator.parser.app_args.get('output_file', "terminal"),
+            output_format=orchestrator.parser.app_args.get('output_format'))
+    except OutputError as error:
+        orchestrator.cancel_queries(queries, error)
+        sys.exit(f"cibyl: {error}")
+    except BaseException as error:
+        # Queries left behind would keep the process alive
+        orchestrator.cancel_queries(queries, error)
+        raise
+    if orchestrator.parser.app_args.get('watch'):
+        try:
+            orchestrator.watch(orchestrator.parser.app_args['watch'])
+        except KeyboardInterrupt:
+            pass
+    orchestrator.report_timings()
 
 
 if __name__ == "__main__":
@@ -17,6 +17,7 @@ import argparse
 import logging
 
 from cibyl.cli.argument import Argument
+from cibyl.outputs import FORMATS
 
 LOG = logging.getLogger(__name__)
 
@@ -70,6 +71,33 @@ class Parser:
             '--config', '-c', dest="config_file_path")
         self.argument_parser.add_argument(
             '--plugin', '-p', dest="plugin", default="openstack")
+        self.argument_parser.add_argument(
+            '--max-workers', type=int, dest="max_workers",
+            help='maximum number of systems queried concurrently')
+        self.argument_parser.add_argument(
+            '--no-cache', action='store_true', dest="no_cache",
+            help='do not read or store responses on the local cache')
+        self.argument_parser.add_argument(
+            '--refresh', action='store_true', dest="refresh",
+            help='ignore responses on the local cache and fetch them again')
+        self.argument_parser.add_argument(
+            '--timings', action='store_true', dest="timings",
+            help='print a summary of the time spent on each source request')
+        self.argument_parser.add_argument(
+            '--timings-file', dest="timings_file",
+            help='write the time spent on each source request to a JSON file')
+        self.argument_parser.add_argument(
+            '--watch', type=float, nargs='?', const=5.0, dest="watch",
+            metavar='INTERVAL',
+            help='keep polling the status of the systems every INTERVAL '
+                 'seconds (5 by default), printing what changed')
+        self.argument_parser.add_argument(
+            '--output-format', choices=FORMATS, dest="output_format",
+            help='publish the output in a machine-readable format instead '
+                 'of text (parquet requires pyarrow)')
+        self.argument_parser.add_argument(
+            '--output-file', dest="output_file",
+            help='write the output to a file instead of the terminal')
 
     def parse(self, arguments=None):
         """Parses app_arguments
@@ -13,28 +13,82 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 """
-from dataclasses import dataclass
-
 from cibyl.cli.argument import Argument
 
 
-@dataclass
 class AttributeValue():
-    """Represents the value used by the attributes of the different models"""
+    """Represents the value used by the attributes of the different models.
+
+    Only the name and value are kept on each instance. The type and
+    arguments of the attribute are static, so they are read from its entry
+    on the :attr:`cibyl.models.model.Model.API` of the model, which is
+    shared by all instances of it.
+    """
+
+    __slots__ = ('name', 'value', 'spec')
+
+    def __init__(self, name: str, attr_type: object = None,
+                 value: object = None, arguments: list[Argument] = None,
+                 spec: dict = None):
+        """Constructor.
+
+        :param name: Name of the attribute.
+        :type name: str
+        :param attr_type: Type of the attribute. Ignored if 'spec' is given.
+        :type attr_type: object
+        :param value: Value of the attribute.
+        :type value: object
+        :param arguments: Arguments that filter by the attribute. Ignored if
+            'spec' is given.
+        :type arguments: list[:class:`cibyl.cli.argument.Argument`]
+        :param spec: Entry of the attribute on the API of its model.
+        :type spec: dict
+        """
+        if spec is None:
+            spec = {'attr_type': attr_type, 'arguments': arguments}
+
+        self.name = name
+        self.value = value
+        self.spec = spec
+
+    @property
+    def attr_type(self):
+        """
+        :return: Type of the attribute.
+        :rtype: object
+        """
+        return self.spec.get('attr_type')
 
-    name: str
-    attr_type: object
-    value: object = None
-    arguments: list[Argument] = None
+    @property
+    def arguments(self):
+        """
+        :return: Arguments that filter by the attribute.
+        :rtype: list[:class:`cibyl.cli.argument.Argument`]
+        """
+        return self.spec.get('arguments')
+
+    def __eq__(self, other):
+        if not isinstance(other, AttributeValue):
+            return NotImplemented
+        return (self.name, self.value, self.attr_type, self.arguments) == \
+            (other.name, other.value, other.attr_type, other.arguments)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(name={self.name!r}, " \
+               f"attr_type={self.attr_type!r}, value={self.value!r}, " \
+               f"arguments={self.arguments!r})"
 
 
 class AttributeListValue(AttributeValue):
     """Represents a list of AttributeValue objects"""
 
-    def __init__(self, name, arguments=None, attr_type=None, value=None):
+    __slots__ = ()
+
+    def __init__(self, name, arguments=None, attr_type=None, value=None,
+                 spec=None):
 
-        super().__init__(
-            name=name, arguments=arguments, attr_type=attr_type, value=value)
+        super().__init__(name=name, arguments=arguments, attr_type=attr_type,
+                         value=value, spec=spec)
 
         if isinstance(value, list):
             self.value = value
@@ -48,9 +102,90 @@ class AttributeListValue(AttributeValue):
         """
         self.value.append(item)
 
+    def __len__(self):
+        return len(self.value)
+
     def __getitem__(self, index):
         """
         :param index:
         :return:
         """
         return self.value[index]
+
+
+def get_key(item):
+    """
+    :param item: A model.
+    :type item: :class:`cibyl.models.model.Model`
+    :return: Value of the attribute that identifies the model, as named by
+        its :attr:`cibyl.models.model.Model.KEY`.
+    """
+    return getattr(item, item.KEY).value
+
+
+class IndexedAttributeListValue(AttributeListValue):
+    """Represents a list of models that keeps them indexed by their key, see
+    :attr:`cibyl.models.model.Model.KEY`, alongside the order they were
+    added in. Models must not be added to :attr:`value` directly, or they
+    will be missing from the index.
+    """
+
+    __slots__ = ('_items', '_index')
+
+    def __init__(self, name, arguments=None, attr_type=None, value=None,
+                 spec=None):
+        self._items = []
+        self._index = {}
+
+        super().__init__(name=name, arguments=arguments, attr_type=attr_type,
+                         value=value, spec=spec)
+
+    @property
+    def value(self):
+        """
+        :return: The models, in the order they were added in.
+        :rtype: list
+        """
+        return self._items
+
+    @value.setter
+    def value(self, items):
+        self._items = [] if items is None else items
+        self._index = {get_key(item): position
+                       for position, item in enumerate(self._items)}
+
+    def append(self, item):
+        """Adds a model, even if another one with the same key is there.
+
+        :param item: The model.
+        """
+        self._index[get_key(item)] = len(self._items)
+        self._items.append(item)
+
+    def upsert(self, item):
+        """Adds a model, or replaces the one with the same key in its place.
+
+        :param item: The model.
+        """
+        position = self._index.get(get_key(item))
+        if position is None:
+            self.append(item)
+        else:
+            self._items[position] = item
+
+    def get(self, key, default=None):
+        """
+        :param key: Key of a model.
+        :param default: What to return if there is no model with the key.
+        :return: The model with the key.
+        """
+        position = self._index.get(key)
+        return default if position is None else self._items[position]
+
+    def contains(self, key):
+        """
+        :param key: Key of a model.
+        :return: Whether there is a model with the key.
+        :rtype: bool
+        """
+        return key in self._index
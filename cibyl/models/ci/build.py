@@ -20,6 +20,11 @@ from cibyl.models.model import Model
 
 class Build(Model):
     """General model for a job build """
+
+    __slots__ = ('build_id', 'status')
+
+    KEY = 'build_id'
+
     API = {
         'build_id': {
             'attr_type': str,
@@ -36,11 +41,20 @@ class Build(Model):
     def __init__(self, build_id: str, status: str = None):
         super().__init__({'build_id': build_id, 'status': status})
 
-    def __str__(self):
-        build_str = f"Build: {self.build_id.value}"
+    def __str__(self, indent=0):
+        return "\n".join(self.iter_lines(indent))
+
+    def iter_lines(self, indent=0):
+        """Renders the build line by line.
+
+        :param indent: Number of spaces to indent the lines with.
+        :type indent: int
+        :return: The lines.
+        :rtype: :class:`typing.Iterator[str]`
+        """
+        yield indent*' ' + f"Build: {self.build_id.value}"
         if self.status.value:
-            build_str += f"\n  Status: {self.status.value}"
-        return build_str
+            yield (indent + 2)*' ' + f"Status: {self.status.value}"
 
     def __eq__(self, other):
         if not isinstance(other, self.__class__):
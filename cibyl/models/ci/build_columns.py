@@ -0,0 +1,276 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+from array import array
+from collections import Counter
+
+from cibyl.models.attribute import AttributeListValue
+from cibyl.models.ci.build import Build
+
+
+class BuildColumns(AttributeListValue):
+    """Holds the builds of a job column by column instead of as a list of
+    :class:`Build` models, for jobs with long histories.
+
+    Numeric build ids are kept on an array of integers, falling back to a
+    list of strings once an id that is not one comes in. Statuses are coded
+    as indexes on the list of statuses seen, and timestamps are kept as
+    milliseconds since the epoch. Builds are only modeled when looked up or
+    iterated over, aggregates are computed straight out of the columns.
+
+    Looking builds up by id, as :meth:`upsert` does, indexes them the first
+    time. Builds added through :meth:`add` alone never pay for it.
+    """
+
+    __slots__ = ('_ids', '_statuses', '_timestamps', '_categories', '_codes',
+                 '_positions')
+
+    MISSING_TIMESTAMP = -1
+    """Stands for the timestamp of builds that come without one."""
+
+    def __init__(self, name, arguments=None, attr_type=None, value=None,
+                 spec=None):
+        self._ids = array('q')
+        self._statuses = array('H')
+        self._timestamps = array('q')
+        self._categories = [None]
+        self._codes = {None: 0}
+        self._positions = None
+
+        super().__init__(name=name, arguments=arguments, attr_type=attr_type,
+                         value=value, spec=spec)
+
+    @property
+    def value(self):
+        """Models every build held. Meant for compatibility, it costs as
+        much as keeping them as models in the first place.
+
+        :return: The builds.
+        :rtype: list[:class:`Build`]
+        """
+        return list(self)
+
+    @value.setter
+    def value(self, builds):
+        self._ids = array('q')
+        self._statuses = array('H')
+        self._timestamps = array('q')
+        self._positions = None
+
+        for build in builds or []:
+            self.append(build)
+
+    def add(self, build_id, status=None, timestamp=None):
+        """Adds a build without modeling it.
+
+        :param build_id: Id of the build.
+        :type build_id: str
+        :param status: Status of the build.
+        :type status: str
+        :param timestamp: Time the build started at, in milliseconds since
+            the epoch.
+        :type timestamp: int
+        """
+        if isinstance(self._ids, array):
+            try:
+                number = int(build_id)
+            except ValueError:
+                number = None
+
+            if number is not None and str(number) == str(build_id):
+                self._ids.append(number)
+            else:
+                self._ids = [str(previous) for previous in self._ids]
+
+        if not isinstance(self._ids, array):
+            self._ids.append(str(build_id))
+
+        self._statuses.append(self._get_code(status))
+        self._timestamps.append(
+            self.MISSING_TIMESTAMP if timestamp is None else timestamp)
+
+        if self._positions is not None:
+            self._positions[str(build_id)] = len(self._statuses) - 1
+
+    def _get_position(self, build_id):
+        """
+        :param build_id: Id of a build.
+        :type build_id: str
+        :return: Position of the build. 'None' if it is not there.
+        :rtype: int or None
+        """
+        if self._positions is None:
+            self._positions = {str(build): position
+                               for position, build in enumerate(self._ids)}
+
+        return self._positions.get(str(build_id))
+
+    def _get_code(self, status):
+        """
+        :param status: A status.
+        :type status: str
+        :return: Code of the status, which is added if new.
+        :rtype: int
+        """
+        code = self._codes.get(status)
+        if code is None:
+            code = self._codes[status] = len(self._categories)
+            self._categories.append(status)
+        return code
+
+    def append(self, item):
+        """
+        :param item: Build to add.
+        :type item: :class:`Build`
+        """
+        self.add(item.build_id.value, item.status.value)
+
+    def upsert(self, item):
+        """Adds a build, or updates the status of the one with the same id.
+
+        :param item: The build.
+        :type item: :class:`Build`
+        """
+        position = self._get_position(item.build_id.value)
+        if position is None:
+            self.append(item)
+        else:
+            self._statuses[position] = self._get_code(item.status.value)
+
+    def get(self, key, default=None):
+        """
+        :param key: Id of a build.
+        :type key: str
+        :param default: What to return if there is no build with the id.
+        :return: The build with the id.
+        :rtype: :class:`Build`
+        """
+        position = self._get_position(key)
+        return default if position is None else self[position]
+
+    def contains(self, key):
+        """
+        :param key: Id of a build.
+        :type key: str
+        :return: Whether there is a build with the id.
+        :rtype: bool
+        """
+        return self._get_position(key) is not None
+
+    def __len__(self):
+        return len(self._statuses)
+
+    def __getitem__(self, index):
+        """
+        :param index: Position, or slice of positions, of the builds to
+            model.
+        :return: The build, or builds, at the position.
+        :rtype: :class:`Build` or list[:class:`Build`]
+        """
+        if isinstance(index, slice):
+            return [self[position]
+                    for position in range(*index.indices(len(self)))]
+
+        return Build(str(self._ids[index]),
+                     self._categories[self._statuses[index]])
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield self[position]
+
+    def iter_values(self):
+        """Goes through the builds without modeling them.
+
+        :return: The id and status of each build.
+        :rtype: :class:`typing.Iterator[tuple[str, str]]`
+        """
+        categories = self._categories
+        for build_id, code in zip(self._ids, self._statuses):
+            yield str(build_id), categories[code]
+
+    def get_timestamp(self, index):
+        """
+        :param index: Position of the build.
+        :type index: int
+        :return: Time the build started at, in milliseconds since the epoch.
+            'None' if unknown.
+        :rtype: int or None
+        """
+        timestamp = self._timestamps[index]
+        return None if timestamp == self.MISSING_TIMESTAMP else timestamp
+
+    def count_by_status(self):
+        """
+        :return: Number of builds with each status.
+        :rtype: dict[str, int]
+        """
+        return {self._categories[code]: count
+                for code, count in Counter(self._statuses).items()}
+
+    def pass_rate(self, success='SUCCESS'):
+        """
+        :param success: Status of the builds that passed.
+        :type success: str
+        :return: Fraction of the builds with a status that passed. 'None' if
+            no build has a status yet.
+        :rtype: float or None
+        """
+        finished = len(self) - self._statuses.count(0)
+        if not finished:
+            return None
+
+        code = self._codes.get(success)
+        if code is None:
+            return 0.0
+
+        return self._statuses.count(code) / finished
+
+    def last_with_status(self, status):
+        """Looks for the most recent build with a status. Builds are sorted
+        by their timestamp, then by their id if it is numeric. Otherwise,
+        the first one added wins, as sources list the newest first.
+
+        :param status: The status.
+        :type status: str
+        :return: The build. 'None' if there is none with that status.
+        :rtype: :class:`Build` or None
+        """
+        code = self._codes.get(status)
+        if code is None:
+            return None
+
+        numeric = isinstance(self._ids, array)
+        best = None
+        best_key = None
+
+        for position, build_code in enumerate(self._statuses):
+            if build_code != code:
+                continue
+
+            key = (self._timestamps[position],
+                   self._ids[position] if numeric else -position)
+            if best_key is None or key > best_key:
+                best, best_key = position, key
+
+        return None if best is None else self[best]
+
+    def last_failure(self, failure='FAILURE'):
+        """
+        :param failure: Status of the builds that failed.
+        :type failure: str
+        :return: The most recent build that failed. 'None' if none did.
+        :rtype: :class:`Build` or None
+        """
+        return self.last_with_status(failure)
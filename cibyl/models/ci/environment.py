@@ -15,14 +15,16 @@
 """
 # pylint: disable=no-member
 from cibyl.cli.argument import Argument
-from cibyl.models.attribute import AttributeListValue
-from cibyl.models.ci.system import System
+from cibyl.models.attribute import IndexedAttributeListValue
+from cibyl.models.ci.system import System, ZuulSystem
 from cibyl.models.model import Model
 
 
 class Environment(Model):
     """Represents a CI environment with one or more CI systems."""
 
+    __slots__ = ('name', 'systems')
+
     API = {
         'name': {
             'attr_type': str,
@@ -31,7 +33,7 @@ class Environment(Model):
         },
         'systems': {
             'attr_type': System,
-            'attribute_value_class': AttributeListValue,
+            'attribute_value_class': IndexedAttributeListValue,
             'arguments': [Argument(name='--systems', arg_type=str,
                                    description="Systems of the environment")]
         }
@@ -42,13 +44,32 @@ class Environment(Model):
 
     def add_system(self, name: str, system_type: str, jobs_scope: str = None,
                    sources: list = None):
-        """Adds a CI system to the CI environment"""
-        self.systems.append(System(name=name, system_type=system_type,
+        """Adds a CI system to the CI environment, replacing any other one
+        with the same name"""
+        if system_type == 'zuul':
+            # Zuul systems also hold pipelines
+            self.systems.upsert(ZuulSystem(name=name, jobs_scope=jobs_scope,
+                                           sources=sources))
+            return
+
+        self.systems.upsert(System(name=name, system_type=system_type,
                                    jobs_scope=jobs_scope, sources=sources))
 
     def __str__(self, indent=0):
-        string = ""
-        string += f"Environment: {self.name.value}\n"
+        return "".join(f"{line}\n" for line in self.iter_lines(indent))
+
+    def iter_lines(self, indent=0, get_jobs=None):
+        """Renders the environment line by line, followed by its systems.
+
+        :param indent: Number of spaces to indent the lines with.
+        :type indent: int
+        :param get_jobs: Called with each system to get the jobs to render
+            for it, see :meth:`System.iter_lines`.
+        :type get_jobs: callable
+        :return: The lines.
+        :rtype: :class:`typing.Iterator[str]`
+        """
+        yield indent*' ' + f"Environment: {self.name.value}"
         for system in self.systems:
-            string += system.__str__(indent + 2)
-        return string
+            yield from system.iter_lines(
+                indent + 2, get_jobs(system) if get_jobs else None)
@@ -15,9 +15,11 @@
 #    under the License.
 """
 from cibyl.cli.argument import Argument
-from cibyl.models.attribute import AttributeListValue
+from cibyl.models.attribute import IndexedAttributeListValue
 from cibyl.models.ci.build import Build
+from cibyl.models.ci.build_columns import BuildColumns
 from cibyl.models.model import Model
+from cibyl.utils.dates import parse_date
 
 
 class Job(Model):
@@ -26,6 +28,9 @@ class Job(Model):
         name, builds and url.
 
     """
+
+    __slots__ = ('name', 'url', 'builds')
+
     API = {
         'name': {
             'attr_type': str,
@@ -40,21 +45,55 @@ class Job(Model):
         },
         'builds': {
             'attr_type': Build,
-            'attribute_value_class': AttributeListValue,
+            'attribute_value_class': IndexedAttributeListValue,
             'arguments': [Argument(name='--builds', arg_type=str,
-                                   description="Job builds")]
+                                   description="Job builds"),
+                          Argument(name='--builds-limit', arg_type=int,
+                                   description="Maximum number of builds "
+                                               "to get for each job"),
+                          Argument(name='--builds-since', arg_type=parse_date,
+                                   description="Only get builds started "
+                                               "after this date")]
         }
     }
 
-    def __init__(self, name: str, url: str = None, builds: list[Build] = None):
+    def __init__(self, name: str, url: str = None, builds: list[Build] = None,
+                 columnar: bool = False):
+        """
+        :param name: Name of the job
+        :type name: str
+        :param url: Address of the job
+        :type url: str
+        :param builds: Builds of the job
+        :type builds: list[Build]
+        :param columnar: Whether to hold the builds column by column, see
+        :class:`cibyl.models.ci.build_columns.BuildColumns`
+        :type columnar: bool
+        """
         super().__init__({'name': name, 'url': url,
-                          'builds': builds})
+                          'builds': None if columnar else builds})
+
+        if columnar:
+            self.builds = BuildColumns(name='builds', value=builds,
+                                       spec=self.API['builds'])
 
     def __str__(self, indent=0):
-        job_str = indent*' ' + f"Job: {self.name.value}"
+        return "\n".join(self.iter_lines(indent))
+
+    def iter_lines(self, indent=0):
+        """Renders the job line by line, followed by its builds. Builds
+        that were deferred are loaded at this point.
+
+        :param indent: Number of spaces to indent the lines with.
+        :type indent: int
+        :return: The lines.
+        :rtype: :class:`typing.Iterator[str]`
+        """
+        yield indent*' ' + f"Job: {self.name.value}"
         if self.url.value:
-            job_str += f"\n  URL: {self.url.value}"
-        return job_str
+            yield (indent + 2)*' ' + f"URL: {self.url.value}"
+        for build in self.builds:
+            yield from build.iter_lines(indent + 2)
 
     def __eq__(self, other):
         if not isinstance(other, self.__class__):
@@ -62,9 +101,9 @@ class Job(Model):
         return self.name.value == other.name.value
 
     def add_build(self, build: Build):
-        """Add a build to the job.
+        """Add a build to the job, replacing any other one with the same id.
 
         :param build: Build to add to the job
         :type build: Build
         """
-        self.builds.append(build)
+        self.builds.upsert(build)
@@ -15,7 +15,7 @@
 #    under the License.
 """
 from cibyl.cli.argument import Argument
-from cibyl.models.attribute import AttributeListValue
+from cibyl.models.attribute import IndexedAttributeListValue
 from cibyl.models.ci.job import Job
 from cibyl.models.model import Model
 
@@ -23,6 +23,8 @@ from cibyl.models.model import Model
 class Pipeline(Model):
     """Represents a Zuul pipeline"""
 
+    __slots__ = ('name', 'jobs')
+
     API = {
         'name': {
             'attr_type': str,
@@ -31,7 +33,7 @@ class Pipeline(Model):
         },
         'jobs': {
             'attr_type': Job,
-            'attribute_value_class': AttributeListValue,
+            'attribute_value_class': IndexedAttributeListValue,
             'arguments': [Argument(name='--jobs', arg_type=str,
                                    description="Pipeline jobs")]
         }
@@ -40,12 +42,19 @@ class Pipeline(Model):
     def __init__(self, name: str, jobs: list[Job] = None):
         super().__init__(attributes={'name': name,
                                      'jobs': jobs})
-        self.name.value = name
-        self.jobs.value = jobs
 
     def __str__(self):
         return f"Pipeline {self.name.value}"
 
+    def add_job(self, job: Job):
+        """Add a job to the pipeline, replacing any other one with the same
+        name
+
+        :param job: Job to add to the pipeline
+        :type job: Job
+        """
+        self.jobs.upsert(job)
+
     def __eq__(self, other):
         if not isinstance(other, self.__class__):
             return False
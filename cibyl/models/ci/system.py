@@ -15,7 +15,8 @@
 """
 # pylint: disable=no-member
 from cibyl.cli.argument import Argument
-from cibyl.models.attribute import AttributeListValue
+from cibyl.models.attribute import (AttributeListValue,
+                                    IndexedAttributeListValue)
 from cibyl.models.ci.job import Job
 from cibyl.models.ci.pipeline import Pipeline
 from cibyl.models.model import Model
@@ -27,6 +28,9 @@ class System(Model):
 
     Holds basic information such as its name, type and which jobs it has.
     """
+
+    __slots__ = ('name', 'system_type', 'jobs', 'jobs_scope', 'sources')
+
     API = {
         'name': {
             'attr_type': str,
@@ -40,7 +44,7 @@ class System(Model):
         },
         'jobs': {
             'attr_type': Job,
-            'attribute_value_class': AttributeListValue,
+            'attribute_value_class': IndexedAttributeListValue,
             'arguments': [Argument(name='--jobs', arg_type=str,
                                    description="System jobs",
                                    func='get_jobs')]
@@ -65,19 +69,32 @@ class System(Model):
                           'sources': sources})
 
     def __str__(self, indent=0):
-        string = indent*' ' + f"System: {self.name.value} \
-(type: {self.system_type.value})\n"
-        for job in self.jobs:
-            string += job.__str__()
-        return string
+        return "".join(f"{line}\n" for line in self.iter_lines(indent))
+
+    def iter_lines(self, indent=0, jobs=None):
+        """Renders the system line by line, followed by its jobs.
+
+        :param indent: Number of spaces to indent the lines with.
+        :type indent: int
+        :param jobs: Jobs to render, those of the system if None. Meant to
+            follow the jobs while they are being added.
+        :type jobs: :class:`typing.Iterable[Job]`
+        :return: The lines.
+        :rtype: :class:`typing.Iterator[str]`
+        """
+        yield indent*' ' + f"System: {self.name.value} " \
+                           f"(type: {self.system_type.value})"
+        for job in self.jobs if jobs is None else jobs:
+            yield from job.iter_lines(indent + 2)
 
     def add_job(self, job: Job):
-        """Add a job to the CI system
+        """Add a job to the CI system, replacing any other one with the same
+        name
 
         :param job: Job to add to the system
         :type job: Job
         """
-        self.jobs.append(job)
+        self.jobs.upsert(job)
 
     def __eq__(self, other):
         if not isinstance(other, self.__class__):
@@ -87,25 +104,39 @@ class System(Model):
 
 class ZuulSystem(System):
     """Model a Zuul CI system."""
-    def __init__(self, name: str):
-        super().__init__(name, "zuul")
-        pipeline_argument = Argument(name='--pipelines', arg_type=str,
-                                     description="System pipelines")
-        self.pipelines = AttributeListValue(name="pipelines",
-                                            attr_type=Pipeline,
-                                            arguments=[pipeline_argument])
+
+    __slots__ = ('pipelines',)
+
+    API = {
+        **System.API,
+        'pipelines': {
+            'attr_type': Pipeline,
+            'attribute_value_class': IndexedAttributeListValue,
+            'arguments': [Argument(name='--pipelines', arg_type=str,
+                                   description="System pipelines")]
+        }
+    }
+
+    def __init__(self, name: str, jobs_scope: str = "*",
+                 sources: list = None):
+        super().__init__(name, "zuul", jobs_scope=jobs_scope,
+                         sources=sources)
 
     def add_pipeline(self, pipeline: Pipeline):
-        """Add a pipeline to the CI system
+        """Add a pipeline to the CI system, replacing any other one with the
+        same name
 
         :param pipeline: Pipeline to add to the system
         :type pipeline: Pipeline
         """
-        self.pipelines.append(pipeline)
+        self.pipelines.upsert(pipeline)
 
 
 class JenkinsSystem(System):
     """Model a Jenkins CI system."""
+
+    __slots__ = ()
+
     def __init__(self, name: str):
         super().__init__(name, "jenkins")
 
@@ -18,15 +18,188 @@ from cibyl.models.attribute import AttributeValue
 
 # pylint: disable=too-few-public-methods
 class Model:
-    """Represents a base class inherited by CI and product models."""
+    """Represents a base class inherited by CI and product models.
+
+    Subclasses are expected to declare a slot for each attribute on their
+    :attr:`API`, so that their instances do not carry a dictionary around.
+
+    Attributes can be deferred, see :meth:`defer`, so that they are only
+    loaded the first time they are accessed.
+    """
+
+    __slots__ = ('_loaders',)
 
     API = {}
 
+    KEY = 'name'
+    """Attribute that tells instances apart, for indexed collections."""
+
     def __init__(self, attributes):
-        for attribute_name, attribute_dict in self.API.items():
-            attribute_class = attribute_dict.get('attribute_value_class',
-                                                 AttributeValue)
+        for attribute_name, attribute_class, attribute_dict, _ in \
+                self.get_plan():
             setattr(self, attribute_name, attribute_class(
-                name=attribute_name, value=attributes[attribute_name],
-                arguments=attribute_dict.get('arguments', []),
-                attr_type=attribute_dict.get('attr_type')))
+                name=attribute_name, value=attributes.get(attribute_name),
+                spec=attribute_dict))
+
+    def __getattr__(self, name):
+        # Only reached for attributes that are not set, like deferred ones
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        loader = (self._get_loaders() or {}).get(name)
+        if loader is None:
+            raise AttributeError(
+                f"'{self.__class__.__name__}' object has no attribute "
+                f"'{name}'")
+
+        self.load(name, loader(self, name))
+        return getattr(self, name)
+
+    def _get_loaders(self):
+        """
+        :return: Loader of each deferred attribute. 'None' if there are
+            none.
+        :rtype: dict or None
+        """
+        try:
+            return self._loaders
+        except AttributeError:
+            return None
+
+    def defer(self, name, loader):
+        """Leaves an attribute to be loaded the first time it is accessed.
+        Its current value is dropped.
+
+        :param name: Name of the attribute.
+        :type name: str
+        :param loader: Called with the model and the name of the attribute
+            to get its value, as taken by :meth:`load`.
+        :type loader: callable
+        """
+        loaders = self._get_loaders()
+        if loaders is None:
+            # pylint: disable=attribute-defined-outside-init
+            loaders = self._loaders = {}
+        loaders[name] = loader
+
+        try:
+            delattr(self, name)
+        except AttributeError:
+            pass
+
+    def is_loaded(self, name):
+        """
+        :param name: Name of an attribute.
+        :type name: str
+        :return: Whether the attribute is not waiting to be loaded.
+        :rtype: bool
+        """
+        return name not in (self._get_loaders() or {})
+
+    def load(self, name, value):
+        """Sets the value of an attribute, deferred or not.
+
+        :param name: Name of the attribute.
+        :type name: str
+        :param value: The value, or the attribute value that holds it.
+        """
+        if not isinstance(value, AttributeValue):
+            for attribute_name, attribute_class, attribute_dict, _ in \
+                    self.get_plan():
+                if attribute_name == name:
+                    value = attribute_class(name=name, value=value,
+                                            spec=attribute_dict)
+                    break
+
+        setattr(self, name, value)
+
+        loaders = self._get_loaders()
+        if loaders:
+            loaders.pop(name, None)
+
+    @classmethod
+    def get_plan(cls):
+        """Works out, once per class, how to build each attribute on its
+        :attr:`API`.
+
+        :return: Name, value class, API entry and type to cast raw values
+            to, if any, of each attribute.
+        :rtype: tuple[tuple[str, type, dict, type]]
+        """
+        plan = _PLANS.get(cls)
+
+        if plan is None:
+            plan = _PLANS[cls] = tuple(
+                (attribute_name,
+                 attribute_dict.get('attribute_value_class', AttributeValue),
+                 attribute_dict,
+                 str if attribute_dict.get('attr_type') is str else None)
+                for attribute_name, attribute_dict in cls.API.items()
+            )
+
+        return plan
+
+    @classmethod
+    def iter_records(cls, records, **fields):
+        """Models raw records, as received from a source, one after the
+        other. Only the first one pays for working out how to build the
+        attributes, and plain attributes are filled in without going
+        through any constructor.
+
+        :param records: The records.
+        :type records: :class:`typing.Iterable[dict]`
+        :param fields: Key on the records of each attribute, for those that
+            are not found under their own name. Values missing from a record
+            are left as None, and those of string attributes that are not
+            strings are turned into one.
+        :type fields: str
+        :return: The models.
+        :rtype: :class:`typing.Iterator[Model]`
+        """
+        plan = tuple(
+            (attribute_name, fields.get(attribute_name, attribute_name),
+             attribute_class, attribute_dict, cast)
+            for attribute_name, attribute_class, attribute_dict, cast
+            in cls.get_plan()
+        )
+        new_model = cls.__new__
+        new_value = AttributeValue.__new__
+
+        for record in records:
+            model = new_model(cls)
+
+            for attribute_name, key, attribute_class, attribute_dict, cast \
+                    in plan:
+                value = record.get(key)
+                # Exact type check, a subclass may render differently
+                # pylint: disable=unidiomatic-typecheck
+                if cast is not None and value is not None and \
+                        type(value) is not cast:
+                    value = cast(value)
+
+                if attribute_class is AttributeValue:
+                    attribute = new_value(AttributeValue)
+                    attribute.name = attribute_name
+                    attribute.value = value
+                    attribute.spec = attribute_dict
+                else:
+                    attribute = attribute_class(
+                        name=attribute_name, value=value,
+                        spec=attribute_dict)
+
+                setattr(model, attribute_name, attribute)
+
+            yield model
+
+    @classmethod
+    def from_records(cls, records, **fields):
+        """Models raw records in one pass, see :meth:`iter_records`.
+
+        :return: The models.
+        :rtype: list[Model]
+        """
+        return list(cls.iter_records(records, **fields))
+
+
+_PLANS = {}
+"""Plan of each model class, see :meth:`Model.get_plan`."""
@@ -15,12 +15,19 @@
 """
 import logging
 import operator
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from cibyl.cli.parser import Parser
 from cibyl.config import Config
 from cibyl.exceptions.config import InvalidConfiguration
 from cibyl.models.ci.environment import Environment
 from cibyl.publisher import Publisher
+from cibyl.sources.cache import RESPONSE_CACHE
+from cibyl.sources.circuit_breaker import CIRCUIT_BREAKER
+from cibyl.sources.session_pool import SESSION_POOL
+from cibyl.sources.source_factory import SourceFactory
+from cibyl.sources.timings import REQUEST_TIMINGS
 
 LOG = logging.getLogger(__name__)
 
@@ -57,17 +64,43 @@ class Orchestrator:
     def create_ci_environments(self) -> None:
         """Creates CI environment entities based on loaded configuration."""
         try:
+            SESSION_POOL.configure(
+                **self.config.data.get('connection_pool', {}))
+            RESPONSE_CACHE.configure(**self.config.data.get('cache', {}))
+            CIRCUIT_BREAKER.configure(
+                **self.config.data.get('circuit_breaker', {}))
+
             for env_name, systems_dict in \
                     self.config.data.get('environments', {}).items():
                 environment = Environment(name=env_name)
                 for system_name, single_system in systems_dict.items():
-                    environment.add_system(name=system_name, **single_system)
+                    system_config = dict(single_system)
+                    system_config['sources'] = [
+                        SourceFactory.create_source(name, **source_config)
+                        for name, source_config in
+                        system_config.get('sources', {}).items()
+                    ]
+                    environment.add_system(name=system_name, **system_config)
                 self.environments.append(environment)
-        except AttributeError as exception:
+        except (AttributeError, TypeError) as exception:
             raise InvalidConfiguration from exception
 
     def run_query(self, start_level=1):
         """Execute query based on provided arguments."""
+        self.wait_queries(self.start_query(start_level))
+
+    def start_query(self, start_level=1):
+        """Starts the query based on provided arguments, without waiting
+        for it to finish.
+
+        :param start_level: Lowest level of the arguments to consider.
+        :type start_level: int
+        :return: The system of each query, which completes once all the
+            sources of the system were asked. Empty if there is nothing to
+            ask them for.
+        :rtype: dict[:class:`concurrent.futures.Future`,
+            :class:`cibyl.models.ci.system.System`]
+        """
         last_level = -1
         for arg in sorted(self.parser.ci_args.values(),
                           key=operator.attrgetter('level'), reverse=True):
@@ -75,6 +108,152 @@ class Orchestrator:
                 LOG.debug("executing the function %s", arg.func)
                 last_level = arg.level
 
+        if last_level < 0:
+            # Nothing to ask the sources for
+            return {}
+
+        if self.parser.app_args.get('no_cache'):
+            RESPONSE_CACHE.enabled = False
+        RESPONSE_CACHE.refresh = self.parser.app_args.get('refresh', False)
+
+        return self.submit_queries(self.parser.ci_args,
+                                   self.parser.app_args.get('max_workers'))
+
+    def query_systems(self, args, max_workers=None):
+        """Queries every system of every environment concurrently, waiting
+        for all of them to finish. See :meth:`submit_queries`.
+
+        :param args: The CI arguments the query is made of.
+        :type args: dict
+        :param max_workers: Maximum number of systems queried at the same
+            time. 'None' lets the executor pick a default.
+        :type max_workers: int or None
+        """
+        self.wait_queries(self.submit_queries(args, max_workers))
+
+    def submit_queries(self, args, max_workers=None):
+        """Starts querying every system of every environment concurrently.
+
+        Each system is handled by a single worker, which goes through its
+        sources one after the other. As no two workers share a system, the
+        results are written straight into the models.
+
+        :param args: The CI arguments the query is made of.
+        :type args: dict
+        :param max_workers: Maximum number of systems queried at the same
+            time. 'None' lets the executor pick a default.
+        :type max_workers: int or None
+        :return: The system of each query, see :meth:`start_query`.
+        :rtype: dict[:class:`concurrent.futures.Future`,
+            :class:`cibyl.models.ci.system.System`]
+        """
+        systems = [system
+                   for environment in self.environments
+                   for system in environment.systems]
+
+        if not systems:
+            return {}
+
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        queries = {executor.submit(self._query_system, system, args): system
+                   for system in systems}
+        # Workers carry on with what was submitted, and exit after it, or
+        # once the queries are cancelled, see cancel_queries
+        executor.shutdown(wait=False)
+        return queries
+
+    @staticmethod
+    def wait_queries(queries):
+        """Waits for the queries of the systems to finish.
+
+        :param queries: The system of each query, see :meth:`start_query`.
+        :type queries: dict[:class:`concurrent.futures.Future`,
+            :class:`cibyl.models.ci.system.System`]
+        :raises Exception: The error a query failed with, if any. The
+            other queries are cancelled then, see :meth:`cancel_queries`.
+        """
+        try:
+            for future in as_completed(queries):
+                LOG.debug("finished querying system %s",
+                          queries[future].name.value)
+                # Raises the error from the worker, if there was one
+                future.result()
+        except BaseException as error:
+            Orchestrator.cancel_queries(queries, error)
+            raise
+
+    @staticmethod
+    def cancel_queries(queries, error=None):
+        """Cancels the queries of the systems that did not start yet, and
+        waits for the others to finish. The errors those fail with are
+        logged, as there is no one left to raise them to.
+
+        :param queries: The system of each query, see :meth:`start_query`.
+        :type queries: dict[:class:`concurrent.futures.Future`,
+            :class:`cibyl.models.ci.system.System`]
+        :param error: Error the caller is already raising, which is not
+            logged again.
+        :type error: :class:`BaseException` or None
+        """
+        started = [future for future in queries if not future.cancel()]
+
+        for future in as_completed(started):
+            exception = future.exception()
+            if exception is not None and exception is not error:
+                LOG.error("query of system %s failed",
+                          queries[future].name.value, exc_info=exception)
+
+    @staticmethod
+    def _query_system(system, args):
+        """Runs the query over all the sources of a system.
+
+        :param system: The system to query.
+        :type system: :class:`cibyl.models.ci.system.System`
+        :param args: The CI arguments the query is made of.
+        :type args: dict
+        """
+        for source in system.sources:
+            source.query(system, args)
+
+    def watch(self, interval, iterations=None):
+        """Polls the status of the systems whose sources support it,
+        publishing what changed between polls.
+
+        :param interval: Seconds to wait between polls.
+        :type interval: float
+        :param iterations: Number of polls to make. 'None' to keep polling
+            until interrupted.
+        :type iterations: int or None
+        """
+        watched = [(system, source)
+                   for environment in self.environments
+                   for system in environment.systems
+                   for source in system.sources
+                   if hasattr(source, 'poll_status')]
+
+        if not watched:
+            LOG.warning("no source can be watched for status changes")
+            return
+
+        polls = 0
+        while True:
+            for system, source in watched:
+                self.publisher.publish_changes(source.poll_status(system))
+
+            polls += 1
+            if iterations is not None and polls >= iterations:
+                return
+
+            time.sleep(interval)
+
+    def report_timings(self):
+        """Reports the time spent on source requests, if asked to."""
+        if self.parser.app_args.get('timings'):
+            print(REQUEST_TIMINGS.format_table())
+
+        if timings_file := self.parser.app_args.get('timings_file'):
+            REQUEST_TIMINGS.dump(timings_file)
+
     def extend_parser(self, attributes, group_name='Environment',
                       level=0):
         """Extend parser with arguments from CI models."""
@@ -0,0 +1,243 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+import csv
+import json
+import logging
+
+from cibyl.exceptions.output import OutputError
+from cibyl.models.ci.build_columns import BuildColumns
+
+LOG = logging.getLogger(__name__)
+
+FORMATS = ('json', 'jsonl', 'csv', 'parquet')
+"""Machine-readable formats the output can be published in."""
+
+COLUMNS = ('environment', 'system', 'system_type', 'job', 'job_url',
+           'build_id', 'build_status')
+"""Fields of each row, for the formats with one row per build."""
+
+
+def iter_builds(job):
+    """
+    :param job: A job. Builds that were deferred are loaded at this point.
+    :type job: :class:`cibyl.models.ci.job.Job`
+    :return: The id and status of each build of the job. Builds held in
+        columns are not modeled.
+    :rtype: :class:`typing.Iterator[tuple[str, str]]`
+    """
+    builds = job.builds
+    if isinstance(builds, BuildColumns):
+        yield from builds.iter_values()
+        return
+
+    for build in builds:
+        yield build.build_id.value, build.status.value
+
+
+def iter_jobs(system, get_jobs=None):
+    """
+    :param system: A system.
+    :type system: :class:`cibyl.models.ci.system.System`
+    :param get_jobs: Called with the system to get its jobs, see
+        :meth:`cibyl.models.ci.environment.Environment.iter_lines`.
+    :type get_jobs: callable
+    :return: The jobs of the system.
+    :rtype: :class:`typing.Iterable[cibyl.models.ci.job.Job]`
+    """
+    return system.jobs if get_jobs is None else get_jobs(system)
+
+
+def iter_rows(environments, get_jobs=None):
+    """Flattens the environments into one row per build, with the fields
+    on :data:`COLUMNS`. Jobs with no builds, systems with no jobs and
+    environments with no systems still get a row, with the fields below
+    them set to 'None'.
+
+    :param environments: The environments.
+    :type environments: list[:class:`cibyl.models.ci.environment.\
+Environment`]
+    :param get_jobs: Called with each system to get its jobs, see
+        :meth:`cibyl.models.ci.environment.Environment.iter_lines`.
+    :type get_jobs: callable
+    :return: The rows.
+    :rtype: :class:`typing.Iterator[tuple]`
+    """
+    for env in environments:
+        env_name = env.name.value
+        if not env.systems.value:
+            yield (env_name,) + (None,) * (len(COLUMNS) - 1)
+
+        for system in env.systems:
+            system_row = (env_name, system.name.value,
+                          system.system_type.value)
+            has_jobs = False
+
+            for job in iter_jobs(system, get_jobs):
+                has_jobs = True
+                job_row = system_row + (job.name.value, job.url.value)
+                has_builds = False
+
+                for build in iter_builds(job):
+                    has_builds = True
+                    yield job_row + build
+
+                if not has_builds:
+                    yield job_row + (None, None)
+
+            if not has_jobs:
+                yield system_row + (None,) * (len(COLUMNS) - 3)
+
+
+def iter_json(environments, get_jobs=None):
+    """Serializes the environments as a single JSON document, nesting
+    systems, jobs and builds under them. Jobs are serialized one at a time
+    and each goes on its own line.
+
+    :param environments: The environments.
+    :type environments: list[:class:`cibyl.models.ci.environment.\
+Environment`]
+    :param get_jobs: Called with each system to get its jobs, see
+        :meth:`cibyl.models.ci.environment.Environment.iter_lines`.
+    :type get_jobs: callable
+    :return: Pieces of the document, to be written one after the other.
+    :rtype: :class:`typing.Iterator[str]`
+    """
+    yield "["
+    for env_index, env in enumerate(environments):
+        yield "," if env_index else ""
+        yield f'{{"name": {json.dumps(env.name.value)}, "systems": ['
+
+        for system_index, system in enumerate(env.systems):
+            yield "," if system_index else ""
+            yield f'{{"name": {json.dumps(system.name.value)}, ' \
+                  f'"system_type": {json.dumps(system.system_type.value)}, ' \
+                  '"jobs": ['
+
+            for job_index, job in enumerate(iter_jobs(system, get_jobs)):
+                yield ",\n" if job_index else "\n"
+                yield json.dumps({
+                    'name': job.name.value,
+                    'url': job.url.value,
+                    'builds': [{'build_id': build_id, 'status': status}
+                               for build_id, status in iter_builds(job)]
+                })
+
+            yield "]}"
+        yield "]}"
+    yield "]\n"
+
+
+def iter_json_lines(environments, get_jobs=None):
+    """Serializes the environments as JSON Lines, one object per row, see
+    :func:`iter_rows`.
+
+    :param environments: The environments.
+    :type environments: list[:class:`cibyl.models.ci.environment.\
+Environment`]
+    :param get_jobs: Called with each system to get its jobs, see
+        :meth:`cibyl.models.ci.environment.Environment.iter_lines`.
+    :type get_jobs: callable
+    :return: The lines.
+    :rtype: :class:`typing.Iterator[str]`
+    """
+    for row in iter_rows(environments, get_jobs):
+        yield json.dumps(dict(zip(COLUMNS, row)))
+
+
+def write_csv(environments, writer, get_jobs=None):
+    """Writes the environments as CSV, one record per row, see
+    :func:`iter_rows`. The first record holds the name of the fields.
+
+    :param environments: The environments.
+    :type environments: list[:class:`cibyl.models.ci.environment.\
+Environment`]
+    :param writer: Where to write each record to, as a line.
+    :type writer: :class:`cibyl.publisher.BufferedWriter`
+    :param get_jobs: Called with each system to get its jobs, see
+        :meth:`cibyl.models.ci.environment.Environment.iter_lines`.
+    :type get_jobs: callable
+    """
+    # Each record is written in a single call, the writer ends the line
+    records = csv.writer(writer, lineterminator="")
+    records.writerow(COLUMNS)
+    records.writerows(iter_rows(environments, get_jobs))
+
+
+def import_pyarrow():
+    """Imports 'pyarrow', which is only needed to publish as parquet and so
+    is not imported until then.
+
+    :return: The module, with 'pyarrow.parquet' loaded.
+    :rtype: module
+    :raises OutputError: If 'pyarrow' is not installed.
+    """
+    try:
+        # pylint: disable=import-outside-toplevel
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as ex:
+        raise OutputError("Publishing as parquet requires 'pyarrow', "
+                          "install it with: pip install pyarrow") from ex
+
+    return pyarrow
+
+
+def write_parquet(environments, output, get_jobs=None, batch_size=65536):
+    """Writes the environments as a Parquet file, one record per row, see
+    :func:`iter_rows`. Rows are gathered column by column and written in
+    batches, so that long build histories are never held whole.
+
+    Requires 'pyarrow', see :func:`import_pyarrow`.
+
+    :param environments: The environments.
+    :type environments: list[:class:`cibyl.models.ci.environment.\
+Environment`]
+    :param output: Path or binary stream to write to.
+    :type output: str or :class:`typing.BinaryIO`
+    :param get_jobs: Called with each system to get its jobs, see
+        :meth:`cibyl.models.ci.environment.Environment.iter_lines`.
+    :type get_jobs: callable
+    :param batch_size: Number of rows on each batch.
+    :type batch_size: int
+    :raises OutputError: If 'pyarrow' is not installed.
+    """
+    pyarrow = import_pyarrow()
+
+    schema = pyarrow.schema([(column, pyarrow.string())
+                             for column in COLUMNS])
+
+    def iter_batches():
+        columns = [[] for _ in COLUMNS]
+
+        for row in iter_rows(environments, get_jobs):
+            for column, value in zip(columns, row):
+                column.append(value)
+
+            if len(columns[0]) >= batch_size:
+                yield columns
+                columns = [[] for _ in COLUMNS]
+
+        if columns[0]:
+            yield columns
+
+    with pyarrow.parquet.ParquetWriter(output, schema) as writer:
+        for columns in iter_batches():
+            LOG.debug("writing batch of %d rows", len(columns[0]))
+            writer.write_batch(
+                pyarrow.RecordBatch.from_arrays(
+                    [pyarrow.array(column, pyarrow.string())
+                     for column in columns],
+                    schema=schema))
@@ -14,10 +14,143 @@
 #    under the License.
 """
 import logging
+import sys
+import time
+from concurrent.futures import wait
+
+from cibyl.outputs import (import_pyarrow, iter_json, iter_json_lines,
+                           write_csv, write_parquet)
 
 LOG = logging.getLogger(__name__)
 
 
+class BufferedWriter:
+    """Writes lines to a stream in chunks, so that each line does not cost
+    a call to the stream. Lines are held back until enough of them piled
+    up, or for a short while at most, so that the first ones are shown
+    soon.
+
+    :ivar output: Stream to write to.
+    :ivar buffer_size: Number of characters held back at most.
+    :ivar flush_interval: Seconds a line is held back for at most, as long
+        as more lines keep coming.
+    """
+
+    def __init__(self, output, buffer_size=64 * 1024, flush_interval=0.1):
+        """Constructor.
+
+        :param output: Stream to write to.
+        :type output: :class:`typing.TextIO`
+        :param buffer_size: Number of characters held back at most.
+        :type buffer_size: int
+        :param flush_interval: Seconds a line is held back for at most, as
+            long as more lines keep coming.
+        :type flush_interval: float
+        """
+        self.output = output
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self._chunks = []
+        self._size = 0
+        self._last_flush = time.monotonic()
+
+    def write(self, line, end="\n"):
+        """
+        :param line: Line to write, without its line break.
+        :type line: str
+        :param end: What to write after the line.
+        :type end: str
+        """
+        self._chunks.append(line)
+        self._chunks.append(end)
+        self._size += len(line) + len(end)
+
+        if self._size >= self.buffer_size or \
+                time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Writes down all the lines held back."""
+        if self._chunks:
+            self.output.write("".join(self._chunks))
+            self._chunks = []
+            self._size = 0
+
+        self.output.flush()
+        self._last_flush = time.monotonic()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.flush()
+
+
+def follow(attribute, query, on_wait=None, poll_interval=0.05):
+    """Goes through the models on a list attribute while they are being
+    added to it, until the query that adds them finishes.
+
+    :param attribute: The attribute.
+    :type attribute: :class:`cibyl.models.attribute.AttributeListValue`
+    :param query: The query. 'None' if it already finished.
+    :type query: :class:`concurrent.futures.Future`
+    :param on_wait: Called before waiting for more models.
+    :type on_wait: callable
+    :param poll_interval: Seconds to wait for the query before looking for
+        more models.
+    :type poll_interval: float
+    :return: The models, in the order they were added in.
+    :rtype: :class:`typing.Iterator`
+    :raises Exception: The error the query failed with, if any.
+    """
+    position = 0
+    done = query is None or query.done()
+
+    while True:
+        items = attribute.value
+        while position < len(items):
+            yield items[position]
+            position += 1
+
+        if done:
+            break
+
+        if on_wait is not None:
+            on_wait()
+        wait([query], timeout=poll_interval)
+        # Anything added before it finished is picked on the last round
+        done = query.done()
+
+    if query is not None:
+        query.result()
+
+
+def follow_jobs(system, query, on_wait=None):
+    """Goes through the jobs of a system while they are being added to it,
+    see :func:`follow`. Jobs are only gone through while they are being
+    added if all the sources of the system add them complete, see
+    :attr:`cibyl.sources.source.Source.streams_jobs`. Otherwise, the query
+    is waited for first.
+
+    :param system: The system.
+    :type system: :class:`cibyl.models.ci.system.System`
+    :param query: The query of the system. 'None' if it already finished.
+    :type query: :class:`concurrent.futures.Future`
+    :param on_wait: Called before waiting for more jobs.
+    :type on_wait: callable
+    :return: The jobs.
+    :rtype: :class:`typing.Iterator[cibyl.models.ci.job.Job]`
+    :raises Exception: The error the query failed with, if any.
+    """
+    if query is not None and not all(
+            source.streams_jobs for source in system.sources):
+        if on_wait is not None:
+            on_wait()
+        wait([query])
+
+    yield from follow(system.jobs, query, on_wait)
+
+
 # pylint: disable=too-few-public-methods
 class Publisher:
     """Represents a publisher which is responsible for publishing the data
@@ -33,3 +166,105 @@ class Publisher:
         if dest == "terminal":
             for env in environments:
                 print(env)
+
+    @staticmethod
+    def stream(environments, queries=None, dest="terminal", output=None,
+               output_format=None):
+        """Publishes the data of the given environments to the chosen
+        destination line by line, while the systems are still being
+        queried. The jobs of each system are published as they are added
+        to it. The output is written as it is produced instead of being
+        held in memory, while the models stay on their systems once
+        published.
+
+        Jobs are only published while they are being added if all the
+        sources of their system add them complete, see
+        :func:`follow_jobs`.
+
+        :param environments: The environments.
+        :type environments: list[:class:`cibyl.models.ci.environment.\
+Environment`]
+        :param queries: The system of each query that may still be running,
+            as returned by
+            :meth:`cibyl.orchestrator.Orchestrator.start_query`.
+        :type queries: dict[:class:`concurrent.futures.Future`,
+            :class:`cibyl.models.ci.system.System`]
+        :param dest: Destination to publish to, either the terminal or
+            the path to a file.
+        :type dest: str
+        :param output: Stream to write to instead of the destination. A
+            binary one for parquet.
+        :type output: :class:`typing.IO`
+        :param output_format: Format to publish in, one of
+            :data:`cibyl.outputs.FORMATS`. Text for humans if None.
+        :type output_format: str
+        :raises OutputError: If the format cannot be published in.
+        """
+        binary = output_format == 'parquet'
+        if binary:
+            # Fails before an empty file is left behind
+            import_pyarrow()
+
+        if output is not None:
+            Publisher.write(environments, queries, output, output_format)
+        elif dest == "terminal":
+            Publisher.write(environments, queries,
+                            sys.stdout.buffer if binary else sys.stdout,
+                            output_format)
+        else:
+            # Line breaks are written as they are, on every platform
+            with open(dest, 'wb' if binary else 'w',
+                      newline=None if binary else '') as file:
+                Publisher.write(environments, queries, file, output_format)
+
+    @staticmethod
+    def write(environments, queries, output, output_format=None):
+        """Writes the data of the given environments to a stream, see
+        :meth:`stream`.
+
+        :param environments: The environments.
+        :type environments: list[:class:`cibyl.models.ci.environment.\
+Environment`]
+        :param queries: The system of each query that may still be running.
+        :type queries: dict[:class:`concurrent.futures.Future`,
+            :class:`cibyl.models.ci.system.System`]
+        :param output: Stream to write to. A binary one for parquet.
+        :type output: :class:`typing.IO`
+        :param output_format: Format to write in, text for humans if None.
+        :type output_format: str
+        """
+        running = {id(system): future
+                   for future, system in (queries or {}).items()}
+
+        if output_format == 'parquet':
+            write_parquet(
+                environments, output,
+                lambda system: follow_jobs(system, running.get(id(system))))
+            return
+
+        with BufferedWriter(output) as writer:
+            def get_jobs(system):
+                return follow_jobs(system, running.get(id(system)),
+                                   writer.flush)
+
+            if output_format == 'json':
+                for piece in iter_json(environments, get_jobs):
+                    writer.write(piece, end="")
+            elif output_format == 'jsonl':
+                for line in iter_json_lines(environments, get_jobs):
+                    writer.write(line)
+            elif output_format == 'csv':
+                write_csv(environments, writer, get_jobs)
+            else:
+                for env in environments:
+                    for line in env.iter_lines(get_jobs=get_jobs):
+                        writer.write(line)
+
+    @staticmethod
+    def publish_changes(changes, dest="terminal"):
+        """Publishes the changes found on the status of the CI systems
+        to the chosen destination.
+        """
+        if dest == "terminal":
+            for change in changes:
+                print(change)
@@ -0,0 +1,133 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+from cibyl.models.attribute import get_key
+
+LOG = logging.getLogger(__name__)
+
+
+class BatchLoader:
+    """Loads deferred attributes of models from a source. When one of them
+    is accessed, it is fetched along with those of the models that were
+    deferred after it, concurrently, as they are likely to be accessed
+    next. Those that fail to be fetched along are left deferred.
+
+    :ivar batch_size: Number of attributes fetched at once.
+    :ivar max_workers: Number of attributes fetched at the same time.
+    """
+
+    def __init__(self, fetch, batch_size=20, max_workers=10):
+        """Constructor.
+
+        :param fetch: Called with the key of a model to get the value of
+            its deferred attribute, see
+            :meth:`cibyl.models.model.Model.load`.
+        :type fetch: callable
+        :param batch_size: Number of attributes fetched at once.
+        :type batch_size: int
+        :param max_workers: Number of attributes fetched at the same time.
+        :type max_workers: int
+        """
+        self.fetch = fetch
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        # Deferred attributes, in the order they were deferred
+        self._pending = {}
+        # Last attribute deferred for each kind of model and its key
+        self._latest = {}
+        self._lock = Lock()
+
+    def defer(self, model, name, key):
+        """Leaves an attribute of a model to be loaded the first time it is
+        accessed. If it was deferred for another model of the same kind and
+        key, which the new one replaces on indexed collections, the other
+        one is no longer loaded along with the rest.
+
+        :param model: The model.
+        :type model: :class:`cibyl.models.model.Model`
+        :param name: Name of the attribute.
+        :type name: str
+        :param key: What identifies the model to :attr:`fetch`.
+        """
+        entry = (id(model), name)
+        identity = (type(model), get_key(model), name)
+
+        with self._lock:
+            replaced = self._latest.get(identity)
+            if replaced is not None and replaced != entry:
+                self._pending.pop(replaced, None)
+
+            self._latest[identity] = entry
+            self._pending[entry] = (model, key, identity)
+        model.defer(name, self)
+
+    def __call__(self, model, name):
+        """Fetches a deferred attribute, along with the ones deferred after
+        it. Those other ones are loaded into their models.
+
+        :param model: Model the attribute was accessed on.
+        :type model: :class:`cibyl.models.model.Model`
+        :param name: Name of the attribute.
+        :type name: str
+        :return: Value of the attribute.
+        """
+        accessed = (id(model), name)
+
+        with self._lock:
+            batch = [accessed]
+            following = iter(self._pending)
+            for entry in following:
+                if entry == accessed:
+                    break
+            for entry in following:
+                if len(batch) >= self.batch_size:
+                    break
+                if entry[1] == name and \
+                        not self._pending[entry][0].is_loaded(name):
+                    batch.append(entry)
+
+            targets = [self._pending.get(entry, (model, None, None))
+                       for entry in batch]
+
+        LOG.debug("loading '%s' of %d models", name, len(batch))
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self.fetch, key)
+                       for _, key, _ in targets]
+
+        with self._lock:
+            for entry, (_, _, identity), future in \
+                    zip(batch, targets, futures):
+                if future.exception() is not None:
+                    continue
+                self._pending.pop(entry, None)
+                if self._latest.get(identity) == entry:
+                    del self._latest[identity]
+
+        for (other, _, _), future in zip(targets[1:], futures[1:]):
+            error = future.exception()
+            if error is not None:
+                LOG.debug("failed to load '%s' ahead of time, leaving it "
+                          "for when it is accessed: %s", name, error)
+                continue
+
+            if not other.is_loaded(name):
+                other.load(name, future.result())
+
+        return futures[0].result()
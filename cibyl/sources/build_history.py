@@ -0,0 +1,161 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+import hashlib
+import json
+import logging
+import os
+
+from cibyl.sources.cache import RESPONSE_CACHE
+
+LOG = logging.getLogger(__name__)
+
+
+class BuildHistory:
+    """Persistent record of the builds already seen for each job of a host.
+
+    It allows sources to ask only for the builds that came after the last
+    run, merging them into what is already known.
+    """
+
+    DIRECTORY = 'history'
+    """Directory, inside the response cache's, where the histories are
+    stored by default."""
+
+    def __init__(self, url, path=None):
+        """Constructor.
+
+        :param url: URL of the host the history belongs to.
+        :type url: str
+        :param path: Directory where the history is stored, the one for
+            histories on the response cache if None.
+        :type path: str
+        """
+        self.path = path
+        self._key = hashlib.sha256(url.encode('utf8')).hexdigest()
+        self._jobs = None
+
+    @property
+    def _file(self):
+        """
+        :return: Path to the file holding the history. Resolved on each
+            call, as the response cache may be moved after construction.
+        :rtype: str
+        """
+        path = self.path or os.path.join(RESPONSE_CACHE.path, self.DIRECTORY)
+        return os.path.join(path, f'{self._key}.json')
+
+    @property
+    def jobs(self):
+        """
+        :return: Builds of each job, as a map of build number to result.
+        :rtype: dict[str, dict[str, str]]
+        """
+        if self._jobs is None:
+            self._jobs = self._load()
+
+        return self._jobs
+
+    def last_seen(self, job):
+        """Gets the number of the last build of a job that needs no
+        updating. Builds that were still running the last time they were
+        seen do not count, as their result may have changed since.
+
+        :param job: Name of the job.
+        :type job: str
+        :return: The build number. 'None' if the job is unknown.
+        :rtype: int or None
+        """
+        builds = self.jobs.get(job)
+
+        if builds is None:
+            return None
+
+        running = [int(number)
+                   for number, result in builds.items() if result is None]
+
+        if running:
+            return min(running) - 1
+
+        return max((int(number) for number in builds), default=0)
+
+    def merge(self, job, builds, first_build=None):
+        """Adds new builds to the history of a job.
+
+        :param job: Name of the job.
+        :type job: str
+        :param builds: The new builds, as dictionaries with their 'number'
+            and 'result'. Builds already known are overwritten.
+        :type builds: list[dict]
+        :param first_build: Number of the oldest build the host still
+            keeps. Older ones are forgotten, as they were rotated away.
+        :type first_build: int
+        :return: All known builds of the job, newest first, in the same
+            format as the input.
+        :rtype: list[dict]
+        """
+        known = self.jobs.setdefault(job, {})
+
+        for build in builds:
+            known[str(build['number'])] = build['result']
+
+        if first_build is not None:
+            for number in [number for number in known
+                           if int(number) < first_build]:
+                del known[number]
+
+        return [{'number': int(number), 'result': result}
+                for number, result in sorted(known.items(),
+                                             key=lambda item: int(item[0]),
+                                             reverse=True)]
+
+    def prune(self, jobs, scope=None):
+        """Forgets about the jobs that are no longer on the host.
+
+        :param jobs: Names of the jobs on the host.
+        :type jobs: :class:`typing.Iterable[str]`
+        :param scope: Called with the name of each known job to tell
+            whether it was meant to be among the given ones, for when only
+            part of the host was listed. All of them are if None.
+        :type scope: callable
+        """
+        present = set(jobs)
+
+        for job in [job for job in self.jobs if job not in present and
+                    (scope is None or scope(job))]:
+            LOG.debug("forgetting builds of job no longer present: %s", job)
+            del self.jobs[job]
+
+    def clear(self):
+        """Forgets about all builds seen."""
+        self._jobs = {}
+
+    def save(self):
+        """Writes the history down to disk."""
+        try:
+            os.makedirs(os.path.dirname(self._file), exist_ok=True)
+
+            with open(f'{self._file}.tmp', 'w', encoding='utf8') as buffer:
+                json.dump(self.jobs, buffer)
+            os.replace(f'{self._file}.tmp', self._file)
+        except OSError as ex:
+            LOG.debug("failed to save build history: %s", ex)
+
+    def _load(self):
+        try:
+            with open(self._file, 'r', encoding='utf8') as buffer:
+                return json.load(buffer)
+        except (OSError, ValueError):
+            return {}
@@ -0,0 +1,438 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from threading import Lock
+
+from cibyl.sources.timings import REQUEST_TIMINGS
+
+LOG = logging.getLogger(__name__)
+
+
+# pylint: disable=too-many-instance-attributes
+class ResponseCache:
+    """Persistent cache for the responses given by the sources' hosts.
+
+    Each response is stored on its own file, named after the URL and query
+    that produced it. Entries older than the time-to-live are ignored and,
+    once the directory grows past its maximum size, the least recently used
+    entries are removed. The size of the directory is kept as a running
+    total, so that it is only looked through when it has to be trimmed.
+
+    Entries keep the validators the host gave for their response, so that
+    expired ones can be revalidated with a conditional request instead of
+    downloaded again. The entries used last by the process are also kept in
+    memory, up to a number of bytes, so that they are not read from disk
+    again. Each read decodes its own copy of the response, which the caller
+    is free to change.
+
+    :ivar path: Directory where the entries are stored.
+    :ivar ttl: Number of seconds an entry is valid for.
+    :ivar max_size: Maximum number of bytes taken by the entries.
+    :ivar max_memory: Maximum number of bytes taken by the entries kept in
+        memory.
+    :ivar enabled: Whether the cache is read from and written to at all.
+    :ivar refresh: Whether entries are ignored when read, forcing them to be
+        fetched again from the host.
+    """
+
+    DEFAULT_PATH = os.path.join(os.path.expanduser('~'), '.cibyl/cache')
+    """Directory where entries are stored by default."""
+
+    DEFAULT_TTL = 300
+    """Number of seconds an entry is valid for by default."""
+
+    DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+    """Maximum number of bytes taken by the entries by default."""
+
+    DEFAULT_MAX_MEMORY = 32 * 1024 * 1024
+    """Maximum number of bytes taken by the entries kept in memory by
+    default."""
+
+    EVICTION_RATIO = 0.75
+    """Share of the maximum size the entries are brought down to once it is
+    exceeded, so that the next writes do not trigger eviction again."""
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, path=DEFAULT_PATH, ttl=DEFAULT_TTL,
+                 max_size=DEFAULT_MAX_SIZE, enabled=True,
+                 max_memory=DEFAULT_MAX_MEMORY):
+        """Constructor.
+
+        :param path: Directory where the entries are stored.
+        :type path: str
+        :param ttl: Number of seconds an entry is valid for.
+        :type ttl: int
+        :param max_size: Maximum number of bytes taken by the entries.
+        :type max_size: int
+        :param enabled: Whether the cache is used at all.
+        :type enabled: bool
+        :param max_memory: Maximum number of bytes taken by the entries kept
+            in memory.
+        :type max_memory: int
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_size = max_size
+        self.max_memory = max_memory
+        self.enabled = enabled
+        self.refresh = False
+        # Encoded entries, least recently used first
+        self._memory = OrderedDict()
+        self._memory_size = 0
+        self._memory_lock = Lock()
+        # Bytes taken by the entries, None until the directory is looked at
+        self._size = None
+        self._lock = Lock()
+
+    def configure(self, path=DEFAULT_PATH, ttl=DEFAULT_TTL,
+                  max_size=DEFAULT_MAX_SIZE, enabled=True):
+        """Changes the settings of the cache.
+
+        :param path: Directory where the entries are stored.
+        :type path: str
+        :param ttl: Number of seconds an entry is valid for.
+        :type ttl: int
+        :param max_size: Maximum number of bytes taken by the entries.
+        :type max_size: int
+        :param enabled: Whether the cache is used at all.
+        :type enabled: bool
+        """
+        self.path = os.path.expanduser(path)
+        self.ttl = ttl
+        self.max_size = max_size
+        self.enabled = enabled
+        self._size = None
+
+    def get(self, url, query, ttl=None):
+        """Looks for the response to a request.
+
+        :param url: URL the request was sent to.
+        :type url: str
+        :param query: Query sent along with the request.
+        :type query: str
+        :param ttl: Number of seconds the response is valid for, if it is
+            not the one of the cache.
+        :type ttl: int or None
+        :return: The stored response. 'None' if there is none or it has
+            expired.
+        :rtype: object or None
+        """
+        if not self.enabled or self.refresh:
+            return None
+
+        file = self._file_for(url, query)
+        entry = self._load(file)
+        if entry is None:
+            return None
+
+        if ttl is None:
+            ttl = self.ttl
+
+        if time.time() - entry['timestamp'] > ttl:
+            LOG.debug("cache entry for %s%s has expired", url, query)
+            return None
+
+        self._touch(file)
+
+        LOG.debug("cache hit for %s%s", url, query)
+        return entry['data']
+
+    def get_validators(self, url, query):
+        """Looks for the validators of the response to a request, whether it
+        has expired or not.
+
+        :param url: URL the request was sent to.
+        :type url: str
+        :param query: Query sent along with the request.
+        :type query: str
+        :return: The validators. 'None' if there is no response stored for
+            the request.
+        :rtype: dict or None
+        """
+        if not self.enabled or self.refresh:
+            return None
+
+        entry = self._load(self._file_for(url, query))
+        if entry is None:
+            return None
+
+        return entry.get('validators', {})
+
+    def renew(self, url, query):
+        """Restarts the time-to-live of the response to a request, once the
+        host has confirmed that it has not changed.
+
+        :param url: URL the request was sent to.
+        :type url: str
+        :param query: Query sent along with the request.
+        :type query: str
+        :return: The stored response. 'None' if there is none.
+        :rtype: object or None
+        """
+        if not self.enabled:
+            return None
+
+        file = self._file_for(url, query)
+        entry = self._load(file)
+        if entry is None:
+            return None
+
+        LOG.debug("cache entry for %s%s is still valid", url, query)
+        self._store(file, {**entry, 'timestamp': time.time()})
+        return entry['data']
+
+    def put(self, url, query, data, validators=None):
+        """Stores the response to a request.
+
+        :param url: URL the request was sent to.
+        :type url: str
+        :param query: Query sent along with the request.
+        :type query: str
+        :param data: The response. Must be serializable to JSON.
+        :type data: object
+        :param validators: Values that tell whether the response has
+            changed, as returned by :func:`get_validators`.
+        :type validators: dict or None
+        """
+        if not self.enabled:
+            return
+
+        self._store(self._file_for(url, query), {
+            'url': url,
+            'query': query,
+            'timestamp': time.time(),
+            'validators': validators or {},
+            'data': data
+        })
+
+    def fetch(self, url, query, send, parse=None):
+        """Gets the response to a request from the host, sending the
+        validators of the stored one, if any, so that the host can tell it
+        has not changed. When that happens, or the new response carries the
+        same content, the stored response is returned without decoding the
+        new one.
+
+        :param url: URL the request is sent to.
+        :type url: str
+        :param query: Query sent along with the request.
+        :type query: str
+        :param send: Call that receives the headers to add to the request
+            and returns the host's response.
+        :type send: callable
+        :param parse: Call that receives the decoded JSON body of the
+            response and returns what is to be stored. 'None' stores the
+            body itself.
+        :type parse: callable or None
+        :return: The response.
+        :rtype: object
+        """
+        validators = self.get_validators(url, query)
+
+        response = send(get_conditional_headers(validators))
+        if response.status_code == 304:
+            data = self.renew(url, query)
+            if data is not None:
+                REQUEST_TIMINGS.mark_cache_hit()
+                return data
+
+            # The entry went away in the meantime
+            response = send({})
+
+        response.raise_for_status()
+
+        digest = hashlib.sha256(response.content).hexdigest()
+        if validators and validators.get('digest') == digest:
+            data = self.renew(url, query)
+            if data is not None:
+                REQUEST_TIMINGS.mark_cache_hit()
+                return data
+
+        data = response.json()
+        if parse is not None:
+            data = parse(data)
+
+        self.put(url, query, data, get_validators(response, digest))
+        return data
+
+    def clear(self):
+        """Removes all entries from the cache."""
+        with self._lock:
+            self._forget()
+            for entry in self._entries():
+                os.remove(entry.path)
+            self._size = 0
+
+    def _file_for(self, url, query):
+        key = hashlib.sha256(f'{url}{query}'.encode('utf8')).hexdigest()
+        return os.path.join(self.path, f'{key}.json')
+
+    def _load(self, file):
+        text = self._recall(file)
+        if text is None:
+            try:
+                with open(file, 'r', encoding='utf8') as buffer:
+                    text = buffer.read()
+            except OSError:
+                return None
+
+        try:
+            entry = json.loads(text)
+        except ValueError:
+            return None
+
+        self._remember(file, text)
+        return entry
+
+    def _store(self, file, entry):
+        try:
+            os.makedirs(self.path, exist_ok=True)
+
+            try:
+                replaced = os.stat(file).st_size
+            except FileNotFoundError:
+                replaced = 0
+
+            text = json.dumps(entry)
+            with open(f'{file}.tmp', 'w', encoding='utf8') as buffer:
+                buffer.write(text)
+            written = os.stat(f'{file}.tmp').st_size
+            # Readers must never see a half-written entry
+            os.replace(f'{file}.tmp', file)
+            self._remember(file, text)
+
+            self._grow(written - replaced)
+        except OSError as ex:
+            LOG.debug("failed to write cache entry for %s%s: %s",
+                      entry['url'], entry['query'], ex)
+
+    def _recall(self, file):
+        with self._memory_lock:
+            text = self._memory.get(file)
+            if text is not None:
+                self._memory.move_to_end(file)
+            return text
+
+    def _remember(self, file, text):
+        with self._memory_lock:
+            self._memory_size -= len(self._memory.pop(file, ''))
+            if len(text) > self.max_memory:
+                return
+
+            self._memory[file] = text
+            self._memory_size += len(text)
+
+            while self._memory_size > self.max_memory:
+                _, oldest = self._memory.popitem(last=False)
+                self._memory_size -= len(oldest)
+
+    def _forget(self, file=None):
+        with self._memory_lock:
+            if file is None:
+                self._memory.clear()
+                self._memory_size = 0
+            else:
+                self._memory_size -= len(self._memory.pop(file, ''))
+
+    @staticmethod
+    def _touch(file):
+        # Mark the entry as recently used, so that it is kept on eviction
+        try:
+            os.utime(file)
+        except OSError:
+            pass
+
+    def _entries(self):
+        try:
+            return [entry for entry in os.scandir(self.path)
+                    if entry.name.endswith('.json')]
+        except FileNotFoundError:
+            return []
+
+    def _grow(self, delta):
+        with self._lock:
+            if self._size is None:
+                # The entry just written is already on the directory
+                self._size = sum(entry.stat().st_size
+                                 for entry in self._entries())
+            else:
+                self._size += delta
+
+            if self._size > self.max_size:
+                self._evict()
+
+    def _evict(self):
+        # Other processes may share the directory, so start from what is on
+        # it rather than from the running total
+        entries = sorted(self._entries(),
+                         key=lambda entry: entry.stat().st_mtime)
+        self._size = sum(entry.stat().st_size for entry in entries)
+
+        while entries and self._size > self.max_size * self.EVICTION_RATIO:
+            oldest = entries.pop(0)
+            self._size -= oldest.stat().st_size
+            LOG.debug("evicting cache entry: %s", oldest.name)
+            os.remove(oldest.path)
+            self._forget(oldest.path)
+
+
+def get_validators(response, digest=None):
+    """
+    :param response: A response from a host.
+    :type response: :class:`requests.Response`
+    :param digest: Hash of the response's body.
+    :type digest: str or None
+    :return: The values that tell whether the response has changed: the
+        'ETag' and 'Last-Modified' headers given by the host, if any, and
+        the hash of the body.
+    :rtype: dict
+    """
+    validators = {}
+
+    if response.headers.get('ETag'):
+        validators['etag'] = response.headers['ETag']
+    if response.headers.get('Last-Modified'):
+        validators['last_modified'] = response.headers['Last-Modified']
+    if digest:
+        validators['digest'] = digest
+
+    return validators
+
+
+def get_conditional_headers(validators):
+    """
+    :param validators: Validators of a stored response.
+    :type validators: dict or None
+    :return: The headers that make a request conditional on the response
+        having changed.
+    :rtype: dict
+    """
+    headers = {}
+
+    if validators and validators.get('etag'):
+        headers['If-None-Match'] = validators['etag']
+    if validators and validators.get('last_modified'):
+        headers['If-Modified-Since'] = validators['last_modified']
+
+    return headers
+
+
+RESPONSE_CACHE = ResponseCache()
+"""Cache shared by all sources of the process."""
@@ -0,0 +1,192 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+import json
+import logging
+import os
+import time
+from threading import Lock
+
+from cibyl.sources.cache import RESPONSE_CACHE
+
+LOG = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Represents a request that was not made because its host is considered
+    to be down.
+    """
+
+
+class CircuitBreaker:
+    """Keeps track of the health of the hosts requests are sent to.
+
+    Once the share of failed requests among the last ones sent to a host
+    reaches a threshold, the circuit for that host opens and requests to it
+    are refused for a cool-down period. After it, a single request is let
+    through: if it works the circuit closes again, otherwise it stays open
+    for another period.
+
+    :ivar threshold: Share of failed requests, from 0 to 1, that opens the
+        circuit.
+    :ivar min_requests: Number of requests that must have been made before
+        the circuit can open.
+    :ivar window: Number of most recent requests looked at.
+    :ivar cooldown: Seconds the circuit stays open for.
+    :ivar path: File the state of the circuits is saved to whenever one of
+        them opens or closes, so that it survives between runs. 'None' to
+        keep it in memory only.
+    """
+
+    DIRECTORY = 'circuits'
+    """Directory, inside the response cache's, where the state of the
+    circuits is saved by default."""
+
+    def __init__(self, threshold=0.5, min_requests=3, window=10, cooldown=60,
+                 path=None):
+        """Constructor.
+
+        See the class' description for the parameters.
+        """
+        self.threshold = threshold
+        self.min_requests = min_requests
+        self.window = window
+        self.cooldown = cooldown
+        self.path = path
+        self._circuits = None
+        self._lock = Lock()
+
+    # pylint: disable=too-many-arguments
+    def configure(self, threshold=0.5, min_requests=3, window=10,
+                  cooldown=60, persist=False):
+        """Changes the settings of the breaker.
+
+        :param persist: Whether to save the state of the circuits to
+            :attr:`DIRECTORY`.
+        :type persist: bool
+
+        See the class' description for the rest of parameters.
+        """
+        self.threshold = threshold
+        self.min_requests = min_requests
+        self.window = window
+        self.cooldown = cooldown
+        self.path = os.path.join(RESPONSE_CACHE.path, self.DIRECTORY,
+                                 'circuits.json') if persist else None
+        self._circuits = None
+
+    @property
+    def circuits(self):
+        """
+        :return: State of each host's circuit: the outcome of the last
+            requests, True for success, and when the circuit was opened.
+        :rtype: dict[str, dict]
+        """
+        if self._circuits is None:
+            self._circuits = self._load()
+
+        return self._circuits
+
+    def is_open(self, host):
+        """Checks whether requests to a host must be refused. Once the
+        cool-down period is over, the next request is let through to try the
+        host again.
+
+        :param host: The host.
+        :type host: str
+        :return: True if the request must not be made, False if not.
+        :rtype: bool
+        """
+        with self._lock:
+            circuit = self.circuits.get(host)
+
+            if not circuit or circuit['opened_at'] is None:
+                return False
+
+            if time.time() - circuit['opened_at'] < self.cooldown:
+                return True
+
+            # Half-open, let this one through but not the ones after it
+            circuit['opened_at'] = time.time()
+            return False
+
+    def record(self, host, success):
+        """Takes note of the outcome of a request.
+
+        :param host: Host the request was sent to.
+        :type host: str
+        :param success: Whether the host answered as expected.
+        :type success: bool
+        """
+        with self._lock:
+            circuit = self.circuits.setdefault(
+                host, {'outcomes': [], 'opened_at': None})
+
+            was_open = circuit['opened_at'] is not None
+
+            if success and was_open:
+                # The host is back, start over
+                circuit['outcomes'] = [True]
+                circuit['opened_at'] = None
+            else:
+                circuit['outcomes'] = \
+                    (circuit['outcomes'] + [success])[-self.window:]
+
+                failures = circuit['outcomes'].count(False)
+                outcomes = len(circuit['outcomes'])
+
+                if not success and \
+                        (was_open or (outcomes >= self.min_requests and
+                                      failures / outcomes >= self.threshold)):
+                    circuit['opened_at'] = time.time()
+
+            is_open = circuit['opened_at'] is not None
+            if is_open != was_open:
+                LOG.warning("circuit for host %s is now %s",
+                            host, 'open' if is_open else 'closed')
+                self._save()
+
+    def reset(self):
+        """Closes all circuits and forgets about past requests."""
+        with self._lock:
+            self._circuits = {}
+            self._save()
+
+    def _load(self):
+        if not self.path:
+            return {}
+
+        try:
+            with open(self.path, 'r', encoding='utf8') as buffer:
+                return json.load(buffer)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        if not self.path:
+            return
+
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+            with open(f'{self.path}.tmp', 'w', encoding='utf8') as buffer:
+                json.dump(self._circuits, buffer)
+            os.replace(f'{self.path}.tmp', self.path)
+        except OSError as ex:
+            LOG.debug("failed to save circuits state: %s", ex)
+
+
+CIRCUIT_BREAKER = CircuitBreaker()
+"""Breaker shared by all sources of the process."""
@@ -15,14 +15,27 @@
 """
 
 import logging
+import socket
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
+from urllib.parse import quote, unquote, urlsplit
 
 import jenkins
+import requests
 
 from cibyl.exceptions.jenkins import JenkinsError
 from cibyl.models.ci.build import Build
+from cibyl.models.ci.build_columns import BuildColumns
 from cibyl.models.ci.job import Job
-from cibyl.sources.source import Source, safe_request_generic
+from cibyl.sources.batch_loader import BatchLoader
+from cibyl.sources.build_history import BuildHistory
+from cibyl.sources.cache import RESPONSE_CACHE
+from cibyl.sources.session_pool import SESSION_POOL
+from cibyl.sources.source import (Source, filter_jobs, read_jobs_query,
+                                  safe_request_generic)
+from cibyl.sources.timings import REQUEST_TIMINGS
+from cibyl.utils.json import iter_array
 
 LOG = logging.getLogger(__name__)
 
@@ -30,14 +43,367 @@ LOG = logging.getLogger(__name__)
 safe_request = partial(safe_request_generic, custom_error=JenkinsError)
 
 
-# pylint: disable=no-member
+def split_jobs_scope(jobs_scope: str):
+    """
+        Split a jobs scope into the item Jenkins can be asked about directly
+        and the pattern left to filter its jobs with. Leading path components
+        without wildcards are folders, or views if written as 'view:<name>'.
+        For example, 'view:osp/tripleo/*-master' gives the item
+        'view/osp/job/tripleo' and the pattern '*-master'.
+
+        :param jobs_scope: Glob-like pattern of the jobs to consider
+        :type jobs_scope: str
+
+        :returns: The item and the remaining pattern
+        :rtype: tuple
+    """
+    components = (jobs_scope or "*").split('/')
+
+    path = []
+    for component in components[:-1]:
+        if any(char in component for char in "*?["):
+            break
+        path.append(component)
+
+    item = '/'.join(
+        f"view/{component[len('view:'):]}" if component.startswith('view:')
+        else f"job/{component}"
+        for component in path
+    )
+
+    return item, '/'.join(components[len(path):])
+
+
+def started_since(build: dict, builds_since: int):
+    """
+        Check whether a build received from the server started after a
+        given time. Builds with no timestamp are left out, as nothing tells
+        them apart from old ones.
+
+        :param build: Build received from jenkins server
+        :type build: dict
+        :param builds_since: The time, in milliseconds since the epoch
+        :type builds_since: int
+
+        :returns: Whether the build started after the time
+        :rtype: bool
+    """
+    return build.get('timestamp', 0) >= builds_since
+
+
+def get_builds_info(job: dict):
+    """
+        Get the builds that came with a job received from the server,
+        whether they were asked for as 'builds', which only holds the
+        newest 100 of them, or as 'allBuilds', which holds them all.
+
+        :param job: Job received from jenkins server
+        :type job: dict
+
+        :returns: The builds, newest first
+        :rtype: list
+    """
+    if 'builds' in job:
+        return job['builds'] or []
+
+    return job.get('allBuilds') or []
+
+
+FOLDER_CLASSES = ('Folder', 'MultiBranchProject')
+"""Endings of the '_class' of the items that hold other jobs."""
+
+
+def is_folder(job: dict):
+    """
+        Check whether a job received from the server is a folder, a
+        multibranch project or an organization folder.
+
+        :param job: Job received from jenkins server
+        :type job: dict
+
+        :returns: Whether the job holds other jobs
+        :rtype: bool
+    """
+    return job.get('_class', '').endswith(FOLDER_CLASSES)
+
+
+def get_folder_item(folder: dict, url: str = ""):
+    """
+        Get the item Jenkins can be asked about for the jobs of a folder.
+
+        :param folder: Folder received from jenkins server
+        :type folder: dict
+        :param url: Jenkins instance address, used if the folder came
+        without its full name
+        :type url: str
+
+        :returns: The item
+        :rtype: str
+    """
+    if folder.get('fullName'):
+        return '/'.join(f"job/{name}"
+                        for name in folder['fullName'].split('/'))
+
+    # The server may name itself with another scheme, host or port than
+    # the configured address, only the paths are worth comparing
+    path = urlsplit(folder['url']).path
+    base = urlsplit(url).path.rstrip('/')
+    if path.startswith(f"{base}/"):
+        path = path[len(base):]
+
+    return unquote(path.strip('/'))
+
+
+def deepen_jobs_query(query: str, depth: int):
+    """
+        Turn a tree query for the jobs of an item into one that also gets
+        the jobs of its folders, down to a given depth. Jobs get their full
+        name added, which is unique across the server.
+
+        :param query: Query of the form '?tree=jobs[<fields>]'
+        :type query: str
+        :param depth: Levels of folders to get the jobs of
+        :type depth: int
+
+        :returns: The new query
+        :rtype: str
+    """
+    fields = query[len("?tree=jobs["):-1] + ",fullName"
+
+    tree = f"jobs[{fields}]"
+    for _ in range(depth):
+        tree = f"jobs[{fields},{tree}]"
+
+    return f"?tree={tree}"
+
+
+def flatten_jobs(jobs):
+    """
+        Go through the jobs received from a server together with those
+        nested inside the folders that came with them, as asked for by
+        :func:`deepen_jobs_query`.
+
+        :param jobs: Jobs received from jenkins server
+        :type jobs: iterable
+
+        :returns: All the jobs and folders, parents before their children
+        :rtype: list
+    """
+    found = []
+    pending = deque(jobs)
+    while pending:
+        job = pending.popleft()
+        found.append(job)
+        if is_folder(job):
+            pending.extend(job.get('jobs') or [])
+
+    return found
+
+
+def sort_out_jobs(pending: deque, seen: set, found: list):
+    """
+        Go through a batch of jobs received from a server, unpacking the
+        folders that come with their jobs nested inside. Jobs already seen
+        are dropped.
+
+        :param pending: Jobs to go through, emptied by the call
+        :type pending: :class:`collections.deque`
+        :param seen: Full names, or addresses, of the jobs seen so far
+        :type seen: set
+        :param found: Jobs that are not folders, to add the new ones to
+        :type found: list
+
+        :returns: The folders whose jobs are still to be asked for
+        :rtype: list
+    """
+    folders = []
+    while pending:
+        job = pending.popleft()
+        key = job.get('fullName') or job.get('url')
+        if key in seen:
+            continue
+        seen.add(key)
+
+        if not is_folder(job):
+            found.append(job)
+        elif 'jobs' in job:
+            pending.extend(job['jobs'])
+        else:
+            folders.append(job)
+
+    return folders
+
+
+def walk_jobs(jobs, get_folder_jobs, max_workers: int = 10):
+    """
+        Flatten the tree of jobs found on a server. Folders whose jobs are
+        not known are asked for in parallel, level by level. Jobs seen more
+        than once, as when listed under several views, are only kept the
+        first time.
+
+        :param jobs: Jobs received from jenkins server
+        :type jobs: iterable
+        :param get_folder_jobs: Call that receives a folder and returns the
+        jobs in it
+        :type get_folder_jobs: callable
+        :param max_workers: Maximum number of folders asked for at once
+        :type max_workers: int
+
+        :returns: All jobs found that are not folders
+        :rtype: list
+    """
+    found = []
+    seen = set()
+    pending = deque(jobs)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while pending:
+            folders = sort_out_jobs(pending, seen, found)
+            for children in executor.map(get_folder_jobs, folders):
+                pending.extend(children)
+
+    return found
+
+
+def model_builds(builds_info: list, columnar: bool = False):
+    """
+        Create the builds of a job using jenkins builds information.
+
+        :param builds_info: Builds received from jenkins server
+        :type builds_info: list
+        :param columnar: Whether to hold the builds column by column
+        :type columnar: bool
+
+        :returns: The builds, as taken by
+        :meth:`cibyl.models.model.Model.load`
+        :rtype: list or :class:`BuildColumns`
+    """
+    if columnar:
+        # Builds go straight into the columns, never modeled
+        columns = BuildColumns(name='builds', spec=Job.API['builds'])
+        for build in builds_info:
+            columns.add(str(build["number"]), build["result"],
+                        build.get("timestamp"))
+        return columns
+
+    return Build.from_records(builds_info, build_id="number",
+                              status="result")
+
+
+# pylint: disable=too-many-arguments
+def populate_jobs(system, jobs, builds_limit: int = None,
+                  builds_since: int = None, loader: BatchLoader = None,
+                  columnar: bool = False):
+    """
+        Create Job models using jenkins jobs information. Jobs are named
+        after their full name when they come with one, as when looking
+        inside folders.
+
+        :param system: System model to input the jobs to
+        :type system: :class:`cibyl.models.ci.system.System`
+        :param jobs: Jobs received from jenkins server
+        :type jobs: iterable
+        :param builds_limit: Maximum number of builds to model for each
+        job, all of them if None
+        :type builds_limit: int
+        :param builds_since: Only model builds started after this time,
+        in milliseconds since the epoch, see :func:`started_since`
+        :type builds_since: int
+        :param loader: Loader the builds of each job are deferred to,
+        instead of taking them from the jobs
+        :type loader: :class:`BatchLoader`
+        :param columnar: Whether the jobs hold their builds column by
+        column
+        :type columnar: bool
+    """
+    for job in jobs:
+        if "job" not in job["_class"]:
+            # jenkins may return folders as job objects
+            continue
+        # Names are only unique inside a folder, jobs found inside folders
+        # go by their full name instead
+        model = Job(name=job.get('fullName') or job.get('name'),
+                    url=job.get('url'))
+
+        if loader is not None:
+            loader.defer(model, 'builds', job)
+            system.add_job(model)
+            continue
+
+        builds_info = get_builds_info(job)
+        if builds_info and builds_since:
+            builds_info = [build for build in builds_info
+                           if started_since(build, builds_since)]
+        if builds_info and builds_limit:
+            builds_info = builds_info[:builds_limit]
+
+        if builds_info or columnar:
+            model.load('builds', model_builds(builds_info, columnar))
+
+        # Only complete jobs are added, as they may be published already
+        system.add_job(model)
+
+
+def start_jobs_query(source, system, args: dict):
+    """
+        Start a query performed by a jenkins source, reading what it asks
+        for about the jobs of a system, see
+        :func:`cibyl.sources.source.read_jobs_query`, and where they are to
+        be found according to the scope of the system, see
+        :func:`split_jobs_scope`.
+
+        :param source: Source the query is performed by
+        :type source: :class:`cibyl.sources.source.Source`
+        :param system: System the query is performed on
+        :type system: :class:`cibyl.models.ci.system.System`
+        :param args: Arguments of the query
+        :type args: dict
+
+        :returns: What is asked for, the item to list the jobs from and the
+        pattern their names must match. None if the query is not about jobs
+        :rtype: tuple or None
+    """
+    LOG.debug("querying system %s using source: %s",
+              system.name.value, source.name)
+
+    jobs_query = read_jobs_query(args)
+    if not jobs_query:
+        return None
+
+    return (jobs_query, *split_jobs_scope(system.jobs_scope.value))
+
+
+# pylint: disable=no-member,too-many-instance-attributes
 class Jenkins(Source):
     """A class representation of Jenkins client."""
 
     jobs_query = "?tree=jobs[name,url]"
-    jobs_builds_query = "?tree=jobs[name,url,builds[number,result]]"
+    jobs_builds_query = \
+        "?tree=jobs[name,url,builds[number,result,timestamp]]"
+    jobs_last_build_query = \
+        "?tree=jobs[name,url,lastBuild[number],firstBuild[number]]"
+    # Jenkins only gives out the newest 100 builds of a job as 'builds',
+    # those past them must be asked for through 'allBuilds'
+    jobs_last_builds_query = \
+        "?tree=jobs[name,url,allBuilds[number,result,timestamp]{{0,{}}}]"
+    jobs_all_builds_query = \
+        "?tree=jobs[name,url,allBuilds[number,result,timestamp]]"
+    jobs_builds_page_query = \
+        "?tree=jobs[name,url,allBuilds[number,result,timestamp]{{{},{}}}]"
+    job_builds_query = "?tree=allBuilds[number,result,timestamp]"
+    job_last_builds_query = \
+        "?tree=allBuilds[number,result,timestamp]{{0,{}}}"
+    builds_page_size = 100
+    lazy_batch_size = 20
+    streams_jobs = True
+    stream_chunk_size = 64 * 1024
 
-    def __init__(self, url: str, username: str, token: str, cert: str = None):
+    # pylint: disable=too-many-arguments
+    def __init__(self, url: str, username: str, token: str, cert: str = None,
+                 incremental: bool = False, stream: bool = False,
+                 recursive: bool = False, folder_depth: int = None,
+                 max_folder_requests: int = 10,
+                 columnar_builds: bool = False, lazy_builds: bool = False):
         """
             Create a client to talk to a jenkins instance.
 
@@ -51,70 +417,484 @@ class Jenkins(Source):
             :type url: str
             :param cert: Path to a file with SSL certificates
             :type cert: str
+            :param incremental: Whether to remember the builds seen on
+            previous runs and only ask for the newer ones
+            :type incremental: bool
+            :param stream: Whether to parse the jobs as they arrive instead
+            of waiting for the whole response, bypassing the cache
+            :type stream: bool
+            :param recursive: Whether to look for jobs inside folders and
+            multibranch projects
+            :type recursive: bool
+            :param folder_depth: Levels of folders to get in the same request
+            as the jobs above them, when looking inside folders. Deeper
+            folders are asked for on their own
+            :type folder_depth: int
+            :param max_folder_requests: Maximum number of folders asked for
+            at once
+            :type max_folder_requests: int
+            :param columnar_builds: Whether the jobs hold their builds column
+            by column, for long histories
+            :type columnar_builds: bool
+            :param lazy_builds: Whether to leave the builds of each job to be
+            fetched the first time they are looked at, in batches, instead
+            of along with the jobs
+            :type lazy_builds: bool
         """
         super().__init__("", url)
         self.client = jenkins.Jenkins(url, username=username, password=token)
-        self.client._session.verify = cert
 
+        # Keep what python-jenkins set up on its own session: the headers
+        # from JENKINS_API_EXTRA_HEADERS and no verification if asked so
+        # through PYTHONHTTPSVERIFY=0
+        own_session = self.client._session
+        if cert is None and own_session.verify is False:
+            cert = False
+
+        # python-jenkins sets the authentication on the session itself, so
+        # it is only shared by sources using the same credentials
+        session = SESSION_POOL.get_session(
+            url, cert, (username, token), jenkins.WrappedSession)
+        defaults = requests.utils.default_headers()
+        session.headers.update(
+            {name: value for name, value in own_session.headers.items()
+             if defaults.get(name) != value})
+        self.client._session = session
+        self.cache = RESPONSE_CACHE
+        # Kept along with the response cache, wherever it is configured to
+        self.history = BuildHistory(url) if incremental else None
+        self.stream = stream
+        self.recursive = recursive
+        self.folder_depth = folder_depth
+        self.max_folder_requests = max_folder_requests
+        self.columnar_builds = columnar_builds
+        self.lazy_builds = lazy_builds
+
+    def get_jobs_query(self, get_builds: bool, builds_limit: int = None):
+        """
+            Get the tree query used to list the jobs of the server.
+
+            :param get_builds: Whether to get info about the jobs' builds
+            :type get_builds: bool
+            :param builds_limit: Maximum number of builds to get for each
+            job, all of them if None
+            :type builds_limit: int
+
+            :returns: The query
+            :rtype: str
+        """
+        if not get_builds:
+            return self.deepen_query(self.jobs_query)
+
+        if builds_limit:
+            return self.deepen_query(
+                self.jobs_last_builds_query.format(builds_limit))
+
+        return self.deepen_query(self.jobs_builds_query)
+
+    def deepen_query(self, query: str):
+        """
+            Make a tree query for the jobs of an item also get those inside
+            its folders, if the source is recursive. See
+            :func:`deepen_jobs_query`.
+
+            :param query: Query of the form '?tree=jobs[<fields>]'
+            :type query: str
+
+            :returns: The query to send
+            :rtype: str
+        """
+        if self.recursive:
+            return deepen_jobs_query(query, self.folder_depth or 0)
+
+        return query
+
+    # pylint: disable=too-many-arguments
     @safe_request
-    def get_jobs(self, get_builds: bool):
+    def get_jobs(self, get_builds: bool, item: str = "",
+                 builds_limit: int = None, builds_since: int = None):
         """
             Get all jobs from jenkins server.
 
             :param get_builds: Whether to get info about the jobs' builds
             :type get_builds: bool
+            :param item: Folder or view to get the jobs from, the whole
+            server if empty
+            :type item: str
+            :param builds_limit: Maximum number of builds to get for each
+            job, all of them if None
+            :type builds_limit: int
+            :param builds_since: Only get builds started after this time, in
+            milliseconds since the epoch
+            :type builds_since: int
 
             :returns: All jobs from jenkins server, as dictionaries of _class,
             name, fullname, url, color
             :rtype: list
         """
-        if get_builds:
-            return self.client.get_info(query=self.jobs_builds_query)["jobs"]
+        query = self.get_jobs_query(get_builds, builds_limit)
+        key = item + query
+        if get_builds and builds_since:
+            key += f"@{builds_since}"
+
+        jobs = self.cache.get(self.url, key)
 
-        return self.client.get_info(query=self.jobs_query)["jobs"]
+        if jobs is not None:
+            REQUEST_TIMINGS.mark_cache_hit()
+        else:
+            if get_builds and builds_since:
+                jobs = self.get_builds_since(item, builds_since, builds_limit)
+            elif get_builds and not builds_limit and self.history is not None:
+                jobs = self.get_new_builds(item)
+            else:
+                # Validators of the stored response go along with the
+                # request, so that it is not downloaded again if unchanged
+                return self.cache.fetch(
+                    self.url, key,
+                    lambda headers: self._request_info(item, query, headers),
+                    lambda info: info["jobs"])
+            self.cache.put(self.url, key, jobs)
 
-    # pylint: disable=no-self-use
-    def populate_jobs(self, system, jobs: list[dict]):
+        return jobs
+
+    def get_builds_since(self, item: str, builds_since: int,
+                         builds_limit: int = None):
         """
-            Create Job models using jenkins jobs information.
+            Get all jobs from jenkins server, together with the builds they
+            started after a given time. Builds are requested page by page,
+            newest first, until all jobs have gone past that time or hit the
+            limit of builds. Jobs inside folders are included if the source
+            is recursive, and folders beyond its depth handed over as they
+            came.
+
+            :param item: Folder or view to get the jobs from, the whole
+            server if empty
+            :type item: str
+            :param builds_since: Time after which builds must have started,
+            in milliseconds since the epoch
+            :type builds_since: int
+            :param builds_limit: Maximum number of builds to get for each
+            job, all of them if None
+            :type builds_limit: int
 
-            :param system: System model to input the jobs to
-            :type system: :class:`cibyl.models.ci.system.System`
-            :param jobs: Jobs received from jenkins server
-            :type jobs: list
+            :returns: All jobs from jenkins server, with their builds
+            :rtype: list
         """
-        for job in jobs:
-            if "job" not in job["_class"]:
-                # jenkins may return folders as job objects
+        page_size = self.builds_page_size
+        if builds_limit:
+            page_size = min(page_size, builds_limit)
+
+        jobs = {}
+        folders = {}
+        done = set()
+        start = 0
+        while True:
+            page = flatten_jobs(self.client.get_info(
+                item=item,
+                query=self.deepen_query(self.jobs_builds_page_query.format(
+                    start, start + page_size)))["jobs"])
+
+            for job in page:
+                url = job['url']
+                if is_folder(job):
+                    # Those that came with their jobs are already unpacked
+                    if 'jobs' not in job:
+                        folders[url] = job
+                    continue
+
+                if url not in jobs:
+                    jobs[url] = {**job, 'builds': []}
+                    jobs[url].pop('allBuilds', None)
+                known = jobs[url]
+                if url in done:
+                    continue
+
+                builds = get_builds_info(job)
+                recent = [build for build in builds
+                          if started_since(build, builds_since)]
+                known['builds'].extend(recent)
+
+                if len(builds) < page_size or len(recent) < len(builds) or \
+                        (builds_limit and
+                         len(known['builds']) >= builds_limit):
+                    done.add(url)
+
+            if len(done) == len(jobs):
+                break
+
+            start += page_size
+
+        return [
+            {**job, 'builds': job['builds'][:builds_limit]}
+            for job in jobs.values()
+        ] + list(folders.values())
+
+    @safe_request
+    def get_job_builds(self, job: dict, builds_limit: int = None,
+                       builds_since: int = None):
+        """
+            Get the builds of a single job.
+
+            :param job: Job received from jenkins server
+            :type job: dict
+            :param builds_limit: Maximum number of builds to get, all of them
+            if None
+            :type builds_limit: int
+            :param builds_since: Only get builds started after this time, in
+            milliseconds since the epoch
+            :type builds_since: int
+
+            :returns: The builds, newest first
+            :rtype: list
+        """
+        query = self.job_last_builds_query.format(builds_limit) \
+            if builds_limit else self.job_builds_query
+        item = get_folder_item(job, self.url)
+        key = item + query
+
+        builds = self.cache.get(self.url, key)
+        if builds is not None:
+            REQUEST_TIMINGS.mark_cache_hit()
+        else:
+            builds = self.cache.fetch(
+                self.url, key,
+                lambda headers: self._request_info(item, query, headers),
+                get_builds_info)
+
+        if builds_since:
+            builds = [build for build in builds
+                      if started_since(build, builds_since)]
+
+        return builds
+
+    def get_new_builds(self, item: str = ""):
+        """
+            Get all jobs from jenkins server, asking only for the builds
+            that came after the ones on the history of the source. The new
+            builds are merged into the history, which is then saved. Jobs
+            inside folders are included if the source is recursive, and
+            folders beyond its depth handed over as they came.
+
+            :param item: Folder or view to get the jobs from, the whole
+            server if empty
+            :type item: str
+
+            :returns: All jobs from jenkins server, with all their known
+            builds
+            :rtype: list
+        """
+        if self.cache.refresh:
+            self.history.clear()
+
+        tree = flatten_jobs(self.client.get_info(
+            item=item,
+            query=self.deepen_query(self.jobs_last_build_query))["jobs"])
+        listing = [job for job in tree if not is_folder(job)]
+        # Folders that came without their jobs are left to the caller,
+        # while the jobs of the others are all in the listing
+        folders = [job for job in tree if is_folder(job) and 'jobs' not in job]
+        listed = {item} | {get_folder_item({'url': job['url']}, self.url)
+                           for job in tree if is_folder(job) and 'jobs' in job}
+
+        depth = 0
+        unknown = set()
+        for job in listing:
+            # Job URLs, unlike their names, are unique across folders
+            last_seen = self.history.last_seen(job['url'])
+            if last_seen is None:
+                unknown.add(job['url'])
                 continue
-            job_name = job.get('name')
-            builds_info = job.get('builds')
-            builds = None
-            if builds_info:
-                builds = [Build(str(build["number"]), build["result"])
-                          for build in builds_info]
 
-            system.jobs.append(Job(name=job_name, url=job.get('url'),
-                                   builds=builds))
+            last_build = (job.get('lastBuild') or {}).get('number', 0)
+            depth = max(depth, last_build - last_seen)
+
+        jobs = listing
+        if unknown and len(unknown) == len(listing):
+            # Nothing known yet, go for the whole history in one request
+            jobs = flatten_jobs(self.client.get_info(
+                item=item,
+                query=self.deepen_query(self.jobs_all_builds_query))["jobs"])
+            unknown.clear()
+        elif depth > 0:
+            LOG.debug("fetching the last %d builds of each job", depth)
+            jobs = flatten_jobs(self.client.get_info(
+                item=item,
+                query=self.deepen_query(
+                    self.jobs_last_builds_query.format(depth)))["jobs"])
+        jobs = [job for job in jobs if not is_folder(job)]
+
+        first_builds = {job['url']: (job.get('firstBuild') or {}).get('number')
+                        for job in listing}
+
+        for job in jobs:
+            builds = get_builds_info(job)
+            job.pop('allBuilds', None)
+            if job['url'] in unknown:
+                # Nothing known about this job alone, go for its history
+                LOG.debug("job %s not in history, fetching all builds",
+                          job['name'])
+                builds = self.get_job_builds(job)
+
+            job.pop('lastBuild', None)
+            job.pop('firstBuild', None)
+            job['builds'] = self.history.merge(
+                job['url'], builds, first_builds.get(job['url']))
+
+        # Builds of jobs deleted from the listed folders are not kept around
+        self.history.prune(
+            (job['url'] for job in listing),
+            lambda url: get_folder_item(
+                {'url': url}, self.url).rpartition('/job/')[0] in listed)
+
+        self.history.save()
+        return jobs + folders
+
+    @safe_request
+    def stream_jobs(self, get_builds: bool, item: str = "",
+                    builds_limit: int = None):
+        """
+            Get all jobs from jenkins server, decoding them one by one as
+            the response arrives, so that memory usage does not depend on
+            the size of the server.
+
+            :param get_builds: Whether to get info about the jobs' builds
+            :type get_builds: bool
+            :param item: Folder or view to get the jobs from, the whole
+            server if empty
+            :type item: str
+            :param builds_limit: Maximum number of builds to get for each
+            job, all of them if None
+            :type builds_limit: int
+
+            :returns: All jobs from jenkins server, as dictionaries of _class,
+            name, fullname, url, color
+            :rtype: generator
+        """
+        query = self.get_jobs_query(get_builds, builds_limit)
+
+        with self._open_stream(item, query) as response:
+            yield from iter_array(
+                response.iter_content(self.stream_chunk_size), "jobs")
+
+    def _open_stream(self, item: str, query: str):
+        """
+            Send a request for an item of the jenkins server, without
+            downloading the response's body yet.
+
+            :param item: Item to get information about
+            :type item: str
+            :param query: Tree query for the request
+            :type query: str
+
+            :returns: The response to the request
+            :rtype: :class:`requests.Response`
+        """
+        response = self._request_info(item, query, stream=True)
+        response.raise_for_status()
+        return response
+
+    # pylint: disable=protected-access
+    def _request_info(self, item: str, query: str, headers: dict = None,
+                      stream: bool = False):
+        """
+            Send a request for an item of the jenkins server.
+
+            :param item: Item to get information about
+            :type item: str
+            :param query: Tree query for the request
+            :type query: str
+            :param headers: Headers to add to the request
+            :type headers: dict
+            :param stream: Whether to leave the response's body to be
+            downloaded as it is read
+            :type stream: bool
+
+            :returns: The response to the request, whatever its status
+            :rtype: :class:`requests.Response`
+        """
+        self.client._maybe_add_auth()
+
+        path = quote('/'.join((item, jenkins.INFO)).lstrip('/')) + query
+        request = self.client._session.prepare_request(
+            requests.Request('GET', self.client._build_url(path),
+                             headers=headers))
+
+        # The client's default stands for no timeout, which requests does
+        # not understand
+        timeout = self.client.timeout
+        if timeout is socket._GLOBAL_DEFAULT_TIMEOUT:
+            timeout = None
+
+        return self.client._session.send(
+            request, stream=stream, timeout=timeout)
+
+    def model_builds(self, builds_info: list):
+        """
+            Create the builds of a job using jenkins builds information, see
+            :func:`model_builds`.
+        """
+        return model_builds(builds_info, self.columnar_builds)
+
+    # pylint: disable=too-many-arguments
+    def populate_jobs(self, system, jobs: list[dict],
+                      builds_limit: int = None, builds_since: int = None,
+                      loader: BatchLoader = None):
+        """
+            Create Job models using jenkins jobs information, see
+            :func:`populate_jobs`.
+        """
+        populate_jobs(system, jobs, builds_limit, builds_since, loader,
+                      self.columnar_builds)
 
     # pylint: disable=inconsistent-return-statements
     def query(self, system, args):
-        LOG.debug("querying system %s using source: %s",
-                  system.name.value, self.__name__)
+        scoped_query = start_jobs_query(self, system, args)
+        if scoped_query:
+            jobs_query, item, pattern = scoped_query
+            job_names = jobs_query.job_names
+            builds_limit = jobs_query.builds_limit
+            builds_since = jobs_query.builds_since
+            # Lazy builds are left for when they are looked at
+            get_builds = not self.lazy_builds and jobs_query.get_builds
+
+            if self.stream:
+                jobs = self.stream_jobs(get_builds, item, builds_limit)
+            else:
+                jobs = self.get_jobs(get_builds, item, builds_limit,
+                                     builds_since)
+
+            if self.recursive:
+                jobs = walk_jobs(
+                    jobs,
+                    lambda folder: self.get_jobs(
+                        get_builds, get_folder_item(folder, self.url),
+                        builds_limit, builds_since),
+                    self.max_folder_requests)
+
+            loader = None
+            if self.lazy_builds and jobs_query.get_builds:
+                loader = BatchLoader(
+                    lambda job: self.model_builds(self.get_job_builds(
+                        job, builds_limit, builds_since)),
+                    self.lazy_batch_size, self.max_folder_requests)
 
-        if args.get('jobs'):
-            jobs = self.get_jobs(args.get('builds', False))
-            self.populate_jobs(system, jobs)
+            self.populate_jobs(system,
+                               filter_jobs(jobs, pattern, job_names),
+                               builds_limit, builds_since, loader)
 
-        if all(argument.populated for argument in args):
+        if all(argument.populated for argument in args.values()):
             return system
 
 
 class JenkinsOSP(Jenkins):
     """A class representation of OSP Jenkins client."""
 
-    # pylint: disable=useless-super-delegation
-    def __init__(self, url: str, username: str, token: str, cert: str = None):
+    # pylint: disable=useless-super-delegation,too-many-arguments
+    def __init__(self, url: str, username: str, token: str, cert: str = None,
+                 incremental: bool = False, stream: bool = False,
+                 recursive: bool = False, folder_depth: int = None,
+                 max_folder_requests: int = 10,
+                 columnar_builds: bool = False, lazy_builds: bool = False):
         """
             Create a client to talk to a jenkins instance.
 
@@ -128,5 +908,30 @@ class JenkinsOSP(Jenkins):
             :type url: str
             :param cert: Path to a file with SSL certificates
             :type cert: str
+            :param incremental: Whether to remember the builds seen on
+            previous runs and only ask for the newer ones
+            :type incremental: bool
+            :param stream: Whether to parse the jobs as they arrive instead
+            of waiting for the whole response, bypassing the cache
+            :type stream: bool
+            :param recursive: Whether to look for jobs inside folders and
+            multibranch projects
+            :type recursive: bool
+            :param folder_depth: Levels of folders to get in the same request
+            as the jobs above them, when looking inside folders. Deeper
+            folders are asked for on their own
+            :type folder_depth: int
+            :param max_folder_requests: Maximum number of folders asked for
+            at once
+            :type max_folder_requests: int
+            :param columnar_builds: Whether the jobs hold their builds column
+            by column, for long histories
+            :type columnar_builds: bool
+            :param lazy_builds: Whether to leave the builds of each job to be
+            fetched the first time they are looked at, in batches, instead
+            of along with the jobs
+            :type lazy_builds: bool
         """
-        super().__init__(url, username, token, cert)
+        super().__init__(url, username, token, cert, incremental, stream,
+                         recursive, folder_depth, max_folder_requests,
+                         columnar_builds, lazy_builds)
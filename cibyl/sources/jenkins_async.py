@@ -0,0 +1,367 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+
+import asyncio
+import json
+import logging
+import ssl
+from collections import deque
+from urllib.parse import quote, urlsplit
+
+import aiohttp
+
+from cibyl.sources.cache import RESPONSE_CACHE
+from cibyl.sources.jenkins import (Jenkins, deepen_jobs_query, get_builds_info,
+                                   get_folder_item, model_builds,
+                                   populate_jobs, safe_request, sort_out_jobs,
+                                   start_jobs_query, started_since)
+from cibyl.sources.source import Source, filter_jobs
+from cibyl.sources.timings import REQUEST_TIMINGS
+
+LOG = logging.getLogger(__name__)
+
+
+# pylint: disable=no-member,too-many-instance-attributes
+class AsyncJenkins(Source):
+    """A class representation of Jenkins client, that sends its requests
+    concurrently from a single event loop.
+    """
+
+    jobs_query = "?tree=jobs[name,url]"
+    job_builds_query = Jenkins.job_builds_query
+    job_last_builds_query = Jenkins.job_last_builds_query
+    # Jenkins only gives out the newest 100 builds of a job as 'builds',
+    # those past them must be asked for through 'allBuilds'
+    job_builds_page_query = \
+        "?tree=allBuilds[number,result,timestamp]{{{},{}}}"
+    builds_page_size = Jenkins.builds_page_size
+    streams_jobs = True
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, url: str, username: str, token: str, cert: str = None,
+                 max_requests_per_host: int = 20, recursive: bool = False,
+                 folder_depth: int = None, columnar_builds: bool = False):
+        """
+            Create a client to talk to a jenkins instance.
+
+            :param url: Jenkins instance address
+            :type url: str
+            :param username: Jenkins username
+            :type username: str
+            :param token: Jenkins access token
+            :type token: str
+            :param cert: Path to a file with SSL certificates
+            :type cert: str
+            :param max_requests_per_host: Maximum number of requests waiting
+            for an answer from a host at the same time
+            :type max_requests_per_host: int
+            :param recursive: Whether to look for jobs inside folders and
+            multibranch projects
+            :type recursive: bool
+            :param folder_depth: Levels of folders to get in the same request
+            as the jobs above them, when looking inside folders. Deeper
+            folders are asked for on their own
+            :type folder_depth: int
+            :param columnar_builds: Whether the jobs hold their builds column
+            by column, for long histories
+            :type columnar_builds: bool
+        """
+        super().__init__("", url)
+        self.username = username
+        self.token = token
+        self.cert = cert
+        self.max_requests_per_host = max_requests_per_host
+        self.recursive = recursive
+        self.folder_depth = folder_depth
+        self.columnar_builds = columnar_builds
+        self.cache = RESPONSE_CACHE
+        self._semaphores = {}
+
+    def open_session(self):
+        """
+            Open the session the requests of a query are sent through. It
+            must be opened, and closed, from within the event loop of the
+            query.
+
+            :returns: The session
+            :rtype: :class:`aiohttp.ClientSession`
+        """
+        ssl_context = ssl.create_default_context(cafile=self.cert) \
+            if self.cert else None
+        connector = aiohttp.TCPConnector(
+            limit_per_host=self.max_requests_per_host, ssl=ssl_context)
+        return aiohttp.ClientSession(
+            connector=connector,
+            auth=aiohttp.BasicAuth(self.username, self.token),
+            raise_for_status=True)
+
+    def get_semaphore(self, url: str):
+        """
+            Get the semaphore that limits the requests in flight to the host
+            of an address.
+
+            :param url: Address a request is going to be sent to
+            :type url: str
+
+            :returns: The semaphore
+            :rtype: :class:`asyncio.Semaphore`
+        """
+        host = urlsplit(url).netloc
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(
+                self.max_requests_per_host)
+        return self._semaphores[host]
+
+    def get_item_url(self, item: str, query: str):
+        """
+            Get the address of the JSON API of an item of the server.
+
+            :param item: Folder, view or job on the server, the server itself
+            if empty
+            :type item: str
+            :param query: Tree query for the request
+            :type query: str
+
+            :returns: The address
+            :rtype: str
+        """
+        path = quote('/'.join((item, 'api/json')).lstrip('/'))
+        return f"{self.url.rstrip('/')}/{path}{query}"
+
+    @safe_request
+    async def get_info(self, session, url: str):
+        """
+            Get the decoded JSON document behind an address, from the cache
+            if possible.
+
+            :param session: Session to send the request through
+            :type session: :class:`aiohttp.ClientSession`
+            :param url: Address to ask
+            :type url: str
+
+            :returns: The document
+            :rtype: dict
+        """
+        # The cache is on disk, it must not hold the event loop up
+        info = await asyncio.to_thread(self.cache.get, self.url, url)
+        if info is not None:
+            REQUEST_TIMINGS.mark_cache_hit()
+            return info
+
+        async with self.get_semaphore(url):
+            try:
+                async with session.get(url) as response:
+                    body = await response.read()
+            except aiohttp.ClientConnectionError as ex:
+                raise ConnectionError(str(ex)) from ex
+            except asyncio.TimeoutError as ex:
+                raise TimeoutError(f"Timed out waiting for {url}") from ex
+
+        REQUEST_TIMINGS.add_size(len(body))
+        info = json.loads(body)
+        await asyncio.to_thread(self.cache.put, self.url, url, info)
+        return info
+
+    def get_jobs_query(self):
+        """
+            Get the tree query used to list the jobs of an item.
+
+            :returns: The query
+            :rtype: str
+        """
+        if self.recursive:
+            return deepen_jobs_query(self.jobs_query, self.folder_depth or 0)
+
+        return self.jobs_query
+
+    async def walk_jobs(self, session, jobs: list):
+        """
+            Flatten the tree of jobs found on a server. Folders whose jobs
+            are not known are asked for concurrently, level by level, and
+            jobs seen more than once are only kept the first time.
+
+            :param session: Session to send the requests through
+            :type session: :class:`aiohttp.ClientSession`
+            :param jobs: Jobs received from jenkins server
+            :type jobs: list
+
+            :returns: All jobs found that are not folders
+            :rtype: list
+        """
+        found = []
+        seen = set()
+        pending = deque(jobs)
+
+        while pending:
+            folders = sort_out_jobs(pending, seen, found)
+            infos = await asyncio.gather(*(
+                self.get_info(session, self.get_item_url(
+                    get_folder_item(folder, self.url),
+                    self.get_jobs_query()))
+                for folder in folders))
+            for info in infos:
+                pending.extend(info["jobs"])
+
+        return found
+
+    async def get_builds(self, session, job: dict, builds_limit: int = None,
+                         builds_since: int = None):
+        """
+            Get the builds of a job. If only builds started after a given
+            time are wanted, they are asked for page by page, newest first,
+            until one of them is older than that or the limit is hit.
+
+            :param session: Session to send the request through
+            :type session: :class:`aiohttp.ClientSession`
+            :param job: Job received from jenkins server
+            :type job: dict
+            :param builds_limit: Maximum number of builds to get, all of them
+            if None
+            :type builds_limit: int
+            :param builds_since: Only get builds started after this time, in
+            milliseconds since the epoch
+            :type builds_since: int
+
+            :returns: The job, with its builds
+            :rtype: dict
+        """
+        url = f"{job['url'].rstrip('/')}/api/json"
+
+        if not builds_since:
+            query = self.job_last_builds_query.format(builds_limit) \
+                if builds_limit else self.job_builds_query
+            info = await self.get_info(session, url + query)
+            return {**job, 'builds': get_builds_info(info)}
+
+        page_size = self.builds_page_size
+        if builds_limit:
+            page_size = min(page_size, builds_limit)
+
+        builds = []
+        start = 0
+        while True:
+            info = await self.get_info(
+                session,
+                url + self.job_builds_page_query.format(
+                    start, start + page_size))
+            page = get_builds_info(info)
+            recent = [build for build in page
+                      if started_since(build, builds_since)]
+            builds.extend(recent)
+
+            if len(page) < page_size or len(recent) < len(page) or \
+                    (builds_limit and len(builds) >= builds_limit):
+                break
+
+            start += page_size
+
+        return {**job, 'builds': builds[:builds_limit]}
+
+    # pylint: disable=too-many-arguments
+    async def get_jobs(self, session, get_builds: bool, item: str = "",
+                       builds_limit: int = None, pattern: str = "*",
+                       job_names: list = None, builds_since: int = None):
+        """
+            Get the jobs of jenkins server that pass the filters. If builds
+            are requested, those of every job are fetched concurrently once
+            the jobs have been filtered. Jobs inside folders are included if
+            the source is recursive.
+
+            :param session: Session to send the requests through
+            :type session: :class:`aiohttp.ClientSession`
+            :param get_builds: Whether to get info about the jobs' builds
+            :type get_builds: bool
+            :param item: Folder or view to get the jobs from, the whole
+            server if empty
+            :type item: str
+            :param builds_limit: Maximum number of builds to get for each
+            job, all of them if None
+            :type builds_limit: int
+            :param pattern: Glob-like pattern the job name must match
+            :type pattern: str
+            :param job_names: Regular expressions of which at least one must
+            be found on the job name
+            :type job_names: list
+            :param builds_since: Only get builds started after this time, in
+            milliseconds since the epoch
+            :type builds_since: int
+
+            :returns: The jobs, as dictionaries of _class, name, url and
+            builds
+            :rtype: list
+        """
+        info = await self.get_info(
+            session, self.get_item_url(item, self.get_jobs_query()))
+        jobs = info["jobs"]
+        if self.recursive:
+            jobs = await self.walk_jobs(session, jobs)
+
+        jobs = [job for job in filter_jobs(jobs, pattern, job_names)
+                if "job" in job.get("_class", "job")]
+
+        if not get_builds:
+            return jobs
+
+        return list(await asyncio.gather(
+            *(self.get_builds(session, job, builds_limit, builds_since)
+              for job in jobs)))
+
+    def model_builds(self, builds_info: list):
+        """
+            Create the builds of a job using jenkins builds information, see
+            :func:`cibyl.sources.jenkins.model_builds`.
+        """
+        return model_builds(builds_info, self.columnar_builds)
+
+    def populate_jobs(self, system, jobs: list[dict],
+                      builds_limit: int = None, builds_since: int = None):
+        """
+            Create Job models using jenkins jobs information, see
+            :func:`cibyl.sources.jenkins.populate_jobs`.
+        """
+        populate_jobs(system, jobs, builds_limit, builds_since,
+                      columnar=self.columnar_builds)
+
+    async def query_async(self, system, args):
+        """
+            Same as :meth:`query`, to be awaited from an already running
+            event loop.
+        """
+        scoped_query = start_jobs_query(self, system, args)
+        if scoped_query:
+            jobs_query, item, pattern = scoped_query
+
+            # Semaphores belong to the event loop they were created on
+            self._semaphores = {}
+            async with self.open_session() as session:
+                jobs = await self.get_jobs(
+                    session, jobs_query.get_builds, item,
+                    jobs_query.builds_limit, pattern, jobs_query.job_names,
+                    jobs_query.builds_since)
+            self.populate_jobs(system, jobs, jobs_query.builds_limit,
+                               jobs_query.builds_since)
+
+        if all(argument.populated for argument in args.values()):
+            return system
+
+        return None
+
+    def query(self, system, args):
+        """
+            Perform the query on a new event loop. Must not be called from
+            within a running one, use :meth:`query_async` there instead.
+        """
+        return asyncio.run(self.query_async(system, args))
@@ -0,0 +1,58 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+import time
+from threading import Lock
+
+
+class RateLimiter:  # pylint: disable=too-few-public-methods
+    """Token bucket that paces the requests sent to a host, or to a part of
+    it, across all the threads that share it.
+
+    :ivar rate: Number of requests allowed per second.
+    :ivar burst: Number of requests that can be sent at once after a pause.
+    """
+
+    def __init__(self, rate, burst=1):
+        """Constructor.
+
+        :param rate: Number of requests allowed per second.
+        :type rate: float
+        :param burst: Number of requests that can be sent at once after a
+            pause.
+        :type burst: int
+        """
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._last = time.monotonic()
+        self._lock = Lock()
+
+    def acquire(self):
+        """Waits until a request can be sent, and takes its place."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait = (1 - self._tokens) / self.rate
+
+            time.sleep(wait)
@@ -0,0 +1,159 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+import logging
+from threading import Lock
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from cibyl.sources.timings import REQUEST_TIMINGS
+
+LOG = logging.getLogger(__name__)
+
+
+def record_size(response, *_, stream=False, **__):
+    """Response hook that adds the size of the response to the request in
+    progress.
+
+    :param response: The response.
+    :type response: :class:`requests.Response`
+    :param stream: Whether the response's body is going to be streamed, in
+        which case it is not read here, but its announced size taken
+        instead.
+    :type stream: bool
+    """
+    if stream:
+        size = int(response.headers.get('Content-Length', 0))
+    else:
+        size = len(response.content)
+
+    REQUEST_TIMINGS.add_size(size)
+
+
+class SessionPool:
+    """Registry of HTTP sessions shared by all sources of the process.
+
+    Sessions are keyed by the host they talk to, the certificate used to
+    verify it and the credentials presented to it, so that sources pointing
+    at the same host reuse the same connections instead of going through a
+    new handshake each.
+    """
+
+    DEFAULT_POOL_SIZE = 10
+    """Default number of connections kept open for each host."""
+
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE, keep_alive=True):
+        """Constructor.
+
+        :param pool_size: Number of connections kept open for each host.
+        :type pool_size: int
+        :param keep_alive: Whether connections are left open once a request
+            is done.
+        :type keep_alive: bool
+        """
+        self._pool_size = pool_size
+        self._keep_alive = keep_alive
+        self._sessions = {}
+        self._lock = Lock()
+
+    @property
+    def pool_size(self):
+        """
+        :return: Number of connections kept open for each host.
+        :rtype: int
+        """
+        return self._pool_size
+
+    @property
+    def keep_alive(self):
+        """
+        :return: Whether connections are left open once a request is done.
+        :rtype: bool
+        """
+        return self._keep_alive
+
+    def configure(self, pool_size=DEFAULT_POOL_SIZE, keep_alive=True):
+        """Changes the settings of the pool. Only sessions created after
+        this call are affected by it.
+
+        :param pool_size: Number of connections kept open for each host.
+        :type pool_size: int
+        :param keep_alive: Whether connections are left open once a request
+            is done.
+        :type keep_alive: bool
+        """
+        self._pool_size = pool_size
+        self._keep_alive = keep_alive
+
+    def get_session(self, url, cert=None, credentials=None,
+                    session_class=requests.Session):
+        """Gets the session for a host, creating it if it does not exist yet.
+
+        :param url: Any URL pointing to the host.
+        :type url: str
+        :param cert: Value for the 'verify' field of the session.
+        :type cert: None or bool or str
+        :param credentials: Anything identifying the user that talks to the
+            host. Must be hashable.
+        :type credentials: object
+        :param session_class: Type of session to create.
+        :type session_class: type
+        :return: The session for the host.
+        :rtype: :class:`requests.Session`
+        """
+        url_parts = urlsplit(url)
+        key = (url_parts.scheme, url_parts.netloc or url_parts.path,
+               cert, credentials, session_class)
+
+        with self._lock:
+            if key not in self._sessions:
+                LOG.debug("creating new HTTP session for host: %s", url)
+                self._sessions[key] = self._new_session(cert, session_class)
+
+            return self._sessions[key]
+
+    def close(self):
+        """Closes all sessions of the pool, together with their connections.
+        """
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+
+            self._sessions.clear()
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def _new_session(self, cert, session_class):
+        session = session_class()
+        session.verify = cert
+
+        adapter = HTTPAdapter(pool_connections=self._pool_size,
+                              pool_maxsize=self._pool_size)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+
+        if not self._keep_alive:
+            session.headers['Connection'] = 'close'
+
+        session.hooks['response'].append(record_size)
+
+        return session
+
+
+SESSION_POOL = SessionPool()
+"""Pool shared by all sources of the process."""
@@ -13,19 +13,330 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 """
+import asyncio
+import fnmatch
+import inspect
 import logging
+import random
+import re
+import time
+from contextlib import closing
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+from aiohttp import ClientError
+from jenkins import JenkinsException
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.exceptions import RequestException, Timeout
+
+from cibyl.sources.circuit_breaker import CIRCUIT_BREAKER, CircuitOpenError
+from cibyl.sources.timings import REQUEST_TIMINGS, RequestRecord
 
 LOG = logging.getLogger(__name__)
 
+REQUEST_ERRORS = (OSError, asyncio.TimeoutError, RequestException,
+                  ClientError, JenkinsException)
+"""Errors requests to a host fail with, which may be worth retrying, see
+:meth:`RetryPolicy.is_retryable`."""
+
+
+def get_status(error):
+    """Looks for the HTTP answer that caused an error, going through the
+    chain of errors that led to it. Errors coming from both requests and
+    aiohttp are understood.
+
+    :param error: The error to look into.
+    :type error: :class:`Exception`
+    :return: The status code and headers of the answer. 'None' if the error
+        did not come from one.
+    :rtype: tuple[int, dict] or None
+    """
+    while error is not None:
+        response = getattr(error, 'response', None)
+        if response is not None:
+            return response.status_code, response.headers
+
+        status = getattr(error, 'status', None)
+        if isinstance(status, int):
+            return status, getattr(error, 'headers', None) or {}
+
+        error = error.__cause__ or error.__context__
+
+    return None
+
+
+def is_connection_error(error):
+    """Looks for a connection error or timeout among the chain of errors
+    that led to an error.
+
+    :param error: The error to look into.
+    :type error: :class:`Exception`
+    :return: Whether the host could not be reached or did not answer.
+    :rtype: bool
+    """
+    while error is not None:
+        if isinstance(error, (RequestsConnectionError, Timeout,
+                              ConnectionError, TimeoutError)):
+            return True
+        error = error.__cause__ or error.__context__
+
+    return False
+
+
+def is_host_failure(error):
+    """
+    :param error: The error a request failed with.
+    :type error: :class:`Exception`
+    :return: Whether the error says something about the host being unwell,
+        that is, it could not be reached or it answered with a server
+        error.
+    :rtype: bool
+    """
+    status = get_status(error)
+    if status is not None:
+        return status[0] >= 500
+
+    return is_connection_error(error)
+
+
+@dataclass
+class RetryPolicy:
+    """Describes how requests to a host are retried when they fail.
 
+    The time waited before each retry doubles with each attempt, starting
+    at 'backoff' seconds and never going past 'max_backoff', plus a random
+    amount of up to 'jitter' times that, so that clients do not all come
+    back at once.
+    """
+
+    attempts: int = 3
+    """Maximum number of times a request is made."""
+    backoff: float = 0.5
+    """Seconds waited before the first retry."""
+    max_backoff: float = 30
+    """Maximum number of seconds waited before a retry."""
+    jitter: float = 0.5
+    """Fraction of the wait added to it at random."""
+    statuses: list[int] = field(
+        default_factory=lambda: [429, 502, 503, 504])
+    """HTTP status codes for which requests are retried."""
+    retry_after: bool = True
+    """Whether to wait for as long as the host asks to on its 'Retry-After'
+    header, when present."""
+
+    def is_retryable(self, error):
+        """
+        :param error: The error a request failed with.
+        :type error: :class:`Exception`
+        :return: Whether the request is worth retrying. That is the case for
+            connection errors, timeouts and the chosen status codes.
+        :rtype: bool
+        """
+        status = get_status(error)
+        if status is not None:
+            return status[0] in self.statuses
+
+        return is_connection_error(error)
+
+    def get_delay(self, attempt, error=None):
+        """
+        :param attempt: Number of attempts made so far.
+        :type attempt: int
+        :param error: The error the last attempt failed with.
+        :type error: :class:`Exception`
+        :return: Seconds to wait before the next attempt.
+        :rtype: float
+        """
+        if self.retry_after:
+            status = get_status(error)
+            if status is not None:
+                retry_after = get_retry_after(status[1])
+                if retry_after is not None:
+                    return min(retry_after, self.max_backoff)
+
+        delay = min(self.backoff * 2 ** (attempt - 1), self.max_backoff)
+        return delay + random.uniform(0, self.jitter * delay)
+
+
+def get_retry_after(headers):
+    """
+    :param headers: Headers of an answer from a host.
+    :type headers: dict
+    :return: Seconds the host asks to wait for on its 'Retry-After' header.
+        'None' if there is no such header or it is not understood.
+    :rtype: float or None
+    """
+    value = headers.get('Retry-After')
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0)
+    except (TypeError, ValueError):
+        return None
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+"""Policy used by requests not made by a source with a policy of its own."""
+
+
+# pylint: disable=too-many-statements
 def safe_request_generic(request, custom_error):
     """Decorator that wraps any errors coming out of a call around a
-    custom_error class.
+    custom_error class. Generators are watched while they are iterated, as
+    that is when their requests are made, and coroutines while they are
+    awaited.
+
+    Failed calls are retried following the 'retry_policy' of the object the
+    call is made on, if it has one, or :data:`DEFAULT_RETRY_POLICY`. Only
+    errors among :data:`REQUEST_ERRORS` are considered for a retry. Errors
+    already wrapped come from a decorated call nested in this one, which
+    retried and recorded them already, and are let through as they are. If
+    that object has a 'url', calls are also refused while the circuit
+    breaker considers its host to be down. Every call is recorded on
+    :data:`cibyl.sources.timings.REQUEST_TIMINGS`.
 
     :param request: The unsafe call to watch errors on.
     :return: The input call decorated to raise the desired error type.
     """
 
+    endpoint = getattr(request, '__name__', repr(request))
+
+    def get_policy(args):
+        policy = getattr(args[0], 'retry_policy', None) if args else None
+        return policy or DEFAULT_RETRY_POLICY
+
+    def get_host(args):
+        url = getattr(args[0], 'url', None) if args else None
+        if not isinstance(url, str):
+            return None
+        return urlsplit(url).netloc or url
+
+    def get_breaker(args):
+        breaker = getattr(args[0], 'circuit_breaker', None) if args else None
+        return breaker or CIRCUIT_BREAKER
+
+    def check_circuit(breaker, host):
+        if host and breaker.is_open(host):
+            raise custom_error(
+                f"Host '{host}' is down, not sending requests to it."
+            ) from CircuitOpenError(host)
+
+    def record(breaker, host, error=None):
+        if host:
+            breaker.record(host, error is None or not is_host_failure(error))
+
+    def get_retry_delay(policy, attempt, error):
+        if attempt >= policy.attempts or not policy.is_retryable(error):
+            return None
+
+        delay = policy.get_delay(attempt, error)
+        LOG.warning("request failed on attempt %d out of %d, "
+                    "retrying in %.1fs: %s",
+                    attempt, policy.attempts, delay, error)
+        return delay
+
+    def should_retry(policy, attempt, error):
+        delay = get_retry_delay(policy, attempt, error)
+        if delay is None:
+            return False
+
+        time.sleep(delay)
+        return True
+
+    async def async_handler(*args):
+        """Awaits the unsafe coroutine and wraps any errors coming out of it
+        around a custom_error class. Waits between retries do not block the
+        event loop.
+
+        :param args: Arguments with which the coroutine is called.
+        :return: Output of the called coroutine.
+        """
+        policy, breaker, host = get_policy(args), get_breaker(args), \
+            get_host(args)
+        with REQUEST_TIMINGS.measure(host, endpoint) as timing:
+            while True:
+                check_circuit(breaker, host)
+                try:
+                    result = await request(*args)
+                    record(breaker, host)
+                    return result
+                except custom_error:
+                    # Already retried and recorded by the nested call
+                    raise
+                except REQUEST_ERRORS as ex:
+                    record(breaker, host, ex)
+                    delay = get_retry_delay(policy, timing.retries + 1, ex)
+                    if delay is None:
+                        raise custom_error(
+                            'Failure on request to target host.') from ex
+                except Exception as ex:
+                    # Not worth retrying
+                    record(breaker, host, ex)
+                    raise custom_error(
+                        'Failure on request to target host.') from ex
+                await asyncio.sleep(delay)
+                timing.retries += 1
+
+    def stream_handler(*args):
+        """Iterates over the unsafe generator and wraps any errors coming out
+        of it around a custom_error class. The generator is only retried if
+        it failed before returning anything. Only the time spent getting its
+        items is recorded, not the time the caller spends on them.
+
+        :param args: Arguments with which the generator is called.
+        :return: Items of the called generator.
+        """
+        policy, breaker, host = get_policy(args), get_breaker(args), \
+            get_host(args)
+        timing = RequestRecord(host, endpoint)
+        end = object()
+        try:
+            while True:
+                check_circuit(breaker, host)
+                started = False
+                try:
+                    with closing(request(*args)) as items:
+                        while True:
+                            with REQUEST_TIMINGS.track(timing):
+                                item = next(items, end)
+                            if item is end:
+                                break
+                            started = True
+                            yield item
+                    record(breaker, host)
+                    return
+                except custom_error:
+                    # Already retried and recorded by the nested call
+                    raise
+                except REQUEST_ERRORS as ex:
+                    record(breaker, host, ex)
+                    if started:
+                        raise custom_error(
+                            'Failure on request to target host.') from ex
+                    with REQUEST_TIMINGS.track(timing):
+                        retry = should_retry(policy, timing.retries + 1, ex)
+                    if not retry:
+                        raise custom_error(
+                            'Failure on request to target host.') from ex
+                except Exception as ex:
+                    # Not worth retrying
+                    record(breaker, host, ex)
+                    raise custom_error(
+                        'Failure on request to target host.') from ex
+                timing.retries += 1
+        except Exception as ex:
+            REQUEST_TIMINGS.fail(timing, ex)
+            raise
+        finally:
+            REQUEST_TIMINGS.add(timing)
+
     def request_handler(*args):
         """Calls the unsafe function and wraps any errors coming out of it
         around a custom_error class.
@@ -33,20 +344,136 @@ def safe_request_generic(request, custom_error):
         :param args: Arguments with which the function is called.
         :return: Output of the called function.
         """
-        try:
-            return request(*args)
-        except Exception as ex:
-            raise custom_error('Failure on request to target host.') from ex
+        policy, breaker, host = get_policy(args), get_breaker(args), \
+            get_host(args)
+        with REQUEST_TIMINGS.measure(host, endpoint) as timing:
+            while True:
+                check_circuit(breaker, host)
+                try:
+                    result = request(*args)
+                    record(breaker, host)
+                    return result
+                except custom_error:
+                    # Already retried and recorded by the nested call
+                    raise
+                except REQUEST_ERRORS as ex:
+                    record(breaker, host, ex)
+                    if not should_retry(policy, timing.retries + 1, ex):
+                        raise custom_error(
+                            'Failure on request to target host.') from ex
+                except Exception as ex:
+                    # Not worth retrying
+                    record(breaker, host, ex)
+                    raise custom_error(
+                        'Failure on request to target host.') from ex
+                timing.retries += 1
+
+    if inspect.isgeneratorfunction(request):
+        return stream_handler
+
+    if inspect.iscoroutinefunction(request):
+        return async_handler
 
     return request_handler
 
 
+def get_argument_value(args: dict, name: str):
+    """Gets the value given to a single-valued argument.
+
+    :param args: Arguments of the query.
+    :type args: dict
+    :param name: Name of the argument.
+    :type name: str
+    :return: The value, None if the argument was not given.
+    :rtype: object
+    """
+    argument = args.get(name)
+    if not argument:
+        return None
+
+    if isinstance(argument.value, list):
+        return argument.value[0]
+
+    return argument.value
+
+
+@dataclass
+class JobsQuery:
+    """What a query asks for about the jobs of a system, see
+    :func:`read_jobs_query`."""
+
+    job_names: list = None
+    """Regular expressions of which at least one must be found on the job
+    name, None for any."""
+    builds_limit: int = None
+    """Maximum number of builds for each job, None for all of them."""
+    builds_since: int = None
+    """Time after which builds must have started, in milliseconds since the
+    epoch, None for any."""
+    get_builds: bool = False
+    """Whether builds are asked for at all."""
+
+
+def read_jobs_query(args: dict):
+    """Reads what a query asks for about jobs out of its arguments.
+
+    :param args: Arguments of the query.
+    :type args: dict
+    :return: What is asked for, None if the query is not about jobs.
+    :rtype: :class:`JobsQuery` or None
+    """
+    if not (args.get('jobs') or args.get('job_name')):
+        return None
+
+    return JobsQuery(
+        job_names=args['job_name'].value if args.get('job_name') else None,
+        builds_limit=get_argument_value(args, 'builds_limit'),
+        builds_since=get_argument_value(args, 'builds_since'),
+        get_builds=any(args.get(arg) for arg in
+                       ('builds', 'builds_limit', 'builds_since'))
+    )
+
+
+def filter_jobs(jobs, pattern: str = "*", job_names: list = None,
+                key: str = 'name'):
+    """Lazily filters jobs by name, dropping them before any model is built
+    for them.
+
+    :param jobs: Jobs received from the host.
+    :type jobs: iterable
+    :param pattern: Glob-like pattern the job name must match.
+    :type pattern: str
+    :param job_names: Regular expressions of which at least one must be
+        found on the job name. All jobs pass if none is given.
+    :type job_names: list
+    :param key: Field of the jobs that holds their name.
+    :type key: str
+    :return: The jobs that passed the filters.
+    :rtype: generator
+    """
+    scope = re.compile(fnmatch.translate(pattern))
+    names = [re.compile(job_name) for job_name in job_names or []]
+
+    for job in jobs:
+        job_name = job.get(key, '')
+        if not scope.match(job_name):
+            continue
+        if names and not any(name.search(job_name) for name in names):
+            continue
+        yield job
+
+
 class Source:
     """Represents a source of a system on which queries are performed."""
 
+    streams_jobs = False
+    """Whether jobs are added to the system once they are complete, so that
+    they can be published while the query is still running."""
+
     def __init__(self, name: str, url: str = None):
         self.name = name
         self.url = url
+        self.retry_policy = DEFAULT_RETRY_POLICY
 
     # pylint: disable=unused-argument
     def query(self, system,  args):
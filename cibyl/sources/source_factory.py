@@ -0,0 +1,64 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+from cibyl.exceptions.config import InvalidConfiguration
+from cibyl.sources.jenkins import Jenkins, JenkinsOSP
+from cibyl.sources.jenkins_async import AsyncJenkins
+from cibyl.sources.source import RetryPolicy
+from cibyl.sources.zuul.source import Zuul
+
+
+class SourceFactory:  # pylint: disable=too-few-public-methods
+    """Builds the sources of a system out of their configuration entries.
+    """
+
+    DRIVERS = {
+        'jenkins': Jenkins,
+        'jenkins_osp': JenkinsOSP,
+        'jenkins_async': AsyncJenkins,
+        'zuul': Zuul
+    }
+    """Maps the 'driver' field of a source entry to the class that
+    implements it.
+    """
+
+    @classmethod
+    def create_source(cls, name, driver, retry=None, **kwargs):
+        """Builds a source instance.
+
+        :param name: Name of the source, as given on the configuration file.
+        :type name: str
+        :param driver: Type of source to build.
+        :type driver: str
+        :param retry: Fields of the source's
+            :class:`cibyl.sources.source.RetryPolicy`. 'None' to keep the
+            default one.
+        :type retry: dict or None
+        :param kwargs: Arguments passed on to the source's constructor.
+        :return: The built source.
+        :rtype: :class:`cibyl.sources.source.Source`
+        :raises InvalidConfiguration: If the driver is unknown.
+        """
+        if driver not in cls.DRIVERS:
+            raise InvalidConfiguration(
+                f"Unknown driver '{driver}' for source: '{name}'")
+
+        source = cls.DRIVERS[driver](**kwargs)
+        source.name = name
+
+        if retry is not None:
+            source.retry_policy = RetryPolicy(**retry)
+
+        return source
@@ -0,0 +1,229 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+import json
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from threading import Lock
+
+
+@dataclass
+class RequestRecord:
+    """Represents a call made by a source and what it took."""
+
+    host: str
+    """Host the call was made to."""
+    endpoint: str
+    """Name of the call."""
+    latency: float = 0
+    """Seconds spent on it, retries included. For calls giving out results
+    as they go, the time their consumer took is left out."""
+    size: int = 0
+    """Bytes received from the host."""
+    retries: int = 0
+    """Number of times it was retried."""
+    cache_hit: bool = False
+    """Whether it was answered from the cache."""
+    failed: bool = False
+    """Whether it ended in an error."""
+
+
+class RequestTimings:
+    """Collects records of the calls made by sources, so that it can be told
+    where the time of a run went.
+    """
+
+    COLUMNS = ('host', 'endpoint', 'calls', 'total (s)', 'mean (s)',
+               'max (s)', 'bytes', 'retries', 'cache hits', 'failures')
+    """Columns of the summary table."""
+
+    def __init__(self):
+        self._records = []
+        self._lock = Lock()
+        # Calls in progress, kept apart for each thread and asyncio task
+        self._stack = ContextVar(f'request_timings_{id(self)}', default=())
+
+    @property
+    def records(self):
+        """
+        :return: All calls recorded so far.
+        :rtype: list[:class:`RequestRecord`]
+        """
+        return list(self._records)
+
+    @property
+    def current(self):
+        """
+        :return: The call in progress on this thread or task. 'None' if
+            there is none.
+        :rtype: :class:`RequestRecord` or None
+        """
+        stack = self._stack.get()
+        return stack[-1] if stack else None
+
+    @contextmanager
+    def measure(self, host, endpoint):
+        """Records a call made within the context. While in it, the record
+        can be annotated through :attr:`current`.
+
+        The context must not be left open across a 'yield', see
+        :meth:`track` for calls that give out results as they go.
+
+        :param host: Host the call is made to.
+        :type host: str
+        :param endpoint: Name of the call.
+        :type endpoint: str
+        :return: The record for the call.
+        :rtype: :class:`RequestRecord`
+        """
+        record = RequestRecord(host, endpoint)
+
+        try:
+            with self.track(record):
+                yield record
+        except Exception as ex:
+            self.fail(record, ex)
+            raise
+        finally:
+            self.add(record)
+
+    @contextmanager
+    def track(self, record):
+        """Times a step of a call within the context, adding it to the
+        latency of its record. While in it, the record is :attr:`current`.
+
+        Generators are meant to track each request they make, so that the
+        time their consumer takes between items is left out.
+
+        :param record: The call the step belongs to.
+        :type record: :class:`RequestRecord`
+        :return: The same record.
+        :rtype: :class:`RequestRecord`
+        """
+        token = self._stack.set(self._stack.get() + (record,))
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.latency += time.perf_counter() - start
+            self._stack.reset(token)
+
+    @staticmethod
+    def fail(record, error):
+        """Marks a call as failed, unless the error it failed with came out
+        of a call nested in it, on which the failure is already counted.
+
+        :param record: The call.
+        :type record: :class:`RequestRecord`
+        :param error: The error the call failed with.
+        :type error: :class:`Exception`
+        """
+        if getattr(error, 'request_record', None) is not None:
+            return
+
+        error.request_record = record
+        record.failed = True
+
+    def add(self, record):
+        """Keeps a finished call among the records.
+
+        :param record: The call.
+        :type record: :class:`RequestRecord`
+        """
+        with self._lock:
+            self._records.append(record)
+
+    def add_size(self, size):
+        """Adds received bytes to the call in progress, if any.
+
+        :param size: Number of bytes.
+        :type size: int
+        """
+        if self.current:
+            self.current.size += size
+
+    def mark_cache_hit(self):
+        """Notes that the call in progress was answered from the cache."""
+        if self.current:
+            self.current.cache_hit = True
+
+    def clear(self):
+        """Forgets about all recorded calls."""
+        with self._lock:
+            self._records.clear()
+
+    def summary(self):
+        """Aggregates the recorded calls by host and endpoint.
+
+        :return: One entry per host and endpoint, with the columns in
+            :attr:`COLUMNS`, slowest first.
+        :rtype: list[dict]
+        """
+        groups = {}
+        for record in self.records:
+            group = groups.setdefault((record.host, record.endpoint), [])
+            group.append(record)
+
+        rows = []
+        for (host, endpoint), records in groups.items():
+            latencies = [record.latency for record in records]
+            rows.append(dict(zip(self.COLUMNS, (
+                host, endpoint, len(records),
+                sum(latencies), sum(latencies) / len(records),
+                max(latencies),
+                sum(record.size for record in records),
+                sum(record.retries for record in records),
+                sum(record.cache_hit for record in records),
+                sum(record.failed for record in records)
+            ))))
+
+        return sorted(rows, key=lambda row: row['total (s)'], reverse=True)
+
+    def format_table(self):
+        """
+        :return: The summary, as a table ready to be printed.
+        :rtype: str
+        """
+        rows = [
+            [f'{value:.3f}' if isinstance(value, float) else str(value)
+             for value in row.values()]
+            for row in self.summary()
+        ]
+
+        widths = [max(len(cell) for cell in column)
+                  for column in zip(self.COLUMNS, *rows)]
+
+        return '\n'.join(
+            '  '.join(cell.ljust(width) for cell, width in zip(row, widths))
+            for row in [self.COLUMNS, *rows]
+        )
+
+    def dump(self, file):
+        """Writes all recorded calls, and their summary, to a JSON file.
+
+        :param file: Path to the file.
+        :type file: str
+        """
+        with open(file, 'w', encoding='utf8') as buffer:
+            json.dump({
+                'summary': self.summary(),
+                'requests': [asdict(record) for record in self.records]
+            }, buffer, indent=2)
+
+
+REQUEST_TIMINGS = RequestTimings()
+"""Collector shared by all sources of the process."""
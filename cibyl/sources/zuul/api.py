@@ -15,10 +15,15 @@
 """
 import logging
 from functools import partial
+from urllib.parse import quote, urljoin
 
 from zuulclient.api import ZuulRESTClient
 
-from cibyl.sources.source import safe_request_generic
+from cibyl.sources.cache import RESPONSE_CACHE
+from cibyl.sources.session_pool import SESSION_POOL
+from cibyl.sources.source import DEFAULT_RETRY_POLICY, safe_request_generic
+from cibyl.sources.timings import REQUEST_TIMINGS
+from cibyl.utils.json import iter_array
 
 LOG = logging.getLogger(__name__)
 
@@ -36,18 +41,31 @@ class ZuulAPI:
     """Provides a low-level client to interact with Zuul's REST-API.
     """
 
-    def __init__(self, client):
+    stream_chunk_size = 64 * 1024
+    """Number of bytes read at a time from streamed responses."""
+
+    DEFAULT_INFO_TTL = 3600
+    """Number of seconds the info and tenants of a host are cached for by
+    default."""
+
+    def __init__(self, client, retry_policy=DEFAULT_RETRY_POLICY):
         """Constructor.
         This constructor is not meant to be called directly, please refer to
         the static constructors before.
 
         :param client: A REST-API client to communicate with the host through.
         :type client: :class:`zuulclient.api.ZuulRESTClient`
+        :param retry_policy: How to retry requests that fail.
+        :type retry_policy: :class:`cibyl.sources.source.RetryPolicy`
         """
         self._client = client
+        self.retry_policy = retry_policy
+        self.cache = RESPONSE_CACHE
+        self.info_ttl = self.DEFAULT_INFO_TTL
 
     @staticmethod
-    def from_url(url, cert=None, auth_token=None):
+    def from_url(url, cert=None, auth_token=None,
+                 retry_policy=DEFAULT_RETRY_POLICY):
         """Builds an API from the parameters that define the connection to
         the target host.
 
@@ -61,6 +79,8 @@ class ZuulAPI:
         :param auth_token: Token used to perform admin operations. 'None'
             will simply not allow such operations to be performed.
         :type auth_token: None or str
+        :param retry_policy: How to retry requests that fail.
+        :type retry_policy: :class:`cibyl.sources.source.RetryPolicy`
         :return: The built instance.
         :rtype: :class:`ZuulAPI`
         """
@@ -71,7 +91,14 @@ class ZuulAPI:
         if cert:
             verify = cert
 
-        return ZuulAPI(ZuulRESTClient(url, verify, auth_token))
+        client = ZuulRESTClient(url, verify, auth_token)
+
+        # Replace the client's own session with one from the shared pool
+        session = SESSION_POOL.get_session(url, verify, auth_token)
+        session.auth = client.session.auth
+        client.session = session
+
+        return ZuulAPI(client, retry_policy)
 
     @property
     def url(self):
@@ -105,9 +132,117 @@ class ZuulAPI:
     @safe_request
     def info(self):
         """Gets Zuul's info data, containing information about capabilities
-        and tenants
+        and tenants. It is kept on the cache for :attr:`info_ttl` seconds,
+        and not downloaded again once expired if it did not change.
 
         :return: The JSON structure returned by the host.
         :rtype: dict
         """
-        return self._client.info
+        return self._get_cached('info')
+
+    def _get_cached(self, path):
+        """Gets the response of an endpoint of the REST-API that rarely
+        changes, from the cache if it is there and younger than
+        :attr:`info_ttl`.
+
+        :param path: Path of the endpoint, relative to the API's root.
+        :type path: str
+        :return: The JSON structure returned by the host.
+        :rtype: dict or list
+        """
+        url = urljoin(self._client.base_url, path)
+
+        data = self.cache.get(url, '', self.info_ttl)
+        if data is not None:
+            REQUEST_TIMINGS.mark_cache_hit()
+            return data
+
+        return self.cache.fetch(
+            url, '',
+            lambda headers: self._client.session.get(url, headers=headers))
+
+    def _get(self, path, params=None):
+        """Sends a GET request to an endpoint of the REST-API.
+
+        :param path: Path of the endpoint, relative to the API's root.
+        :type path: str
+        :param params: Query parameters of the request.
+        :type params: dict or None
+        :return: The JSON structure returned by the host.
+        :rtype: dict or list
+        """
+        response = self._client.session.get(
+            urljoin(self._client.base_url, path), params=params)
+        response.raise_for_status()
+        return response.json()
+
+    @safe_request
+    def tenants(self):
+        """Gets the tenants the host serves. Like :meth:`info`, they are
+        kept on the cache for :attr:`info_ttl` seconds.
+
+        :return: The JSON structure returned by the host, one entry per
+            tenant.
+        :rtype: list[dict]
+        """
+        return self._get_cached('tenants')
+
+    @safe_request
+    def projects(self, tenant):
+        """Gets the projects of a tenant.
+
+        :param tenant: Name of the tenant.
+        :type tenant: str
+        :return: The JSON structure returned by the host, one entry per
+            project.
+        :rtype: list[dict]
+        """
+        return self._get(f'tenant/{quote(tenant)}/projects')
+
+    @safe_request
+    def jobs(self, tenant):
+        """Gets the jobs of a tenant.
+
+        :param tenant: Name of the tenant.
+        :type tenant: str
+        :return: The JSON structure returned by the host, one entry per job.
+        :rtype: list[dict]
+        """
+        return self._get(f'tenant/{quote(tenant)}/jobs')
+
+    @safe_request
+    def builds(self, tenant, skip=0, limit=50, filters=None):
+        """Gets a page of the builds of a tenant, newest first.
+
+        :param tenant: Name of the tenant.
+        :type tenant: str
+        :param skip: Number of builds to skip from the newest one.
+        :type skip: int
+        :param limit: Maximum number of builds on the page.
+        :type limit: int
+        :param filters: Further query parameters to narrow the builds
+            down, like 'project', 'pipeline' or 'job_name'.
+        :type filters: dict or None
+        :return: The JSON structure returned by the host, one entry per
+            build.
+        :rtype: list[dict]
+        """
+        return self._get(f'tenant/{quote(tenant)}/builds',
+                         {**(filters or {}), 'skip': skip, 'limit': limit})
+
+    @safe_request
+    def status(self, tenant):
+        """Gets the pipelines on the status of a tenant, decoding them one
+        by one as the response arrives.
+
+        :param tenant: Name of the tenant.
+        :type tenant: str
+        :return: The JSON structure returned by the host for each pipeline.
+        :rtype: :class:`typing.Generator[dict]`
+        """
+        url = urljoin(self._client.base_url, f'tenant/{quote(tenant)}/status')
+
+        with self._client.session.get(url, stream=True) as response:
+            response.raise_for_status()
+            yield from iter_array(
+                response.iter_content(self.stream_chunk_size), 'pipelines')
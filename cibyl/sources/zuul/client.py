@@ -14,8 +14,13 @@
 #    under the License.
 """
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
 
+from cibyl.sources.rate_limiter import RateLimiter
 from cibyl.sources.zuul.api import ZuulAPIError
+from cibyl.sources.zuul.status import take_snapshot
+from cibyl.utils.dates import utc_to_timestamp
 
 LOG = logging.getLogger(__name__)
 
@@ -25,30 +30,177 @@ class ZuulClientError(Exception):
     """
 
 
-class ZuulClient:  # pylint: disable=too-few-public-methods
+class ZuulClient:
     """High-Level Zuul client meant to simplify retrieval of data and
     execution of commands over the host.
     """
 
-    def __init__(self, api):
+    def __init__(self, api, tenant_rate_limit=None):
         """Constructor.
 
         :param api: The low-level client this will use to communicate
             with Zuul.
         :type api: :class:`cibyl.sources.zuul.api.ZuulAPI`
+        :param tenant_rate_limit: Maximum number of requests per second
+            sent about each tenant. 'None' for no limit.
+        :type tenant_rate_limit: float or None
         """
         self._api = api
+        self.tenant_rate_limit = tenant_rate_limit
+        self._limiters = {}
+        self._verified = True
+        self._lock = Lock()
 
     def connect(self):
-        """Verifies that connection with the Zuul host can be made.
+        """Prepares the connection with the Zuul host. No request is sent
+        yet, instead, the first request made tells whether the host can be
+        reached.
+        """
+        self._verified = False
+        LOG.debug("Connection with Zuul host at: '%s' to be verified on "
+                  "first request.", self._api.url)
+
+    def _verify(self, request, *args):
+        """Makes a request, checking through it that the host can be reached
+        if that is yet to be done.
 
-        :raises ZuulClientError: If connection to Zuul failed.
+        :param request: Method of the API to call.
+        :type request: callable
+        :param args: Arguments for the method.
+        :return: Output of the method.
+        :raises ZuulClientError: If this is the first request made after
+            :meth:`connect` and it failed.
         """
         try:
-            self._api.info()
+            result = request(*args)
         except ZuulAPIError as ex:
-            raise ZuulClientError(
-                f"Unable to connect to Zuul host at: '{self._api.url}'."
-            ) from ex
+            if not self._verified:
+                raise ZuulClientError(
+                    f"Unable to connect to Zuul host at: '{self._api.url}'."
+                ) from ex
+            raise
+
+        if not self._verified:
+            self._verified = True
+            LOG.info("Connected to Zuul host at: '%s'.", self._api.url)
+
+        return result
+
+    def _call(self, tenant, request, *args):
+        """Makes a request about a tenant, once the tenant's rate limit
+        allows for it.
+
+        :param tenant: Name of the tenant.
+        :type tenant: str
+        :param request: Method of the API to call.
+        :type request: callable
+        :param args: Arguments for the method, after the tenant.
+        :return: Output of the method.
+        """
+        if self.tenant_rate_limit:
+            with self._lock:
+                if tenant not in self._limiters:
+                    self._limiters[tenant] = RateLimiter(
+                        self.tenant_rate_limit)
+                limiter = self._limiters[tenant]
+            limiter.acquire()
+
+        return self._verify(request, tenant, *args)
+
+    def get_tenants(self):
+        """Finds out which tenants the host serves. Hosts dedicated to a
+        single tenant tell about it on their info, so that no more requests
+        are needed.
+
+        :return: Names of the tenants.
+        :rtype: list[str]
+        :raises ZuulAPIError: If the host could not be asked.
+        :raises ZuulClientError: If the host could not be reached on the
+            first request after :meth:`connect`.
+        """
+        info = self._verify(self._api.info)
+        tenant = info.get('info', {}).get('tenant')
+        if tenant:
+            return [tenant]
+
+        return [entry['name'] for entry in self._verify(self._api.tenants)]
+
+    def get_jobs(self, tenant):
+        """
+        :param tenant: Name of the tenant.
+        :type tenant: str
+        :return: The jobs of the tenant, as returned by the host.
+        :rtype: list[dict]
+        :raises ZuulAPIError: If the jobs could not be retrieved.
+        """
+        return self._call(tenant, self._api.jobs)
+
+    def get_status(self, tenant):
+        """
+        :param tenant: Name of the tenant.
+        :type tenant: str
+        :return: The state of each job on the status of the tenant, as
+            taken by :func:`cibyl.sources.zuul.status.take_snapshot`.
+        :rtype: dict[tuple[str, str, str], str]
+        :raises ZuulAPIError: If the status could not be retrieved.
+        """
+        def snapshot(name):
+            # Pipelines are reduced as they are decoded
+            return take_snapshot(self._api.status(name))
+
+        return self._call(tenant, snapshot)
+
+    # pylint: disable=too-many-arguments
+    def get_builds(self, tenant, since=None, filters=None, page_size=100,
+                   max_requests=4):
+        """Goes through the builds of a tenant, newest first.
+
+        Builds are requested page by page, several pages at a time, and
+        handed out as soon as their page arrives. No more pages are
+        requested once one comes back short or a build older than the
+        cutoff is found.
+
+        :param tenant: Name of the tenant.
+        :type tenant: str
+        :param since: Cutoff, in milliseconds since the epoch. Builds that
+            started before it are left out. 'None' for no cutoff.
+        :type since: int or None
+        :param filters: Query parameters to narrow the builds down, as
+            taken by :meth:`cibyl.sources.zuul.api.ZuulAPI.builds`.
+        :type filters: dict or None
+        :param page_size: Number of builds on each page.
+        :type page_size: int
+        :param max_requests: Maximum number of pages requested at the same
+            time.
+        :type max_requests: int
+        :return: The builds, as returned by the host.
+        :rtype: generator[dict]
+        :raises ZuulAPIError: If a page could not be retrieved.
+        """
+        with ThreadPoolExecutor(max_workers=max_requests) as executor:
+            skip = 0
+            while True:
+                pages = [
+                    executor.submit(self._call, tenant, self._api.builds,
+                                    skip + index * page_size, page_size,
+                                    filters)
+                    for index in range(max_requests)
+                ]
+                skip += max_requests * page_size
+
+                try:
+                    for page in pages:
+                        builds = page.result()
+                        for build in builds:
+                            if since and build.get('start_time') and \
+                                    utc_to_timestamp(
+                                        build['start_time']) < since:
+                                return
+                            yield build
 
-        LOG.info("Connected to Zuul host at: '%s'.", self._api.url)
+                        if len(builds) < page_size:
+                            return
+                finally:
+                    # Pages past the end are of no use
+                    for page in pages:
+                        page.cancel()
@@ -0,0 +1,440 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from heapq import heappush, heappushpop
+from itertools import count, islice
+from queue import Full, Queue
+from threading import Event
+
+from cibyl.models.ci.build import Build
+from cibyl.models.ci.job import Job
+from cibyl.models.ci.pipeline import Pipeline
+from cibyl.sources.source import Source, filter_jobs, read_jobs_query
+from cibyl.sources.zuul.api import ZuulAPI
+from cibyl.sources.zuul.client import ZuulClient
+from cibyl.sources.zuul.status import build_pipelines, diff_snapshots
+from cibyl.utils.dates import utc_to_timestamp
+
+LOG = logging.getLogger(__name__)
+
+
+def keep_newest(builds, builds_limit: int):
+    """
+        Pick the newest builds of each job, by the time they started, out of
+        builds coming from several tenants in no particular order. Only
+        those that may still be picked are held.
+
+        :param builds: Builds received from the host
+        :type builds: iterable
+        :param builds_limit: Maximum number of builds to keep for each job
+        :type builds_limit: int
+
+        :returns: The builds kept, newest first, job by job
+        :rtype: list
+    """
+    kept = {}
+    order = count()
+    for build in builds:
+        start = build.get('start_time')
+        # Builds that arrived first win ties
+        entry = (utc_to_timestamp(start) if start else 0, -next(order),
+                 build)
+        newest = kept.setdefault(build['job_name'], [])
+        if len(newest) < builds_limit:
+            heappush(newest, entry)
+        else:
+            heappushpop(newest, entry)
+
+    return [entry[2] for newest in kept.values()
+            for entry in sorted(newest, reverse=True)]
+
+
+class Zuul(Source):
+    """A class representation of a Zuul host as a source."""
+
+    tenant_chunk_size = 100
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, url: str, cert: str = None, auth_token: str = None,
+                 tenants: list = None, builds_page_size: int = 100,
+                 max_page_requests: int = 4, max_tenant_requests: int = 8,
+                 tenant_rate_limit: float = None,
+                 info_ttl: int = ZuulAPI.DEFAULT_INFO_TTL):
+        """
+            Create a client to talk to a Zuul host.
+
+            :param url: Zuul host address
+            :type url: str
+            :param cert: Path to the certificate that identifies the host
+            :type cert: str
+            :param auth_token: Token used to perform admin operations
+            :type auth_token: str
+            :param tenants: Tenants to query, all of them if None
+            :type tenants: list
+            :param builds_page_size: Number of builds asked for on each
+            request
+            :type builds_page_size: int
+            :param max_page_requests: Maximum number of pages of builds
+            asked for at the same time, for each tenant
+            :type max_page_requests: int
+            :param max_tenant_requests: Maximum number of tenants queried at
+            the same time
+            :type max_tenant_requests: int
+            :param tenant_rate_limit: Maximum number of requests per second
+            sent about each tenant, no limit if None
+            :type tenant_rate_limit: float
+            :param info_ttl: Number of seconds the info and tenants of the
+            host are cached for
+            :type info_ttl: int
+        """
+        self.api = ZuulAPI.from_url(url, cert, auth_token)
+        self.api.info_ttl = info_ttl
+        self.client = ZuulClient(self.api, tenant_rate_limit)
+        # Costs nothing, the host is checked on the first query
+        self.client.connect()
+        super().__init__("", url)
+        self.tenants = tenants
+        self.builds_page_size = builds_page_size
+        self.max_page_requests = max_page_requests
+        self.max_tenant_requests = max_tenant_requests
+        self._snapshots = {}
+
+    @property
+    def retry_policy(self):
+        """
+        :return: How requests to the host are retried.
+        :rtype: :class:`cibyl.sources.source.RetryPolicy`
+        """
+        return self.api.retry_policy
+
+    @retry_policy.setter
+    def retry_policy(self, value):
+        self.api.retry_policy = value
+
+    def connect(self):
+        """Prepares the connection with the host, which is verified on the
+        first request made to it."""
+        self.client.connect()
+
+    def get_tenants(self):
+        """
+            Get the tenants to query, those served by the host if none were
+            given.
+
+            :returns: Names of the tenants
+            :rtype: list
+        """
+        if self.tenants:
+            return self.tenants
+
+        return self.client.get_tenants()
+
+    def iter_tenants(self, fetch):
+        """
+            Go through what is fetched about each tenant, with the tenants
+            fetched concurrently. Items are handed over in chunks as they
+            arrive, and tenants wait for their chunks to be taken once
+            enough of them are waiting, so that no tenant is held in full.
+
+            :param fetch: Call that receives the name of a tenant and
+            returns the items fetched about it
+            :type fetch: callable
+
+            :returns: The items of all tenants, in the order they arrive
+            :rtype: generator
+            :raises Exception: The first error a tenant failed with
+        """
+        chunks = Queue(maxsize=self.max_tenant_requests)
+        stop = Event()
+
+        def put(item):
+            while not stop.is_set():
+                try:
+                    chunks.put(item, timeout=0.1)
+                    return
+                except Full:
+                    continue
+
+        def produce(tenant):
+            try:
+                items = iter(fetch(tenant))
+                while not stop.is_set():
+                    chunk = list(islice(items, self.tenant_chunk_size))
+                    if not chunk:
+                        break
+                    put((tenant, chunk))
+            finally:
+                # Marks the tenant as done, whether it worked or not
+                put((tenant, None))
+
+        with ThreadPoolExecutor(
+                max_workers=self.max_tenant_requests) as executor:
+            futures = {tenant: executor.submit(produce, tenant)
+                       for tenant in self.get_tenants()}
+            try:
+                pending = len(futures)
+                while pending:
+                    tenant, chunk = chunks.get()
+                    if chunk is None:
+                        futures[tenant].result()
+                        LOG.debug("finished querying tenant %s", tenant)
+                        pending -= 1
+                        continue
+                    yield from chunk
+            finally:
+                # Tenants not yet done are of no use
+                stop.set()
+                for future in futures.values():
+                    future.cancel()
+
+    # pylint: disable=no-self-use
+    def populate_jobs(self, system, jobs):
+        """
+            Create Job models using Zuul jobs information. Jobs already on
+            the system are left as they are.
+
+            :param system: System model to input the jobs to
+            :type system: :class:`cibyl.models.ci.system.System`
+            :param jobs: Jobs received from the host
+            :type jobs: iterable
+        """
+        for job in jobs:
+            if system.jobs.contains(job['name']):
+                continue
+            system.add_job(Job(name=job['name']))
+
+    def populate_builds(self, system, builds, builds_limit: int = None):
+        """
+            Create Build models using Zuul builds information, as they
+            arrive. Each build goes to its job on the system and, if the
+            system has pipelines, to its job on the pipeline it ran on.
+
+            :param system: System model to input the builds to
+            :type system: :class:`cibyl.models.ci.system.System`
+            :param builds: Builds received from the host, newest first
+            :type builds: iterable
+            :param builds_limit: Maximum number of builds to model for each
+            job, all of them if None
+            :type builds_limit: int
+        """
+        counts = {}
+
+        def is_kept(build):
+            job_name = build['job_name']
+            if job_name not in counts:
+                job = system.jobs.get(job_name)
+                counts[job_name] = len(job.builds) if job is not None else 0
+
+            if builds_limit and counts[job_name] >= builds_limit:
+                return False
+
+            counts[job_name] += 1
+            return True
+
+        # Only kept builds are modeled, in bulk, chunk by chunk
+        kept = filter(is_kept, builds)
+        for chunk in iter(lambda: list(islice(kept, self.tenant_chunk_size)),
+                          []):
+            models = Build.from_records(chunk, build_id='uuid',
+                                        status='result')
+            for build, model in zip(chunk, models):
+                self.add_build(system, build, model)
+
+    # pylint: disable=no-self-use
+    def add_build(self, system, build, model):
+        """
+            Add a modeled build to its job on the system and, if the system
+            has pipelines, to its job on the pipeline it ran on.
+
+            :param system: System model to input the build to
+            :type system: :class:`cibyl.models.ci.system.System`
+            :param build: Build received from the host
+            :type build: dict
+            :param model: The build, modeled
+            :type model: :class:`cibyl.models.ci.build.Build`
+        """
+        job_name = build['job_name']
+
+        job = system.jobs.get(job_name)
+        if job is None:
+            job = Job(name=job_name)
+            system.add_job(job)
+
+        job.add_build(model)
+
+        if not hasattr(system, 'pipelines'):
+            return
+
+        pipeline_name = build.get('pipeline')
+        pipeline = system.pipelines.get(pipeline_name)
+        if pipeline is None:
+            pipeline = Pipeline(pipeline_name)
+            system.add_pipeline(pipeline)
+
+        pipeline_job = pipeline.jobs.get(job_name)
+        if pipeline_job is None:
+            pipeline_job = Job(name=job_name)
+            pipeline.add_job(pipeline_job)
+
+        pipeline_job.add_build(model)
+
+    def poll_status(self, system):
+        """
+            Take a snapshot of the status of each tenant, concurrently, and
+            compare it with the one taken of the tenant on the previous call
+            for the same system. The pipelines of the system are replaced
+            with those on the new snapshots.
+
+            :param system: System model to input the pipelines to
+            :type system: :class:`cibyl.models.ci.system.ZuulSystem`
+
+            :returns: The jobs that changed since the previous call, all of
+            them on the first one
+            :rtype: list[:class:`cibyl.sources.zuul.status.StatusChange`]
+        """
+        tenants = self.get_tenants()
+
+        with ThreadPoolExecutor(
+                max_workers=self.max_tenant_requests) as executor:
+            # Tenants are kept apart, as they may have pipelines, and even
+            # changes, in common
+            snapshots = dict(zip(
+                tenants, executor.map(self.client.get_status, tenants)))
+
+        previous = self._snapshots.get(system.name.value, {})
+        self._snapshots[system.name.value] = snapshots
+
+        if hasattr(system, 'pipelines'):
+            system.pipelines.value = build_pipelines(*snapshots.values())
+
+        changes = []
+        for tenant in [*snapshots, *(tenant for tenant in previous
+                                     if tenant not in snapshots)]:
+            changes.extend(diff_snapshots(previous.get(tenant, {}),
+                                          snapshots.get(tenant, {}), tenant))
+
+        return changes
+
+    def get_builds(self, tenant, pattern, jobs_query):
+        """
+            Go through the builds of a tenant a query asks for. When it
+            names the jobs, or limits their builds with no cutoff, the jobs
+            of the tenant are listed first and the builds of each are asked
+            for on their own, see :meth:`get_job_builds`. Otherwise, the
+            builds of the whole tenant are gone through, newest first.
+
+            :param tenant: Name of the tenant
+            :type tenant: str
+            :param pattern: Glob-like pattern the job names must match
+            :type pattern: str
+            :param jobs_query: What the query asks for about jobs
+            :type jobs_query: :class:`cibyl.sources.source.JobsQuery`
+
+            :returns: The builds of the jobs that passed the filters
+            :rtype: iterable
+        """
+        if jobs_query.job_names or (jobs_query.builds_limit and
+                                    not jobs_query.builds_since):
+            jobs = filter_jobs(self.client.get_jobs(tenant), pattern,
+                               jobs_query.job_names)
+            return self.get_job_builds(tenant, [job['name'] for job in jobs],
+                                       jobs_query.builds_since,
+                                       jobs_query.builds_limit)
+
+        return filter_jobs(
+            self.client.get_builds(tenant, jobs_query.builds_since, None,
+                                   self.builds_page_size,
+                                   self.max_page_requests),
+            pattern, jobs_query.job_names, 'job_name')
+
+    def get_job_builds(self, tenant, job_names, builds_since=None,
+                       builds_limit=None):
+        """
+            Go through the builds of some jobs of a tenant, asking the host
+            for those of each job on its own, several jobs at a time. With
+            a limit, a single page of that many builds is asked for each
+            job.
+
+            :param tenant: Name of the tenant
+            :type tenant: str
+            :param job_names: Names of the jobs
+            :type job_names: list
+            :param builds_since: Time after which builds must have started,
+            in milliseconds since the epoch, None for any
+            :type builds_since: int
+            :param builds_limit: Maximum number of builds for each job, all
+            of them if None
+            :type builds_limit: int
+
+            :returns: The builds, newest first, job by job
+            :rtype: generator
+        """
+        page_size = self.builds_page_size
+        if builds_limit:
+            page_size = min(page_size, builds_limit)
+
+        def fetch(job_name):
+            # Jobs are already asked for concurrently, their pages are not
+            return list(islice(
+                self.client.get_builds(tenant, builds_since,
+                                       {'job_name': job_name}, page_size, 1),
+                builds_limit))
+
+        with ThreadPoolExecutor(
+                max_workers=self.max_page_requests) as executor:
+            futures = [executor.submit(fetch, job_name)
+                       for job_name in job_names]
+            try:
+                for future in futures:
+                    yield from future.result()
+            finally:
+                # Jobs not yet fetched are of no use
+                for future in futures:
+                    future.cancel()
+
+    def query(self, system, args):
+        LOG.debug("querying system %s using source: %s",
+                  system.name.value, self.name)
+
+        jobs_query = read_jobs_query(args)
+        if jobs_query:
+            pattern = system.jobs_scope.value or "*"
+            job_names = jobs_query.job_names
+            builds_limit = jobs_query.builds_limit
+            get_builds = jobs_query.get_builds
+
+            # Tenants are fetched concurrently, but only this thread
+            # touches the models
+            if not get_builds:
+                self.populate_jobs(system, self.iter_tenants(
+                    lambda tenant: filter_jobs(
+                        self.client.get_jobs(tenant), pattern, job_names)))
+            else:
+                builds = self.iter_tenants(
+                    lambda tenant: self.get_builds(tenant, pattern,
+                                                   jobs_query))
+                if builds_limit:
+                    # Tenants arrive in any order, the newest builds are
+                    # kept whichever tenant they come from
+                    builds = keep_newest(builds, builds_limit)
+
+                self.populate_builds(system, builds, builds_limit)
+
+        if all(argument.populated for argument in args.values()):
+            return system
+
+        return None
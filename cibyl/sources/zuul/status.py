@@ -0,0 +1,142 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+from dataclasses import dataclass
+
+from cibyl.models.ci.build import Build
+from cibyl.models.ci.job import Job
+from cibyl.models.ci.pipeline import Pipeline
+
+
+@dataclass(frozen=True)
+class StatusChange:
+    """Represents a job of a pipeline whose state changed between two
+    snapshots of a tenant's status.
+    """
+
+    pipeline: str
+    """Name of the pipeline."""
+    change: str
+    """Change, or ref, the job runs for."""
+    job: str
+    """Name of the job."""
+    old: str = None
+    """State on the previous snapshot. 'None' if it was not there."""
+    new: str = None
+    """State on the new snapshot. 'None' if it is no longer there."""
+    tenant: str = None
+    """Name of the tenant. 'None' if not known."""
+
+    def __str__(self):
+        pipeline = f"{self.tenant}/{self.pipeline}" if self.tenant \
+            else self.pipeline
+        return f"{pipeline}: {self.change} {self.job} " \
+               f"{self.old or '-'} -> {self.new or '-'}"
+
+
+def get_job_state(job):
+    """
+    :param job: A job, as found on Zuul's status.
+    :type job: dict
+    :return: The result of the job if it finished, 'RUNNING' or 'QUEUED'
+        otherwise.
+    :rtype: str
+    """
+    if job.get('result'):
+        return job['result']
+
+    if job.get('start_time'):
+        return 'RUNNING'
+
+    return 'QUEUED'
+
+
+def take_snapshot(pipelines):
+    """Reduces the status of a tenant to the state of each job on it. Only
+    one pipeline needs to be held in memory at a time.
+
+    :param pipelines: Pipelines found on the status, as decoded by
+        :meth:`cibyl.sources.zuul.api.ZuulAPI.status`.
+    :type pipelines: :class:`typing.Iterable[dict]`
+    :return: The state of each job, by the pipeline, change and job's name.
+    :rtype: dict[tuple[str, str, str], str]
+    """
+    snapshot = {}
+
+    for pipeline in pipelines:
+        for queue in pipeline.get('change_queues') or []:
+            for head in queue.get('heads') or []:
+                for change in head:
+                    change_id = change.get('id') or change.get('ref')
+                    for job in change.get('jobs') or []:
+                        key = (pipeline['name'], change_id, job['name'])
+                        snapshot[key] = get_job_state(job)
+
+    return snapshot
+
+
+def diff_snapshots(old, new, tenant=None):
+    """
+    :param old: The previous snapshot.
+    :type old: dict[tuple[str, str, str], str]
+    :param new: The new snapshot, of the same tenant.
+    :type new: dict[tuple[str, str, str], str]
+    :param tenant: Name of the tenant the snapshots were taken of.
+    :type tenant: str or None
+    :return: The jobs that appeared, disappeared or changed their state.
+    :rtype: list[:class:`StatusChange`]
+    """
+    changes = [
+        StatusChange(*key, old=old.get(key), new=state, tenant=tenant)
+        for key, state in new.items()
+        if old.get(key) != state
+    ]
+
+    changes.extend(
+        StatusChange(*key, old=state, tenant=tenant)
+        for key, state in old.items()
+        if key not in new
+    )
+
+    return changes
+
+
+def build_pipelines(*snapshots):
+    """Models snapshots. Each job in a pipeline gets a build for every
+    change it runs for, identified by the change and with the job's state
+    as status. Pipelines of the same name on several tenants are modeled
+    together.
+
+    :param snapshots: The snapshots, one for each tenant.
+    :type snapshots: dict[tuple[str, str, str], str]
+    :return: The pipelines.
+    :rtype: list[:class:`cibyl.models.ci.pipeline.Pipeline`]
+    """
+    pipelines = {}
+
+    items = (item for snapshot in snapshots for item in snapshot.items())
+    for (pipeline_name, change, job_name), state in items:
+        pipeline = pipelines.get(pipeline_name)
+        if pipeline is None:
+            pipeline = pipelines[pipeline_name] = Pipeline(pipeline_name)
+
+        job = pipeline.jobs.get(job_name)
+        if job is None:
+            job = Job(name=job_name)
+            pipeline.add_job(job)
+
+        job.add_build(Build(change, state))
+
+    return list(pipelines.values())
@@ -0,0 +1,48 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+from argparse import ArgumentTypeError
+from datetime import datetime, timezone
+
+
+def parse_date(date):
+    """Parses a date given on the command line.
+
+    :param date: The date, in ISO format, such as '2022-03-01' or
+        '2022-03-01T10:00:00'. Dates with no time zone are taken as local
+        time.
+    :type date: str
+    :return: The date as milliseconds since the epoch, the unit CI systems
+        use for their timestamps.
+    :rtype: int
+    :raises ArgumentTypeError: If the date is not in ISO format.
+    """
+    try:
+        return int(datetime.fromisoformat(date).timestamp() * 1000)
+    except ValueError as ex:
+        raise ArgumentTypeError(f"Invalid date: '{date}'") from ex
+
+
+def utc_to_timestamp(date):
+    """Converts a date given by a CI system in UTC.
+
+    :param date: The date, in ISO format with no time zone, such as
+        '2022-03-01T10:00:00'.
+    :type date: str
+    :return: The date as milliseconds since the epoch.
+    :rtype: int
+    """
+    moment = datetime.fromisoformat(date).replace(tzinfo=timezone.utc)
+    return int(moment.timestamp() * 1000)
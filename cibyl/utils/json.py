@@ -0,0 +1,295 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+import codecs
+import json
+import re
+
+WHITESPACE = ' \t\n\r'
+
+
+class JSONStreamError(Exception):
+    """Represents an error occurring while a JSON document is being streamed.
+    """
+
+
+# pylint: disable=too-few-public-methods
+class _ValueScanner:
+    """Finds where a JSON value ends as its text arrives in pieces. The
+    brackets and strings gone through are kept track of between pieces, so
+    that each character is looked at only once.
+    """
+
+    STRUCTURE = re.compile(r'["\[\]{}]')
+    STRING = re.compile(r'["\\]')
+    SCALAR_END = re.compile(r'[ \t\n\r,\]}]')
+
+    def __init__(self, first):
+        """
+        :param first: First character of the value.
+        :type first: str
+        """
+        self.scalar = first not in '[{"'
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, text, pos=0):
+        """Goes through the next piece of the value.
+
+        :param text: The piece.
+        :type text: str
+        :param pos: Index on the piece the value continues at.
+        :type pos: int
+        :return: Index on the piece right past the end of the value, -1 if
+            the value goes on past the piece.
+        :rtype: int
+        """
+        if self.scalar:
+            match = self.SCALAR_END.search(text, pos)
+            return match.start() if match else -1
+
+        while True:
+            if self._in_string:
+                pos = self._skip_string(text, pos)
+                if pos < 0:
+                    return -1
+            else:
+                match = self.STRUCTURE.search(text, pos)
+                if not match:
+                    return -1
+
+                char = match.group()
+                if char == '"':
+                    self._in_string = True
+                elif char in '[{':
+                    self._depth += 1
+                else:
+                    self._depth -= 1
+
+                pos = match.end()
+
+            if not self._in_string and self._depth == 0:
+                return pos
+
+    def _skip_string(self, text, pos):
+        """Goes through the string the value is in the middle of.
+
+        :param text: The piece the string continues on.
+        :type text: str
+        :param pos: Index on the piece the string continues at.
+        :type pos: int
+        :return: Index on the piece right past the closing quote, -1 if the
+            string goes on past the piece.
+        :rtype: int
+        """
+        if self._escaped and pos < len(text):
+            # The previous piece ended on a backslash
+            self._escaped = False
+            pos += 1
+
+        while True:
+            match = self.STRING.search(text, pos)
+            if not match:
+                return -1
+
+            if match.group() == '"':
+                self._in_string = False
+                return match.end()
+
+            if match.end() == len(text):
+                self._escaped = True
+                return -1
+
+            pos = match.end() + 1
+
+
+class _StreamReader:
+    """Reads JSON values out of a document that arrives in chunks, keeping
+    in memory only the part of it that has not been consumed yet.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._json = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._exhausted = False
+
+    def _read(self):
+        """Reads the next chunk of the document.
+
+        :return: The chunk, as text. None if there was nothing else to read.
+        """
+        if self._exhausted:
+            return None
+
+        try:
+            chunk = next(self._chunks)
+        except StopIteration:
+            self._exhausted = True
+            chunk = b''
+
+        if isinstance(chunk, bytes):
+            chunk = self._decoder.decode(chunk, final=self._exhausted)
+
+        return chunk
+
+    def _fill(self):
+        """Appends the next chunk to the buffer, dropping whatever has
+        already been consumed.
+
+        :return: False if there was nothing else to read, True otherwise.
+        """
+        chunk = self._read()
+        if chunk is None:
+            return False
+
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _gather(self):
+        """Reads chunks until the next value is whole on the buffer. The
+        chunks are only joined once the end of the value is found.
+
+        :return: Index on the buffer right past the end of the value.
+        :raises JSONStreamError: If the document ends before the value.
+        """
+        scanner = _ValueScanner(self._buffer[self._pos])
+        end = scanner.feed(self._buffer, self._pos)
+        if end >= 0:
+            return end
+
+        parts = [self._buffer[self._pos:]]
+        size = len(parts[0])
+        while end < 0:
+            chunk = self._read()
+            if chunk is None:
+                if not scanner.scalar:
+                    raise JSONStreamError('Invalid JSON document')
+
+                # A number may end with the document
+                end = size
+                break
+
+            end = scanner.feed(chunk)
+            if end >= 0:
+                end += size
+
+            parts.append(chunk)
+            size += len(chunk)
+
+        self._buffer = ''.join(parts)
+        self._pos = 0
+        return end
+
+    def peek(self):
+        """Skips whitespace and gets the next character, without consuming
+        it.
+
+        :return: The character, or an empty string at the end of the
+            document.
+        """
+        while True:
+            while self._pos < len(self._buffer) and \
+                    self._buffer[self._pos] in WHITESPACE:
+                self._pos += 1
+
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+
+            if not self._fill():
+                return ''
+
+    def expect(self, *chars):
+        """Consumes the next character, which must be one of the given ones.
+
+        :return: The consumed character.
+        :raises JSONStreamError: If the character was not expected.
+        """
+        char = self.peek()
+
+        if not char or char not in chars:
+            raise JSONStreamError(
+                f"Expected one of {chars}, got: '{char}'")
+
+        self._pos += 1
+        return char
+
+    def value(self):
+        """Consumes the next value on the document. Its text is gathered
+        before it is decoded, so that it is decoded only once, however
+        many chunks it spans.
+
+        :return: The value, decoded.
+        :raises JSONStreamError: If the value is not valid JSON.
+        """
+        if not self.peek():
+            raise JSONStreamError('Invalid JSON document')
+
+        end = self._gather()
+
+        try:
+            value, self._pos = self._json.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError as ex:
+            raise JSONStreamError('Invalid JSON document') from ex
+
+        if self._pos != end:
+            raise JSONStreamError('Invalid JSON document')
+
+        return value
+
+
+def iter_array(chunks, key):
+    """Lazily decodes the items of an array under one of the keys of a JSON
+    object. Only one item is held in memory at a time, no matter how large
+    the document is.
+
+    :param chunks: The document, in pieces of any size.
+    :type chunks: :class:`typing.Iterable[bytes | str]`
+    :param key: The key, on the top level object, the array is under.
+    :type key: str
+    :return: The items of the array. Nothing if the key is not present.
+    :rtype: :class:`typing.Generator`
+    :raises JSONStreamError: If the document is not valid JSON.
+    """
+    reader = _StreamReader(chunks)
+
+    reader.expect('{')
+    if reader.peek() == '}':
+        return
+
+    while True:
+        name = reader.value()
+        reader.expect(':')
+
+        if name != key:
+            # Not interested in this one, skip it
+            reader.value()
+        else:
+            reader.expect('[')
+            if reader.peek() == ']':
+                return
+
+            while True:
+                yield reader.value()
+
+                if reader.expect(',', ']') == ']':
+                    return
+
+        if reader.expect(',', '}') == '}':
+            return
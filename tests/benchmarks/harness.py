@@ -0,0 +1,169 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+import json
+import os
+import resource
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+
+ENABLED = bool(os.environ.get('CIBYL_BENCHMARKS'))
+"""Whether to run the benchmarks at full size. Otherwise, they are run once
+at a tiny size, just to check that they still work."""
+
+
+def get_sizes(variable, default):
+    """
+    :param variable: Environment variable that holds the sizes, as a comma
+        separated list.
+    :type variable: str
+    :param default: Sizes to use if the variable is not set.
+    :type default: list[int]
+    :return: Sizes to run a benchmark at.
+    :rtype: list[int]
+    """
+    sizes = os.environ.get(variable)
+
+    if not sizes:
+        return default
+
+    return [int(size) for size in sizes.split(',')]
+
+
+def get_peak_rss():
+    """
+    :return: Highest resident set size of the process so far, in bytes.
+    :rtype: int
+    """
+    # Linux gives kilobytes, macOS bytes
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if os.uname().sysname == 'Darwin' else peak * 1024
+
+
+def measure(name, size, server, run):
+    """Runs a benchmark twice: once to time it and once to trace the memory
+    it allocates, which slows it down. Whatever the benchmark prints is
+    thrown away.
+
+    :param name: Name of the benchmark.
+    :type name: str
+    :param size: Size it is run at.
+    :type size: int
+    :param server: Stub server the benchmark sends its requests to.
+    :type server: :class:`tests.benchmarks.stubs.StubServer`
+    :param run: The benchmark.
+    :type run: callable
+    :return: Results of the benchmark.
+    :rtype: dict
+    """
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, \
+            redirect_stdout(devnull):
+        server.requests = 0
+        start = time.perf_counter()
+        run()
+        seconds = time.perf_counter() - start
+        requests = server.requests
+
+        tracemalloc.start()
+        try:
+            run()
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return {
+        'name': name,
+        'size': size,
+        'seconds': seconds,
+        'requests': requests,
+        'peak_memory': peak_memory,
+        'peak_rss': get_peak_rss()
+    }
+
+
+class Results:
+    """Gathers the results of the benchmarks of a run, to print them, save
+    them and compare them with those of a previous run.
+
+    The file they are saved to is taken from the 'CIBYL_BENCHMARK_OUTPUT'
+    environment variable, the one they are compared with from
+    'CIBYL_BENCHMARK_BASELINE'. A benchmark regresses if it takes longer
+    than its baseline times 'CIBYL_BENCHMARK_TOLERANCE', 1.25 by default,
+    or sends more requests.
+    """
+
+    def __init__(self):
+        self.results = []
+        self.baseline = {}
+
+        baseline = os.environ.get('CIBYL_BENCHMARK_BASELINE')
+        if baseline:
+            with open(baseline, encoding='utf-8') as file:
+                self.baseline = {(result['name'], result['size']): result
+                                 for result in json.load(file)}
+
+        self.tolerance = float(
+            os.environ.get('CIBYL_BENCHMARK_TOLERANCE', 1.25))
+
+    def add(self, result):
+        """Takes the result of a benchmark in.
+
+        :param result: The result, as given by :func:`measure`.
+        :type result: dict
+        :return: Reasons why the benchmark regressed, if it did.
+        :rtype: list[str]
+        """
+        self.results.append(result)
+
+        if ENABLED:
+            print(f"{result['name']}[{result['size']}]: "
+                  f"{result['seconds']:.3f}s, "
+                  f"{result['requests']} requests, "
+                  f"{result['peak_memory'] / 2 ** 20:.1f} MiB traced, "
+                  f"{result['peak_rss'] / 2 ** 20:.1f} MiB peak RSS")
+
+        baseline = self.baseline.get((result['name'], result['size']))
+        if baseline is None:
+            return []
+
+        regressions = []
+        if result['seconds'] > baseline['seconds'] * self.tolerance:
+            regressions.append(
+                f"took {result['seconds']:.3f}s, "
+                f"baseline is {baseline['seconds']:.3f}s")
+        if result['requests'] > baseline['requests']:
+            regressions.append(
+                f"sent {result['requests']} requests, "
+                f"baseline is {baseline['requests']}")
+        return regressions
+
+    def save(self):
+        """Writes the results down, if a file to do so was given."""
+        output = os.environ.get('CIBYL_BENCHMARK_OUTPUT')
+        if not output:
+            return
+
+        previous = []
+        if os.path.exists(output):
+            with open(output, encoding='utf-8') as file:
+                previous = json.load(file)
+
+        with open(output, 'w', encoding='utf-8') as file:
+            json.dump(previous + self.results, file, indent=2)
+
+
+RESULTS = Results()
+"""Results of the benchmarks of this run."""
@@ -0,0 +1,218 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+import json
+import re
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from tests.sources.responses import jenkins_builds
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Hands GET requests over to the stub behind the server."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Answers a GET request."""
+        stub = self.server.stub
+        stub.count_request()
+
+        url = urlsplit(self.path)
+        answer = stub.answer(unquote(url.path), parse_qs(url.query))
+
+        if answer is None:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        body = json.dumps(answer).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_):  # pylint: disable=arguments-differ
+        """Keeps the output of the benchmarks clean."""
+
+
+class StubServer:
+    """HTTP server on a local port, run on a background thread, that answers
+    with documents generated on the fly.
+
+    :ivar requests: Number of requests received so far.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self._lock = Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        self._server.stub = self
+        self._server.daemon_threads = True
+        self._thread = Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        """
+        :return: Address the server listens on.
+        :rtype: str
+        """
+        host, port = self._server.server_address
+        return f'http://{host}:{port}/'
+
+    def count_request(self):
+        """Notes that a request was received."""
+        with self._lock:
+            self.requests += 1
+
+    def answer(self, path, query):
+        """
+        :param path: Path of the request.
+        :type path: str
+        :param query: Query parameters of the request.
+        :type query: dict[str, list[str]]
+        :return: The document to answer with. 'None' for a 404.
+        :rtype: object
+        """
+        raise NotImplementedError
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class FakeJenkins(StubServer):
+    """Mimics the JSON API of a Jenkins server with a flat list of jobs,
+    honoring the 'tree' query of the requests made by the sources, and the
+    cap on the builds given out as 'builds'.
+    """
+
+    def __init__(self, jobs=1000, builds=10):
+        """Constructor.
+
+        :param jobs: Number of jobs on the server.
+        :type jobs: int
+        :param builds: Number of builds of each job.
+        :type builds: int
+        """
+        super().__init__()
+        self.jobs = jobs
+        self.builds = builds
+
+    def get_job(self, index, tree):
+        """
+        :param index: Position of the job on the server.
+        :type index: int
+        :param tree: Tree query of the request.
+        :type tree: str
+        :return: The job, with the fields asked for.
+        :rtype: dict
+        """
+        name = f'job-{index}'
+        job = {'_class': 'hudson.model.FreeStyleProject.job', 'name': name,
+               'url': f'{self.url}job/{name}/'}
+
+        if 'fullName' in tree:
+            job['fullName'] = name
+
+        builds = [
+            {'_class': 'hudson.model.FreeStyleBuild',
+             'number': self.builds - number,
+             'result': 'SUCCESS' if number % 3 else 'FAILURE',
+             'timestamp': 1640995200000 - number * 3600000}
+            for number in range(self.builds)
+        ]
+        job.update(jenkins_builds(builds, tree))
+
+        return job
+
+    def answer(self, path, query):
+        if path.rstrip('/') != '/api/json':
+            return None
+
+        tree = query.get('tree', [''])[0]
+        return {
+            '_class': 'hudson.model.Hudson',
+            'jobs': [self.get_job(index, tree) for index in range(self.jobs)]
+        }
+
+
+class FakeZuul(StubServer):
+    """Mimics the REST-API of a Zuul host, with the same number of builds
+    on each of its tenants.
+    """
+
+    pipelines = ('check', 'gate', 'periodic')
+    """Pipelines the builds are spread across."""
+
+    def __init__(self, tenants=1, builds=100000, jobs=100):
+        """Constructor.
+
+        :param tenants: Number of tenants on the host.
+        :type tenants: int
+        :param builds: Number of builds on each tenant.
+        :type builds: int
+        :param jobs: Number of jobs the builds are spread across.
+        :type jobs: int
+        """
+        super().__init__()
+        self.tenants = [f'tenant-{index}' for index in range(tenants)]
+        self.builds = builds
+        self.jobs = jobs
+
+    def get_build(self, tenant, index):
+        """
+        :param tenant: Name of the tenant.
+        :type tenant: str
+        :param index: Position of the build, newest first.
+        :type index: int
+        :return: The build.
+        :rtype: dict
+        """
+        return {
+            'uuid': f'{tenant}-{index}',
+            'job_name': f'job-{index % self.jobs}',
+            'pipeline': self.pipelines[index % len(self.pipelines)],
+            'result': 'SUCCESS' if index % 3 else 'FAILURE',
+            'start_time': '2022-01-01T00:00:00'
+        }
+
+    def answer(self, path, query):
+        if path == '/api/info':
+            return {'info': {'capabilities': {}, 'tenant': None}}
+
+        if path == '/api/tenants':
+            return [{'name': tenant} for tenant in self.tenants]
+
+        match = re.fullmatch(r'/api/tenant/([^/]+)/(jobs|builds)', path)
+        if not match or match.group(1) not in self.tenants:
+            return None
+
+        tenant, endpoint = match.groups()
+        if endpoint == 'jobs':
+            return [{'name': f'job-{index}'} for index in range(self.jobs)]
+
+        skip = int(query.get('skip', ['0'])[0])
+        limit = int(query.get('limit', ['50'])[0])
+        return [self.get_build(tenant, index)
+                for index in range(skip, min(skip + limit, self.builds))]
@@ -0,0 +1,76 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+# pylint: disable=no-member
+from functools import partial
+from unittest import TestCase
+
+from cibyl.models.ci.environment import Environment
+from cibyl.publisher import Publisher
+from cibyl.sources.cache import ResponseCache
+from cibyl.sources.circuit_breaker import CircuitBreaker
+from cibyl.sources.jenkins import Jenkins
+from tests.benchmarks.harness import ENABLED, RESULTS, get_sizes, measure
+from tests.benchmarks.stubs import FakeJenkins
+
+SIZES = get_sizes('CIBYL_BENCHMARK_JENKINS_JOBS',
+                  [1000, 10000, 100000] if ENABLED else [10])
+"""Number of jobs on the server for each run."""
+BUILDS = 10
+"""Number of builds of each job."""
+
+
+class BenchmarkJenkins(TestCase):
+    """End to end benchmarks of :class:`Jenkins`, from the request for the
+    jobs to their publication.
+    """
+
+    @classmethod
+    def tearDownClass(cls):
+        RESULTS.save()
+
+    def run_query(self, server, get_builds):
+        """Lists the jobs on the server, models them and publishes them."""
+        jenkins = Jenkins(server.url, "user", "token")
+        jenkins.cache = ResponseCache(enabled=False)
+        jenkins.circuit_breaker = CircuitBreaker()
+
+        environment = Environment("benchmark")
+        environment.add_system("jenkins", "jenkins")
+        system = environment.systems[0]
+
+        jobs = jenkins.get_jobs(get_builds)
+        jenkins.populate_jobs(system, jobs)
+        Publisher.publish([environment])
+
+        self.assertEqual(server.jobs, len(system.jobs.value))
+
+    def benchmark(self, name, get_builds):
+        """Runs the query at every size, failing if it regressed."""
+        for size in SIZES:
+            with self.subTest(size=size), \
+                    FakeJenkins(jobs=size, builds=BUILDS) as server:
+                result = measure(name, size, server,
+                                 partial(self.run_query, server,
+                                         get_builds))
+                self.assertEqual([], RESULTS.add(result))
+
+    def test_jobs(self):
+        """Benchmarks the listing of jobs alone."""
+        self.benchmark('jenkins_jobs', False)
+
+    def test_jobs_builds(self):
+        """Benchmarks the listing of jobs along with their builds."""
+        self.benchmark('jenkins_jobs_builds', True)
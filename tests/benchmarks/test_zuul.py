@@ -0,0 +1,72 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+# pylint: disable=no-member
+from functools import partial
+from unittest import TestCase
+
+from cibyl.cli.argument import Argument
+from cibyl.models.ci.environment import Environment
+from cibyl.publisher import Publisher
+from cibyl.sources.cache import ResponseCache
+from cibyl.sources.circuit_breaker import CircuitBreaker
+from cibyl.sources.zuul.source import Zuul
+from tests.benchmarks.harness import ENABLED, RESULTS, get_sizes, measure
+from tests.benchmarks.stubs import FakeZuul
+
+SIZES = get_sizes('CIBYL_BENCHMARK_ZUUL_BUILDS',
+                  [10000, 100000, 1000000] if ENABLED else [100])
+"""Number of builds on the host for each run."""
+JOBS = 1000
+"""Number of jobs the builds are spread across."""
+
+
+class BenchmarkZuul(TestCase):
+    """End to end benchmarks of :class:`Zuul`, from the request for the
+    builds to their publication.
+    """
+
+    @classmethod
+    def tearDownClass(cls):
+        RESULTS.save()
+
+    def run_query(self, server):
+        """Pages through the builds on the host, models them and publishes
+        them."""
+        zuul = Zuul(server.url, builds_page_size=1000)
+        zuul.api.cache = ResponseCache(enabled=False)
+        zuul.api.circuit_breaker = CircuitBreaker()
+
+        environment = Environment("benchmark")
+        environment.add_system("zuul", "zuul")
+        system = environment.systems[0]
+
+        args = {'jobs': Argument(name='jobs', arg_type=str, description=""),
+                'builds': Argument(name='builds', arg_type=str,
+                                   description="", value=[""])}
+        zuul.query(system, args)
+        Publisher.publish([environment])
+
+        self.assertEqual(min(server.jobs, server.builds),
+                         len(system.jobs.value))
+
+    def test_builds(self):
+        """Benchmarks the listing of builds."""
+        for size in SIZES:
+            with self.subTest(size=size), \
+                    FakeZuul(builds=size, jobs=JOBS) as server:
+                result = measure('zuul_builds', size, server,
+                                 partial(self.run_query, server))
+                self.assertEqual([], RESULTS.add(result))
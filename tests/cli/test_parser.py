@@ -31,7 +31,7 @@ class TestParser(TestCase):
         self.test_argument = Argument('--test', arg_type=str,
                                       description='test')
         self.environment = Environment(name='test-env')
-        self.environment.arguments = self.environment.API.get(
+        self.arguments = self.environment.API.get(
             'name').get('arguments')
 
     def test_parser_plugin_argument(self):
@@ -53,10 +53,35 @@ class TestParser(TestCase):
         self.assertEqual(parsed_args.config_file_path, '/some/path')
 
     def test_parser_extend(self):
-        self.parser.extend(self.environment.arguments, 'Environment')
+        self.parser.extend(self.arguments, 'Environment')
         # Extend again and see if a message is logged about it
         with self.assertLogs('cibyl.cli.parser', level='DEBUG') as cm:
-            self.parser.extend(self.environment.arguments, 'Environment')
+            self.parser.extend(self.arguments, 'Environment')
+
+    def test_parser_max_workers_argument(self):
+        """Testing parser max-workers argument"""
+        parsed_args = self.parser.argument_parser.parse_args(
+            ['--max-workers', '4'])
+        self.assertEqual(parsed_args.max_workers, 4)
+
+    def test_parser_watch_argument(self):
+        """Testing parser watch argument"""
+        parsed_args = self.parser.argument_parser.parse_args(['--watch'])
+        self.assertEqual(parsed_args.watch, 5.0)
+
+        parsed_args = self.parser.argument_parser.parse_args(
+            ['--watch', '1.5'])
+        self.assertEqual(parsed_args.watch, 1.5)
+
+    def test_parser_output_arguments(self):
+        """Testing parser output format and file arguments"""
+        parsed_args = self.parser.argument_parser.parse_args(
+            ['--output-format', 'jsonl', '--output-file', 'out.jsonl'])
+        self.assertEqual(parsed_args.output_format, 'jsonl')
+        self.assertEqual(parsed_args.output_file, 'out.jsonl')
+
+        parsed_args = self.parser.argument_parser.parse_args([])
+        self.assertIsNone(parsed_args.output_format)
 
     def test_parser_parse_args(self):
         """Testing parser extend method"""
@@ -64,7 +89,7 @@ class TestParser(TestCase):
         self.assertEqual(parsed_app_args, {'plugin': 'openstack'})
         self.assertEqual(parsed_ci_args, {})
 
-        self.parser.extend(self.environment.arguments, 'Environment')
+        self.parser.extend(self.arguments, 'Environment')
         parsed_app_args, parsed_ci_args = self.parser.parse(
             ['--env-name', 'env1', '--plugin', 'openshift'])
         self.assertEqual(parsed_app_args, {'plugin': 'openshift'})
@@ -0,0 +1,75 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+# pylint: disable=no-member
+import unittest
+
+from cibyl.models.attribute import IndexedAttributeListValue
+from cibyl.models.ci.build import Build
+from cibyl.models.ci.job import Job
+
+
+class TestIndexedAttributeListValue(unittest.TestCase):
+    """Testing the indexed list of models"""
+
+    def setUp(self):
+        self.jobs = IndexedAttributeListValue(name='jobs', attr_type=Job)
+
+    def test_get(self):
+        """Testing models are found by their key"""
+        job = Job('job1')
+        self.jobs.append(job)
+        self.jobs.append(Job('job2'))
+
+        self.assertIs(job, self.jobs.get('job1'))
+        self.assertIsNone(self.jobs.get('job3'))
+        self.assertEqual('default', self.jobs.get('job3', 'default'))
+        self.assertTrue(self.jobs.contains('job2'))
+        self.assertFalse(self.jobs.contains('job3'))
+
+    def test_in(self):
+        """Testing models are looked for as in any other list of them"""
+        job = Job('job1')
+        self.jobs.append(job)
+
+        self.assertIn(job, self.jobs)
+        self.assertIn(Job('job1'), self.jobs)
+        self.assertNotIn(Job('job2'), self.jobs)
+
+    def test_upsert(self):
+        """Testing models replace those with the same key in their place"""
+        self.jobs.upsert(Job('job1'))
+        self.jobs.upsert(Job('job2'))
+        job = Job('job1', url='url')
+        self.jobs.upsert(job)
+
+        self.assertEqual(2, len(self.jobs))
+        self.assertIs(job, self.jobs[0])
+        self.assertIs(job, self.jobs.get('job1'))
+
+    def test_value(self):
+        """Testing the index is rebuilt when the models are replaced"""
+        self.jobs.append(Job('job1'))
+        self.jobs.value = [Job('job2'), Job('job3')]
+
+        self.assertFalse(self.jobs.contains('job1'))
+        self.assertIs(self.jobs[1], self.jobs.get('job3'))
+
+    def test_initial_value(self):
+        """Testing the models given at construction are indexed"""
+        builds = IndexedAttributeListValue(
+            name='builds', attr_type=Build, value=[Build('1'), Build('2')])
+
+        self.assertIs(builds[1], builds.get('2'))
@@ -88,3 +88,28 @@ str")
         self.assertEqual(
                 str(self.second_build),
                 f'Build: {self.build_id}\n  Status: {self.build_status}')
+
+    def test_build_compact(self):
+        """Testing Build instances share the metadata of their attributes"""
+        self.assertFalse(hasattr(self.build, '__dict__'))
+        self.assertFalse(hasattr(self.build.status, '__dict__'))
+        self.assertIs(self.build.status.arguments,
+                      Build.API['status']['arguments'])
+        self.assertIs(self.build.status.arguments,
+                      self.second_build.status.arguments)
+        self.assertEqual(self.build.status.attr_type, str)
+
+    def test_builds_from_records(self):
+        """Testing Build models built in bulk out of raw records"""
+        builds = Build.from_records(
+            [{'number': 13, 'result': 'FAILURE'}, {'number': 12}],
+            build_id='number', status='result')
+
+        self.assertEqual(2, len(builds))
+        self.assertEqual('13', builds[0].build_id.value)
+        self.assertEqual('FAILURE', builds[0].status.value)
+        self.assertEqual('12', builds[1].build_id.value)
+        self.assertIsNone(builds[1].status.value)
+        self.assertIs(builds[0].status.arguments,
+                      Build.API['status']['arguments'])
+        self.assertEqual(str(Build('13', 'FAILURE')), str(builds[0]))
@@ -0,0 +1,113 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+# pylint: disable=no-member
+import unittest
+
+from cibyl.models.ci.build import Build
+from cibyl.models.ci.build_columns import BuildColumns
+from cibyl.models.ci.job import Job
+
+
+class TestBuildColumns(unittest.TestCase):
+    """Testing the columnar store of builds"""
+
+    def setUp(self):
+        self.job = Job(name='test-job', columnar=True)
+        self.builds = self.job.builds
+
+    def test_add_build(self):
+        """Testing builds added through the job are modeled back"""
+        self.job.add_build(Build('10', 'SUCCESS'))
+        self.job.add_build(Build('9'))
+
+        self.assertIsInstance(self.builds, BuildColumns)
+        self.assertEqual(2, len(self.builds))
+        self.assertEqual(Build('10'), self.builds[0])
+        self.assertEqual('SUCCESS', self.builds[0].status.value)
+        self.assertIsNone(self.builds[1].status.value)
+        self.assertEqual(['10', '9'],
+                         [build.build_id.value for build in self.builds])
+        self.assertIsNone(self.builds.get_timestamp(0))
+
+    def test_initial_builds(self):
+        """Testing builds given to the job are added to the columns"""
+        job = Job(name='test-job', builds=[Build('1'), Build('2')],
+                  columnar=True)
+
+        self.assertEqual([Build('1'), Build('2')], job.builds.value)
+
+    def test_upsert(self):
+        """Testing builds with an id already there update its status"""
+        self.builds.add('1', 'RUNNING', 1000)
+        self.job.add_build(Build('2'))
+        self.job.add_build(Build('1', 'SUCCESS'))
+
+        self.assertEqual(2, len(self.builds))
+        self.assertEqual('SUCCESS', self.builds.get('1').status.value)
+        self.assertEqual(1000, self.builds.get_timestamp(0))
+        self.assertTrue(self.builds.contains('2'))
+        self.assertFalse(self.builds.contains('3'))
+        self.assertIn(Build('2'), self.builds)
+
+        self.builds.add('3')
+        self.assertTrue(self.builds.contains('3'))
+
+    def test_non_numeric_ids(self):
+        """Testing ids are kept as they came once one is not a number"""
+        self.builds.add('7')
+        self.builds.add('007')
+        self.builds.add('abc')
+
+        self.assertEqual(['7', '007', 'abc'],
+                         [build.build_id.value for build in self.builds[:]])
+
+    def test_count_by_status(self):
+        """Testing the count of builds with each status"""
+        for status in ('SUCCESS', 'FAILURE', 'SUCCESS', None):
+            self.builds.add('1', status)
+
+        self.assertEqual({'SUCCESS': 2, 'FAILURE': 1, None: 1},
+                         self.builds.count_by_status())
+
+    def test_pass_rate(self):
+        """Testing the pass rate leaves unfinished builds out"""
+        self.assertIsNone(self.builds.pass_rate())
+
+        self.builds.add('1', 'FAILURE')
+        self.assertEqual(0.0, self.builds.pass_rate())
+
+        for status in ('SUCCESS', 'SUCCESS', 'SUCCESS', None):
+            self.builds.add('1', status)
+        self.assertEqual(0.75, self.builds.pass_rate())
+
+    def test_last_failure(self):
+        """Testing the most recent failure is found by timestamp first"""
+        self.assertIsNone(self.builds.last_failure())
+
+        self.builds.add('3', 'FAILURE')
+        self.builds.add('1', 'FAILURE')
+        self.assertEqual(Build('3'), self.builds.last_failure())
+
+        self.builds.add('2', 'FAILURE', 1000)
+        self.builds.add('4', 'SUCCESS', 2000)
+        self.assertEqual(Build('2'), self.builds.last_failure())
+
+    def test_last_failure_non_numeric_ids(self):
+        """Testing the first failure added wins without better clues"""
+        self.builds.add('b', 'FAILURE')
+        self.builds.add('a', 'FAILURE')
+
+        self.assertEqual(Build('b'), self.builds.last_failure())
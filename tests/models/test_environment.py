@@ -54,6 +54,15 @@ instead of {self.name}")
         self.assertEqual(2, len(self.env.systems.value))
         self.assertEqual("zuul_sys", self.env.systems.value[0].name.value)
         self.assertEqual("jenkins_sys", self.env.systems.value[1].name.value)
+        self.assertIsInstance(self.env.systems.value[0], ZuulSystem)
+
+    def test_add_systems_existing(self):
+        """Testing adding a system already on the environment replaces it"""
+        self.env.add_system("sys", "zuul")
+        self.env.add_system("sys", "jenkins")
+        self.assertEqual(1, len(self.env.systems.value))
+        self.assertEqual("jenkins",
+                         self.env.systems.get("sys").system_type.value)
 
     def test_str_environment(self):
         """Testing environment str method"""
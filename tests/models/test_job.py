@@ -14,6 +14,7 @@
 #    under the License.
 """
 import unittest
+from unittest.mock import Mock
 
 from cibyl.models.ci.build import Build
 from cibyl.models.ci.job import Job
@@ -106,9 +107,58 @@ Should be {self.job_url}")
                          f'Job: {self.job_name}\n  \
 URL: {self.job_url}')
 
+    def test_job_str_builds(self):
+        """Testing Job __str__ method renders its builds."""
+        self.job.add_build(Build("1", "SUCCESS"))
+        self.job.add_build(Build("2"))
+
+        self.assertEqual(str(self.job),
+                         f'Job: {self.job.name.value}\n'
+                         '  Build: 1\n'
+                         '    Status: SUCCESS\n'
+                         '  Build: 2')
+
     def test_jobs_add_build(self):
         """Testing Job add_build method."""
         build2 = Build("2", "SUCCESS")
         self.job.add_build(build2)
         self.assertEqual(1, len(self.job.builds.value))
         self.assertEqual(build2, self.job.builds.value[0])
+
+    def test_jobs_add_build_existing(self):
+        """Testing Job add_build method replaces builds with the same id."""
+        self.job.add_build(Build("2", "RUNNING"))
+        self.job.add_build(Build("3"))
+        self.job.add_build(Build("2", "SUCCESS"))
+        self.assertEqual(2, len(self.job.builds.value))
+        self.assertEqual("SUCCESS", self.job.builds.get("2").status.value)
+
+    def test_jobs_from_records(self):
+        """Testing Job models built in bulk out of raw records."""
+        jobs = Job.from_records([{'name': 'job1', 'url': 'url1'},
+                                 {'name': 'job2'}])
+
+        self.assertEqual([Job('job1'), Job('job2')], jobs)
+        self.assertEqual('url1', jobs[0].url.value)
+        self.assertIsNone(jobs[1].url.value)
+        jobs[0].add_build(Build('1'))
+        self.assertEqual([Build('1')], jobs[0].builds.value)
+        self.assertEqual([], jobs[1].builds.value)
+
+    def test_jobs_deferred_builds(self):
+        """Testing Job builds are loaded the first time they are accessed."""
+        loader = Mock(return_value=[Build('1')])
+        self.job.defer('builds', loader)
+
+        self.assertFalse(self.job.is_loaded('builds'))
+        loader.assert_not_called()
+        self.assertEqual([Build('1')], self.job.builds.value)
+        self.assertEqual([Build('1')], self.job.builds.value)
+        loader.assert_called_once_with(self.job, 'builds')
+        self.assertTrue(self.job.is_loaded('builds'))
+        self.assertTrue(self.job.builds.contains('1'))
+
+    def test_jobs_missing_attribute(self):
+        """Testing Job attributes that are neither set nor deferred."""
+        with self.assertRaises(AttributeError):
+            self.job.missing  # pylint: disable=pointless-statement
@@ -15,6 +15,7 @@
 """
 import unittest
 
+from cibyl.models.ci.job import Job
 from cibyl.models.ci.pipeline import Pipeline
 
 
@@ -58,3 +59,10 @@ from str")
 
         self.assertEqual(str(self.second_pipeline),
                          f'Pipeline {self.second_pipeline.name.value}')
+
+    def test_add_job(self):
+        """Testing adding a new job to a pipeline"""
+        job = Job("test_job")
+        self.pipeline.add_job(job)
+        self.assertEqual(1, len(self.pipeline.jobs.value))
+        self.assertEqual(job, self.pipeline.jobs.value[0])
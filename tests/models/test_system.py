@@ -61,6 +61,29 @@ class TestSystem(unittest.TestCase):
         self.assertEqual(len(self.system.jobs.value), 1)
         self.assertEqual(job, self.system.jobs.value[0])
 
+    def test_add_job_existing(self):
+        """Testing adding a job already on a system replaces it"""
+        self.system.add_job(Job("test_job"))
+        job = Job("test_job", url="url")
+        self.system.add_job(job)
+        self.assertEqual(len(self.system.jobs.value), 1)
+        self.assertIs(job, self.system.jobs.get("test_job"))
+        self.assertTrue(self.system.jobs.contains("test_job"))
+
+    def test_iter_lines(self):
+        """Testing System iter_lines method renders the jobs given"""
+        self.system.add_job(Job("job1"))
+
+        self.assertEqual(
+            [f"  System: {self.name} (type: {self.system_type})",
+             "    Job: job2"],
+            list(self.system.iter_lines(2, [Job("job2")])))
+
+        self.assertEqual(
+            [f"System: {self.name} (type: {self.system_type})",
+             "  Job: job1"],
+            list(self.system.iter_lines()))
+
 
 class TestZuulSystem(unittest.TestCase):
     """Testing the ZuulSystem class"""
@@ -117,6 +140,13 @@ class TestZuulSystem(unittest.TestCase):
         self.assertEqual(len(self.system.pipelines.value), 1)
         self.assertEqual(pipeline, self.system.pipelines[0])
 
+    def test_pipelines_attribute(self):
+        """Testing ZuulSystem pipelines attribute metadata"""
+        self.assertEqual(self.system.pipelines.value, [])
+        self.assertEqual(self.system.pipelines.attr_type, Pipeline)
+        self.assertEqual('--pipelines',
+                         self.system.pipelines.arguments[0].name)
+
     def test_add_job(self):
         """Testing adding a new job to a system"""
         job = Job("test_job")
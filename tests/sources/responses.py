@@ -0,0 +1,69 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+import json
+import re
+
+from requests import Response
+
+JENKINS_BUILDS_CAP = 100
+"""Number of builds of a job Jenkins gives out as 'builds', the newest
+ones."""
+
+
+def json_response(data, status=200, headers=None):
+    """Builds a response with a JSON body.
+
+    :param data: The body, before being encoded.
+    :param status: Status code of the response.
+    :type status: int
+    :param headers: Headers of the response.
+    :type headers: dict
+    :return: The response.
+    :rtype: :class:`requests.Response`
+    """
+    response = Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    response._content = json.dumps(data).encode()  # pylint: disable=W0212
+    return response
+
+
+def jenkins_builds(builds, tree):
+    """Picks the builds of a job that a tree query sent to Jenkins asks for.
+    As Jenkins does, only the newest :data:`JENKINS_BUILDS_CAP` of them are
+    given out as 'builds', while 'allBuilds' holds them all. Either can be
+    given a range.
+
+    :param builds: All builds of the job, newest first.
+    :type builds: list[dict]
+    :param tree: The tree query.
+    :type tree: str
+    :return: The builds, under the field they were asked for. Empty if they
+        were not asked for.
+    :rtype: dict
+    """
+    match = re.search(r'\b(allBuilds|builds)\[[^\]]*\](?:\{(\d+),(\d+)\})?',
+                      tree)
+    if not match:
+        return {}
+
+    field, start, end = match.groups()
+    if field == 'builds':
+        builds = builds[:JENKINS_BUILDS_CAP]
+    if start is not None:
+        builds = builds[int(start):int(end)]
+
+    return {field: builds}
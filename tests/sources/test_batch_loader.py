@@ -0,0 +1,95 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+# pylint: disable=no-member
+from unittest import TestCase
+from unittest.mock import Mock
+
+from cibyl.models.ci.build import Build
+from cibyl.models.ci.job import Job
+from cibyl.sources.batch_loader import BatchLoader
+
+
+class TestBatchLoader(TestCase):
+    """Tests for :class:`BatchLoader`."""
+
+    def setUp(self):
+        self.fetch = Mock(side_effect=lambda key: [Build(key)])
+        self.loader = BatchLoader(self.fetch, batch_size=2, max_workers=2)
+        self.jobs = [Job(f'job{index}') for index in range(5)]
+        for index, job in enumerate(self.jobs):
+            self.loader.defer(job, 'builds', str(index))
+
+    def test_nothing_fetched_until_accessed(self):
+        """Tests that deferring attributes does not fetch them."""
+        self.fetch.assert_not_called()
+        self.assertFalse(self.jobs[0].is_loaded('builds'))
+
+    def test_batch(self):
+        """Tests that the attributes deferred after the one accessed are
+        loaded along with it.
+        """
+        self.assertEqual([Build('1')], self.jobs[1].builds.value)
+
+        self.assertEqual(2, self.fetch.call_count)
+        self.assertTrue(self.jobs[2].is_loaded('builds'))
+        self.assertEqual([Build('2')], self.jobs[2].builds.value)
+        self.assertFalse(self.jobs[0].is_loaded('builds'))
+        self.assertFalse(self.jobs[3].is_loaded('builds'))
+
+        self.assertEqual([Build('4')], self.jobs[4].builds.value)
+        self.assertEqual([Build('0')], self.jobs[0].builds.value)
+        self.assertEqual([Build('3')], self.jobs[3].builds.value)
+        self.assertEqual(5, self.fetch.call_count)
+
+    def test_error(self):
+        """Tests that attributes that could not be fetched stay deferred."""
+        self.fetch.side_effect = ConnectionError
+
+        with self.assertRaises(ConnectionError):
+            self.jobs[0].builds  # pylint: disable=pointless-statement
+
+        self.assertFalse(self.jobs[0].is_loaded('builds'))
+        self.assertFalse(self.jobs[1].is_loaded('builds'))
+
+    def test_error_along(self):
+        """Tests that an attribute failing to be fetched along with the one
+        accessed does not fail the access, and stays deferred.
+        """
+        def fetch(key):
+            if key == '1':
+                raise ConnectionError
+            return [Build(key)]
+
+        self.fetch.side_effect = fetch
+
+        self.assertEqual([Build('0')], self.jobs[0].builds.value)
+        self.assertFalse(self.jobs[1].is_loaded('builds'))
+
+        with self.assertRaises(ConnectionError):
+            self.jobs[1].builds  # pylint: disable=pointless-statement
+
+    def test_replaced(self):
+        """Tests that models replaced by another of the same key are not
+        fetched along with the rest.
+        """
+        replacement = Job('job1')
+        self.loader.defer(replacement, 'builds', 'new')
+
+        self.assertEqual([Build('0')], self.jobs[0].builds.value)
+        self.assertEqual([Build('new')], replacement.builds.value)
+        self.assertEqual(['0', '2', 'new'],
+                         sorted(call.args[0]
+                                for call in self.fetch.call_args_list))
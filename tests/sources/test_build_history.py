@@ -0,0 +1,110 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+import os
+from shutil import rmtree
+from tempfile import mkdtemp
+from unittest import TestCase
+from unittest.mock import patch
+
+from cibyl.sources.build_history import BuildHistory
+from cibyl.sources.cache import RESPONSE_CACHE
+
+
+class TestBuildHistory(TestCase):
+    """Tests for :class:`BuildHistory`.
+    """
+
+    def setUp(self):
+        self.directory = mkdtemp()
+        self.history = BuildHistory('url', self.directory)
+
+    def tearDown(self):
+        rmtree(self.directory, ignore_errors=True)
+
+    def test_unknown_job(self):
+        """Checks that nothing is seen for unknown jobs.
+        """
+        self.assertIsNone(self.history.last_seen('job'))
+
+    def test_merge(self):
+        """Checks that new builds are merged into the known ones.
+        """
+        self.history.merge('job', [{'number': 2, 'result': 'SUCCESS'},
+                                   {'number': 1, 'result': 'FAILURE'}])
+        builds = self.history.merge('job', [{'number': 3, 'result': None}])
+
+        self.assertEqual([{'number': 3, 'result': None},
+                          {'number': 2, 'result': 'SUCCESS'},
+                          {'number': 1, 'result': 'FAILURE'}], builds)
+
+    def test_last_seen(self):
+        """Checks that running builds are not counted as seen.
+        """
+        self.history.merge('job', [{'number': 2, 'result': 'SUCCESS'}])
+        self.assertEqual(2, self.history.last_seen('job'))
+
+        self.history.merge('job', [{'number': 4, 'result': 'SUCCESS'},
+                                   {'number': 3, 'result': None}])
+        self.assertEqual(2, self.history.last_seen('job'))
+
+        self.history.merge('job', [{'number': 3, 'result': 'FAILURE'}])
+        self.assertEqual(4, self.history.last_seen('job'))
+
+    def test_save(self):
+        """Checks that the history survives between instances.
+        """
+        self.history.merge('job', [{'number': 2, 'result': 'SUCCESS'}])
+        self.history.save()
+
+        history = BuildHistory('url', self.directory)
+
+        self.assertEqual(2, history.last_seen('job'))
+        self.assertIsNone(
+            BuildHistory('other', self.directory).last_seen('job'))
+
+    def test_merge_first_build(self):
+        """Checks that builds rotated away by the host are forgotten.
+        """
+        self.history.merge('job', [{'number': 2, 'result': 'SUCCESS'},
+                                   {'number': 1, 'result': 'FAILURE'}])
+        builds = self.history.merge('job', [{'number': 3, 'result': None}],
+                                    first_build=2)
+
+        self.assertEqual([3, 2], [build['number'] for build in builds])
+
+    def test_prune(self):
+        """Checks that jobs no longer on the host are forgotten, as long as
+        they were meant to be listed.
+        """
+        for job in ('job1', 'job2', 'other'):
+            self.history.merge(job, [{'number': 1, 'result': 'SUCCESS'}])
+
+        self.history.prune(['job1'], lambda job: job.startswith('job'))
+
+        self.assertEqual(1, self.history.last_seen('job1'))
+        self.assertIsNone(self.history.last_seen('job2'))
+        self.assertEqual(1, self.history.last_seen('other'))
+
+    def test_default_path(self):
+        """Checks that histories are stored along with the response cache.
+        """
+        with patch.object(RESPONSE_CACHE, 'path', self.directory):
+            history = BuildHistory('url')
+            history.merge('job', [{'number': 2, 'result': 'SUCCESS'}])
+            history.save()
+
+            self.assertEqual(1, len(os.listdir(os.path.join(
+                self.directory, BuildHistory.DIRECTORY))))
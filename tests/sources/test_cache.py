@@ -0,0 +1,221 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+import os
+from shutil import rmtree
+from tempfile import mkdtemp
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from requests import HTTPError
+
+from cibyl.sources.cache import ResponseCache, get_conditional_headers
+from tests.sources.responses import json_response
+
+
+class TestResponseCache(TestCase):
+    """Tests for :class:`ResponseCache`.
+    """
+
+    def setUp(self):
+        self.directory = mkdtemp()
+        self.cache = ResponseCache(self.directory)
+
+    def tearDown(self):
+        rmtree(self.directory, ignore_errors=True)
+
+    def test_put_and_get(self):
+        """Checks that stored responses can be read back.
+        """
+        data = [{'name': 'job1'}]
+
+        self.cache.put('url', '?tree=jobs[name]', data)
+
+        self.assertEqual(data, self.cache.get('url', '?tree=jobs[name]'))
+        self.assertIsNone(self.cache.get('url', '?tree=jobs[url]'))
+        self.assertIsNone(self.cache.get('other', '?tree=jobs[name]'))
+
+    def test_expired_entries(self):
+        """Checks that entries are ignored once their time-to-live passes.
+        """
+        self.cache.ttl = -1
+        self.cache.put('url', 'query', 'data')
+
+        self.assertIsNone(self.cache.get('url', 'query'))
+        self.assertEqual('data', self.cache.get('url', 'query', ttl=60))
+
+    def test_disabled(self):
+        """Checks that a disabled cache stores nothing.
+        """
+        self.cache.enabled = False
+        self.cache.put('url', 'query', 'data')
+
+        self.assertEqual([], os.listdir(self.directory))
+        self.assertIsNone(self.cache.get('url', 'query'))
+
+    def test_refresh(self):
+        """Checks that entries are not read, but still written, when
+        refreshing.
+        """
+        self.cache.refresh = True
+        self.cache.put('url', 'query', 'data')
+
+        self.assertIsNone(self.cache.get('url', 'query'))
+
+        self.cache.refresh = False
+
+        self.assertEqual('data', self.cache.get('url', 'query'))
+
+    def test_eviction(self):
+        """Checks that the oldest entries go away when the cache grows past
+        its maximum size.
+        """
+        self.cache.put('url', 'query1', 'x' * 100)
+        # pylint: disable=protected-access
+        os.utime(self.cache._file_for('url', 'query1'), (0, 0))
+
+        self.cache.max_size = 300
+        self.cache.put('url', 'query2', 'x' * 100)
+        self.cache.put('url', 'query3', 'x' * 100)
+
+        self.assertIsNone(self.cache.get('url', 'query1'))
+        self.assertEqual('x' * 100, self.cache.get('url', 'query3'))
+
+    def test_eviction_scans_once(self):
+        """Checks that the directory is only looked through when the cache
+        has to be trimmed, not on every write.
+        """
+        # pylint: disable=protected-access
+        with patch.object(self.cache, '_entries',
+                          wraps=self.cache._entries) as entries:
+            for index in range(10):
+                self.cache.put('url', f'query{index}', 'x' * 100)
+                self.cache.put('url', f'query{index}', 'y' * 100)
+
+            self.assertEqual(1, entries.call_count)
+
+            self.cache.max_size = 2000
+            self.cache.put('url', 'query10', 'x' * 100)
+
+            self.assertEqual(2, entries.call_count)
+
+        self.assertLessEqual(self.cache._size, 1500)
+        self.assertEqual(self.cache._size,
+                         sum(entry.stat().st_size
+                             for entry in self.cache._entries()))
+        self.assertEqual('x' * 100, self.cache.get('url', 'query10'))
+
+    def test_clear(self):
+        """Checks that clearing the cache removes all entries.
+        """
+        self.cache.put('url', 'query', 'data')
+        self.cache.clear()
+
+        self.assertIsNone(self.cache.get('url', 'query'))
+
+    def test_entries_kept_in_memory(self):
+        """Checks that entries are not read from disk again once loaded.
+        """
+        self.cache.put('url', 'query', 'data')
+        # pylint: disable=protected-access
+        os.remove(self.cache._file_for('url', 'query'))
+
+        self.assertEqual('data', self.cache.get('url', 'query'))
+
+    def test_memory_bounded(self):
+        """Checks that only the entries used last are kept in memory, up to
+        its limit, and that reads are free to change what they get.
+        """
+        self.cache.max_memory = 150
+        for query in ('q1', 'q2', 'q3'):
+            self.cache.put('url', query, ['data'])
+        # pylint: disable=protected-access
+        os.remove(self.cache._file_for('url', 'q1'))
+        os.remove(self.cache._file_for('url', 'q3'))
+
+        self.assertIsNone(self.cache.get('url', 'q1'))
+
+        data = self.cache.get('url', 'q3')
+        data.append('changed')
+        self.assertEqual(['data'], self.cache.get('url', 'q3'))
+
+    def test_no_ttl(self):
+        """Checks that a time-to-live of zero is not taken as the default.
+        """
+        with patch('cibyl.sources.cache.time.time', return_value=0):
+            self.cache.put('url', 'query', 'data')
+
+        with patch('cibyl.sources.cache.time.time', return_value=1):
+            self.assertEqual('data', self.cache.get('url', 'query'))
+            self.assertIsNone(self.cache.get('url', 'query', 0))
+
+    def test_renew(self):
+        """Checks that renewed entries are valid again.
+        """
+        with patch('cibyl.sources.cache.time.time', return_value=0):
+            self.cache.put('url', 'query', 'data', {'etag': 'v1'})
+        self.cache.ttl = 60
+
+        self.assertIsNone(self.cache.get('url', 'query'))
+        self.assertEqual({'etag': 'v1'},
+                         self.cache.get_validators('url', 'query'))
+        self.assertEqual('data', self.cache.renew('url', 'query'))
+        self.assertEqual('data', self.cache.get('url', 'query'))
+
+    def test_get_conditional_headers(self):
+        """Checks that validators are turned into conditional headers.
+        """
+        self.assertEqual({}, get_conditional_headers(None))
+        self.assertEqual(
+            {'If-None-Match': 'v1', 'If-Modified-Since': 'date'},
+            get_conditional_headers({'etag': 'v1', 'last_modified': 'date',
+                                     'digest': 'hash'}))
+
+    def test_fetch(self):
+        """Checks that responses are stored along their validators, and
+        reused when the host says they have not changed.
+        """
+        send = Mock(return_value=json_response(
+            {'jobs': [1]}, headers={'ETag': 'v1', 'Last-Modified': 'date'}))
+
+        self.assertEqual([1], self.cache.fetch(
+            'url', 'query', send, lambda info: info['jobs']))
+        send.assert_called_once_with({})
+
+        send.return_value = json_response(None, status=304)
+
+        self.assertEqual([1], self.cache.fetch('url', 'query', send))
+        send.assert_called_with({'If-None-Match': 'v1',
+                                 'If-Modified-Since': 'date'})
+
+    def test_fetch_same_content(self):
+        """Checks that a response with the same content as the stored one
+        is not decoded again.
+        """
+        send = Mock(return_value=json_response({'jobs': [1]}))
+        parse = Mock(side_effect=lambda info: info['jobs'])
+
+        first = self.cache.fetch('url', 'query', send, parse)
+        second = self.cache.fetch('url', 'query', send, parse)
+
+        self.assertEqual(first, second)
+        parse.assert_called_once()
+
+    def test_fetch_error(self):
+        """Checks that errors of the host are raised.
+        """
+        send = Mock(return_value=json_response(None, status=500))
+
+        self.assertRaises(HTTPError, self.cache.fetch, 'url', 'query', send)
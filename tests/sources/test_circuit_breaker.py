@@ -0,0 +1,124 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+from cibyl.sources.cache import ResponseCache
+from cibyl.sources.circuit_breaker import CircuitBreaker
+
+
+class TestCircuitBreaker(TestCase):
+    """Tests for :class:`CircuitBreaker`.
+    """
+
+    def setUp(self):
+        self.breaker = CircuitBreaker(threshold=0.5, min_requests=4,
+                                      window=4, cooldown=60)
+
+    def test_opens_on_threshold(self):
+        """Checks that the circuit opens once enough requests fail.
+        """
+        for success in (True, False, True):
+            self.breaker.record('host', success)
+        self.assertFalse(self.breaker.is_open('host'))
+
+        self.breaker.record('host', False)
+        self.assertTrue(self.breaker.is_open('host'))
+        self.assertFalse(self.breaker.is_open('other'))
+
+    def test_success_resets(self):
+        """Checks that a success closes the circuit and clears failures.
+        """
+        for _ in range(4):
+            self.breaker.record('host', False)
+        self.breaker.record('host', True)
+
+        self.assertFalse(self.breaker.is_open('host'))
+
+        self.breaker.record('host', False)
+        self.assertFalse(self.breaker.is_open('host'))
+
+    @patch('cibyl.sources.circuit_breaker.time.time')
+    def test_half_open_after_cooldown(self, time):
+        """Checks that a single request is let through after the cool-down
+        and that the circuit opens again if it fails.
+        """
+        time.return_value = 1000
+        for _ in range(4):
+            self.breaker.record('host', False)
+
+        time.return_value = 1059
+        self.assertTrue(self.breaker.is_open('host'))
+
+        time.return_value = 1061
+        self.assertFalse(self.breaker.is_open('host'))
+        self.assertTrue(self.breaker.is_open('host'))
+
+        self.breaker.record('host', False)
+        time.return_value = 1100
+        self.assertTrue(self.breaker.is_open('host'))
+
+    def test_persistence(self):
+        """Checks that the state survives between instances when saved.
+        """
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'circuits.json')
+
+            self.breaker.path = path
+            for _ in range(4):
+                self.breaker.record('host', False)
+
+            breaker = CircuitBreaker(cooldown=60, path=path)
+            self.assertTrue(breaker.is_open('host'))
+
+            breaker.reset()
+            self.assertFalse(CircuitBreaker(path=path).is_open('host'))
+
+    def test_saved_on_change(self):
+        """Checks that the state is only saved when a circuit opens or
+        closes.
+        """
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'circuits.json')
+
+            self.breaker.path = path
+            for _ in range(3):
+                self.breaker.record('host', False)
+            self.assertFalse(os.path.exists(path))
+
+            self.breaker.record('host', False)
+            self.assertTrue(os.path.exists(path))
+
+    def test_saved_outside_cache(self):
+        """Checks that the state is not saved among the entries of the
+        response cache, where eviction would remove it.
+        """
+        with TemporaryDirectory() as directory:
+            cache = ResponseCache(directory)
+
+            with patch('cibyl.sources.circuit_breaker.RESPONSE_CACHE', cache):
+                self.breaker.configure(min_requests=1, persist=True)
+            self.breaker.record('host', False)
+
+            self.assertTrue(os.path.exists(self.breaker.path))
+            # pylint: disable=protected-access
+            self.assertEqual([], cache._entries())
+
+            cache.clear()
+            self.assertTrue(CircuitBreaker(path=self.breaker.path)
+                            .is_open('host'))
@@ -14,20 +14,31 @@
 #    under the License.
 """
 # pylint: disable=no-member
+import json
+from shutil import rmtree
+from tempfile import mkdtemp
 from unittest import TestCase
-from unittest.mock import Mock
+from unittest.mock import MagicMock, Mock, patch
 
+from cibyl.cli.argument import Argument
 from cibyl.exceptions.jenkins import JenkinsError
+from cibyl.models.ci.build_columns import BuildColumns
 from cibyl.models.ci.system import System
-from cibyl.sources.jenkins import Jenkins, JenkinsOSP, safe_request
+from cibyl.sources.build_history import BuildHistory
+from cibyl.sources.cache import ResponseCache
+from cibyl.sources.jenkins import (Jenkins, JenkinsOSP, deepen_jobs_query,
+                                   get_folder_item, safe_request,
+                                   split_jobs_scope, walk_jobs)
+from tests.sources.responses import jenkins_builds, json_response
 
 
-def return_arg(query=None):
+# pylint: disable=unused-argument
+def return_arg(item="", query=None, headers=None):
     """
         Helper function that returns its argument. It can't be a lambda because
         it will get called inside a decorated function
     """
-    return {"jobs": query}
+    return json_response({"jobs": query})
 
 
 class TestSafeRequestJenkinsError(TestCase):
@@ -56,13 +67,114 @@ class TestSafeRequestJenkinsError(TestCase):
 
         self.assertEqual(result, request_test())
 
+    def test_wraps_errors_on_iteration(self):
+        """Tests that errors coming out of a generator while iterating over
+        it are wrapped around the JenkinsError type.
+        """
+
+        @safe_request
+        def request_test():
+            yield 1
+            raise Exception
+
+        items = request_test()
+
+        self.assertEqual(1, next(items))
+        self.assertRaises(JenkinsError, next, items)
+
+
+class TestJobsFilters(TestCase):
+    """Tests for :func:`split_jobs_scope`.
+    """
 
+    def test_split_jobs_scope(self):
+        """Checks that folders and views are taken out of the scope.
+        """
+        self.assertEqual(("", "*"), split_jobs_scope(None))
+        self.assertEqual(("", "*"), split_jobs_scope("*"))
+        self.assertEqual(("", "tripleo-*"), split_jobs_scope("tripleo-*"))
+        self.assertEqual(("job/folder/job/sub", "*"),
+                         split_jobs_scope("folder/sub/*"))
+        self.assertEqual(("view/osp/job/tripleo", "*-master"),
+                         split_jobs_scope("view:osp/tripleo/*-master"))
+        self.assertEqual(("job/folder", "a*/b"),
+                         split_jobs_scope("folder/a*/b"))
+
+
+class TestFolders(TestCase):
+    """Tests for the traversal of folders.
+    """
+
+    folder_class = "com.cloudbees.hudson.plugins.folder.Folder"
+
+    def test_deepen_jobs_query(self):
+        """Checks that the jobs of folders are asked for down to a depth.
+        """
+        self.assertEqual("?tree=jobs[name,url,fullName]",
+                         deepen_jobs_query("?tree=jobs[name,url]", 0))
+        self.assertEqual(
+            "?tree=jobs[name,url,fullName,jobs[name,url,fullName,"
+            "jobs[name,url,fullName]]]",
+            deepen_jobs_query("?tree=jobs[name,url]", 2))
+
+    def test_get_folder_item(self):
+        """Checks that folders are turned into items to ask the server for.
+        """
+        self.assertEqual(
+            "job/a/job/b",
+            get_folder_item({"fullName": "a/b", "url": "ignored"}))
+        self.assertEqual(
+            "job/a/job/b c",
+            get_folder_item({"url": "http://jenkins/job/a/job/b%20c/"},
+                            "http://jenkins/"))
+        self.assertEqual(
+            "job/a",
+            get_folder_item({"url": "https://ci.example.com/job/a/"},
+                            "https://ci.example.com:443/"))
+        self.assertEqual(
+            "job/a",
+            get_folder_item({"url": "http://ci.example.com/jenkins/job/a/"},
+                            "https://ci.example.com/jenkins"))
+
+    def test_walk_jobs(self):
+        """Checks that nested jobs are unpacked, unknown folders asked for
+        and repeated jobs dropped.
+        """
+        jobs = [
+            {"_class": "job", "fullName": "job1"},
+            {"_class": self.folder_class, "fullName": "a", "jobs": [
+                {"_class": "job", "fullName": "a/job2"},
+                {"_class": self.folder_class, "fullName": "a/b"}]},
+            {"_class": "org.jenkinsci.plugins.workflow.multibranch."
+                       "WorkflowMultiBranchProject", "fullName": "mb"},
+        ]
+        children = {
+            "a/b": [{"_class": "job", "fullName": "a/b/job3"},
+                    {"_class": "job", "fullName": "job1"}],
+            "mb": [{"_class": "job", "fullName": "mb/main"}]
+        }
+        get_folder_jobs = Mock(
+            side_effect=lambda folder: children[folder["fullName"]])
+
+        found = walk_jobs(jobs, get_folder_jobs, 2)
+
+        self.assertEqual(["job1", "a/job2", "mb/main", "a/b/job3"],
+                         [job["fullName"] for job in found])
+        self.assertEqual(2, get_folder_jobs.call_count)
+
+
+# pylint: disable=too-many-public-methods
 class TestJenkinsSource(TestCase):
     """Tests for :class:`Jenkins`.
     """
 
     def setUp(self):
+        self.cache_dir = mkdtemp()
         self.jenkins = Jenkins("url", "user", "token")
+        self.jenkins.cache = ResponseCache(self.cache_dir)
+
+    def tearDown(self):
+        rmtree(self.cache_dir, ignore_errors=True)
 
     # pylint: disable=protected-access
     def test_with_all_args(self):
@@ -91,20 +203,552 @@ class TestJenkinsSource(TestCase):
 
         self.assertIsNone(jenkins.client._session.verify)
 
+    def test_sessions_are_shared(self):
+        """Checks that sources on the same host reuse the same session.
+        """
+        jenkins1 = Jenkins('https://host/jenkins1/', 'user', 'token')
+        jenkins2 = JenkinsOSP('https://host/jenkins2/', 'user', 'token')
+
+        self.assertIs(jenkins1.client._session, jenkins2.client._session)
+
+    @patch.dict('os.environ', {'JENKINS_API_EXTRA_HEADERS': 'X-Test: 1',
+                               'PYTHONHTTPSVERIFY': '0'})
+    def test_session_keeps_client_setup(self):
+        """Checks that the shared session keeps the extra headers and lack
+        of verification python-jenkins sets up on its own one.
+        """
+        jenkins = Jenkins('https://host4/jenkins/', 'user', 'token')
+
+        self.assertEqual('1', jenkins.client._session.headers['X-Test'])
+        self.assertIs(False, jenkins.client._session.verify)
+
+    def test_request_info_no_timeout(self):
+        """Checks that the client's default timeout is sent as no timeout.
+        """
+        jenkins = Jenkins('https://host/jenkins3/', 'user', 'token')
+        jenkins.client._session = Mock()
+
+        jenkins._request_info("", "?tree=jobs[name]")
+
+        _, kwargs = jenkins.client._session.send.call_args
+        self.assertIsNone(kwargs['timeout'])
+
     def test_get_jobs(self):
         """
             Tests that the internal logic from :meth:`Jenkins.get_jobs` is
             correct. The jenkins API method that should do the query is mocked
             to that it returns the query itself.
         """
-        self.jenkins.client.get_info = Mock()
-        self.jenkins.client.get_info.side_effect = return_arg
+        self.jenkins._request_info = Mock()
+        self.jenkins._request_info.side_effect = return_arg
 
         jobs_builds = self.jenkins.get_jobs(True)
         jobs = self.jenkins.get_jobs(False)
         self.assertEqual(jobs_builds, self.jenkins.jobs_builds_query)
         self.assertEqual(jobs, self.jenkins.jobs_query)
 
+    def test_get_jobs_cached(self):
+        """
+            Tests that :meth:`Jenkins.get_jobs` only reaches the host once
+            while its response is on the cache.
+        """
+        self.jenkins._request_info = Mock()
+        self.jenkins._request_info.side_effect = return_arg
+
+        self.jenkins.get_jobs(True)
+        jobs = self.jenkins.get_jobs(True)
+
+        self.assertEqual(jobs, self.jenkins.jobs_builds_query)
+        self.jenkins._request_info.assert_called_once()
+
+        self.jenkins.cache.refresh = True
+        self.jenkins.get_jobs(True)
+
+        self.assertEqual(2, self.jenkins._request_info.call_count)
+
+    def test_get_jobs_not_modified(self):
+        """
+            Tests that :meth:`Jenkins.get_jobs` sends the validators of an
+            expired response and reuses it if the host says it has not
+            changed.
+        """
+        self.jenkins._request_info = Mock()
+        self.jenkins._request_info.return_value = json_response(
+            {"jobs": ["job1"]}, headers={"ETag": '"v1"'})
+
+        self.jenkins.cache.ttl = -1
+        self.jenkins.get_jobs(False)
+
+        self.jenkins._request_info.return_value = json_response(
+            None, status=304)
+        jobs = self.jenkins.get_jobs(False)
+
+        self.assertEqual(["job1"], jobs)
+        self.jenkins._request_info.assert_called_with(
+            "", self.jenkins.jobs_query, {"If-None-Match": '"v1"'})
+
+    def test_get_jobs_incremental(self):
+        """
+            Tests that :meth:`Jenkins.get_jobs` only asks for the builds
+            that are not yet on the history when working incrementally.
+        """
+        self.jenkins.cache.enabled = False
+        self.jenkins.history = BuildHistory("url", self.cache_dir)
+
+        builds = [{"number": number, "result": "SUCCESS"}
+                  for number in range(150, 0, -1)]
+
+        def get_info(item, query):
+            return {"jobs": [{"_class": "job", "name": "job1", "url": "url1",
+                              "lastBuild": {"number": len(builds)},
+                              **jenkins_builds(builds, query)}]}
+
+        self.jenkins.client.get_info = Mock(side_effect=get_info)
+
+        # First run, all builds are fetched
+        jobs = self.jenkins.get_jobs(True)
+        self.assertEqual(150, len(jobs[0]['builds']))
+        self.jenkins.client.get_info.assert_called_with(
+            item="", query=self.jenkins.jobs_all_builds_query)
+
+        # Second run, only the new builds are fetched
+        builds[:0] = [{"number": number, "result": "SUCCESS"}
+                      for number in range(270, 150, -1)]
+        jobs = self.jenkins.get_jobs(True)
+        self.assertEqual(list(range(270, 0, -1)),
+                         [build['number'] for build in jobs[0]['builds']])
+        self.jenkins.client.get_info.assert_called_with(
+            item="", query=self.jenkins.jobs_last_builds_query.format(120))
+
+    def test_get_jobs_incremental_unknown_job(self):
+        """
+            Tests that :meth:`Jenkins.get_jobs` only asks for the whole
+            history of the jobs not yet on the history, and forgets about
+            the jobs and builds that are no longer on the server.
+        """
+        self.jenkins.cache.enabled = False
+        self.jenkins.history = BuildHistory("url", self.cache_dir)
+        self.jenkins.history.merge("url1", [{"number": 1, "result": "FAIL"},
+                                            {"number": 2, "result": "PASS"}])
+        self.jenkins.history.merge("url3", [{"number": 1, "result": "PASS"}])
+
+        responses = {
+            self.jenkins.jobs_last_build_query: [
+                {"_class": "job", "name": "job1", "url": "url1",
+                 "lastBuild": {"number": 3}, "firstBuild": {"number": 2}},
+                {"_class": "job", "name": "job2", "url": "url2",
+                 "lastBuild": {"number": 1}, "firstBuild": {"number": 1}}],
+            self.jenkins.jobs_last_builds_query.format(1): [
+                {"_class": "job", "name": "job1", "url": "url1",
+                 "allBuilds": [{"number": 3, "result": "PASS"}]},
+                {"_class": "job", "name": "job2", "url": "url2",
+                 "allBuilds": [{"number": 1, "result": "PASS"}]}]
+        }
+        self.jenkins.client.get_info = Mock()
+        self.jenkins.client.get_info.side_effect = \
+            lambda item, query: {"jobs": responses[query]}
+        self.jenkins.get_job_builds = Mock()
+        self.jenkins.get_job_builds.return_value = [
+            {"number": 1, "result": "PASS"}]
+
+        jobs = self.jenkins.get_jobs(True)
+
+        self.assertEqual([3, 2],
+                         [build['number'] for build in jobs[0]['builds']])
+        self.assertEqual([1],
+                         [build['number'] for build in jobs[1]['builds']])
+        self.jenkins.get_job_builds.assert_called_once_with(jobs[1])
+        self.assertIsNone(self.jenkins.history.last_seen("url3"))
+
+    def test_get_job_builds_whole_history(self):
+        """
+            Tests that :meth:`Jenkins.get_job_builds` gets the whole history
+            of a job, past the newest 100 builds Jenkins gives out as
+            'builds'.
+        """
+        self.jenkins.cache.enabled = False
+        history = [{"number": number, "result": "SUCCESS"}
+                   for number in range(250, 0, -1)]
+        self.jenkins._request_info = Mock(
+            side_effect=lambda item, query, headers: json_response(
+                jenkins_builds(history, query)))
+
+        builds = self.jenkins.get_job_builds(
+            {"name": "job1", "url": "url/job/job1/"})
+
+        self.assertEqual(history, builds)
+        self.jenkins._request_info.assert_called_once_with(
+            "job/job1", self.jenkins.job_builds_query, {})
+
+    def test_get_jobs_builds_limit(self):
+        """
+            Tests that :meth:`Jenkins.get_jobs` asks for a bounded range of
+            builds when given a limit.
+        """
+        self.jenkins._request_info = Mock()
+        self.jenkins._request_info.side_effect = return_arg
+
+        jobs = self.jenkins.get_jobs(True, "", 5)
+
+        self.assertEqual(jobs, self.jenkins.jobs_last_builds_query.format(5))
+
+    def test_get_jobs_builds_since(self):
+        """
+            Tests that :meth:`Jenkins.get_jobs` goes through pages of builds
+            until it finds builds older than the requested time.
+        """
+        self.jenkins.cache.enabled = False
+        self.jenkins.builds_page_size = 2
+
+        def build(number, timestamp):
+            return {"number": number, "result": "SUCCESS",
+                    "timestamp": timestamp}
+
+        history = {
+            "url1": [build(5, 500), build(4, 400), build(3, 300),
+                     build(2, 200), build(1, 100)],
+            "url2": [build(1, 500)]
+        }
+
+        def get_page(item, query):  # pylint: disable=unused-argument
+            return {"jobs": [
+                {"_class": "job", "name": url, "url": url,
+                 **jenkins_builds(builds, query)}
+                for url, builds in history.items()]}
+
+        self.jenkins.client.get_info = Mock()
+        self.jenkins.client.get_info.side_effect = get_page
+
+        jobs = self.jenkins.get_jobs(True, "", None, 250)
+
+        self.assertEqual(2, self.jenkins.client.get_info.call_count)
+        self.assertEqual([5, 4, 3],
+                         [build["number"] for build in jobs[0]["builds"]])
+        self.assertEqual([1],
+                         [build["number"] for build in jobs[1]["builds"]])
+
+        jobs = self.jenkins.get_jobs(True, "", 2, 250)
+
+        self.assertEqual([5, 4],
+                         [build["number"] for build in jobs[0]["builds"]])
+
+    def test_get_jobs_builds_since_past_cap(self):
+        """
+            Tests that :meth:`Jenkins.get_jobs` gets the builds past the
+            newest 100, which is all Jenkins gives out as 'builds'.
+        """
+        self.jenkins.cache.enabled = False
+        history = [{"number": number, "result": "SUCCESS",
+                    "timestamp": number}
+                   for number in range(250, 0, -1)]
+        self.jenkins.client.get_info = Mock(
+            side_effect=lambda item, query: {"jobs": [
+                {"_class": "job", "name": "job1", "url": "url1",
+                 **jenkins_builds(history, query)}]})
+
+        jobs = self.jenkins.get_jobs(True, "", None, 51)
+
+        self.assertEqual(list(range(250, 50, -1)),
+                         [build["number"] for build in jobs[0]["builds"]])
+
+    def test_get_jobs_builds_since_recursive(self):
+        """
+            Tests that :meth:`Jenkins.get_jobs` asks for the builds of the
+            jobs inside folders in the same pages when recursive.
+        """
+        folder_class = "com.cloudbees.hudson.plugins.folder.Folder"
+        self.jenkins.cache.enabled = False
+        self.jenkins.recursive = True
+        self.jenkins.folder_depth = 1
+        self.jenkins.client.get_info = Mock(return_value={"jobs": [
+            {"_class": folder_class, "name": "a", "url": "url/job/a/",
+             "fullName": "a", "jobs": [
+                 {"_class": "job", "name": "main",
+                  "url": "url/job/a/job/main/", "fullName": "a/main",
+                  "builds": [{"number": 1, "timestamp": 500}]},
+                 {"_class": folder_class, "name": "b",
+                  "url": "url/job/a/job/b/", "fullName": "a/b"}]}]})
+
+        jobs = self.jenkins.get_jobs(True, "", None, 250)
+
+        self.assertEqual(["a/main", "a/b"],
+                         [job["fullName"] for job in jobs])
+        self.assertEqual([1], [build["number"] for build in jobs[0]["builds"]])
+        self.jenkins.client.get_info.assert_called_once_with(
+            item="",
+            query=deepen_jobs_query(
+                self.jenkins.jobs_builds_page_query.format(0, 100), 1))
+
+    def test_get_jobs_incremental_recursive(self):
+        """
+            Tests that :meth:`Jenkins.get_jobs` keeps the history of the
+            jobs inside folders when recursive, handing over the folders
+            that came without their jobs.
+        """
+        folder_class = "com.cloudbees.hudson.plugins.folder.Folder"
+        self.jenkins.cache.enabled = False
+        self.jenkins.recursive = True
+        self.jenkins.folder_depth = 1
+        self.jenkins.history = BuildHistory("url", self.cache_dir)
+        self.jenkins.history.merge("url/job/a/job/main/",
+                                   [{"number": 1, "result": "PASS"}])
+        self.jenkins.history.merge("url/job/a/job/gone/",
+                                   [{"number": 1, "result": "PASS"}])
+
+        def folder(builds):
+            return [{"_class": folder_class, "name": "a", "url": "url/job/a/",
+                     "fullName": "a", "jobs": [
+                         {"_class": "job", "name": "main",
+                          "url": "url/job/a/job/main/", "fullName": "a/main",
+                          "lastBuild": {"number": 2}, **builds},
+                         {"_class": folder_class, "name": "b",
+                          "url": "url/job/a/job/b/", "fullName": "a/b"}]}]
+
+        responses = {
+            deepen_jobs_query(self.jenkins.jobs_last_build_query, 1):
+                folder({}),
+            deepen_jobs_query(self.jenkins.jobs_last_builds_query.format(1),
+                              1):
+                folder({"allBuilds": [{"number": 2, "result": "PASS"}]})
+        }
+        self.jenkins.client.get_info = Mock(
+            side_effect=lambda item, query: {"jobs": responses[query]})
+
+        jobs = self.jenkins.get_jobs(True)
+
+        self.assertEqual(["a/main", "a/b"],
+                         [job["fullName"] for job in jobs])
+        self.assertEqual([2, 1],
+                         [build["number"] for build in jobs[0]["builds"]])
+        self.assertIsNone(
+            self.jenkins.history.last_seen("url/job/a/job/gone/"))
+
+    def test_populate_jobs_builds_bounds(self):
+        """
+            Tests that :meth:`Jenkins.populate_jobs` leaves out builds past
+            the limit or too old.
+        """
+        jobs = [{"_class": "job", "name": "job1", "url": "url1",
+                 "builds": [
+                     {"number": 3, "result": "SUCCESS", "timestamp": 300},
+                     {"number": 2, "result": "SUCCESS", "timestamp": 200},
+                     {"number": 1, "result": "FAILURE", "timestamp": 100}]}]
+
+        system = System("test_system", "test")
+        self.jenkins.populate_jobs(system, jobs, 1, 150)
+
+        builds = system.jobs.value[0].builds.value
+        self.assertEqual(["3"], [build.build_id.value for build in builds])
+
+        system = System("test_system", "test")
+        self.jenkins.populate_jobs(system, jobs, None, 150)
+
+        builds = system.jobs.value[0].builds.value
+        self.assertEqual(["3", "2"],
+                         [build.build_id.value for build in builds])
+
+    def test_stream_jobs(self):
+        """
+            Tests that :meth:`Jenkins.stream_jobs` decodes the jobs out of
+            the response's chunks.
+        """
+        response = MagicMock()
+        response.__enter__.return_value = response
+        response.iter_content.return_value = [
+            b'{"_class": "hudson", "jobs": [{"_class": "job", "na',
+            b'me": "job1", "url": "url1"}, {"_class": "job", "name": "job2"',
+            b', "url": "url2"}]}']
+
+        self.jenkins._open_stream = Mock()
+        self.jenkins._open_stream.return_value = response
+
+        system = System("test_system", "test")
+        self.jenkins.populate_jobs(system, self.jenkins.stream_jobs(False))
+
+        self.jenkins._open_stream.assert_called_once_with(
+            "", self.jenkins.jobs_query)
+        self.assertEqual(2, len(system.jobs.value))
+        self.assertEqual("job2", system.jobs.value[1].name.value)
+        self.assertEqual("url2", system.jobs.value[1].url.value)
+
+    def test_query_stream_builds_since(self):
+        """
+            Tests that :meth:`Jenkins.query` leaves out builds too old when
+            streaming the jobs, as their start time is asked for.
+        """
+        response = MagicMock()
+        response.__enter__.return_value = response
+        response.iter_content.return_value = [json.dumps({"jobs": [
+            {"_class": "job", "name": "job1", "url": "url1", "builds": [
+                {"number": 2, "result": "SUCCESS", "timestamp": 200},
+                {"number": 1, "result": "FAILURE", "timestamp": 100}]}]
+        }).encode()]
+
+        self.jenkins._open_stream = Mock()
+        self.jenkins._open_stream.return_value = response
+        self.jenkins.stream = True
+
+        system = System("test_system", "test")
+        args = {"jobs": Argument(name="jobs", arg_type=str, description=""),
+                "builds_since": Argument(name="builds_since", arg_type=int,
+                                         description="", value=150)}
+
+        self.jenkins.query(system, args)
+
+        _, query = self.jenkins._open_stream.call_args.args
+        self.assertIn("timestamp", query)
+        builds = system.jobs.value[0].builds.value
+        self.assertEqual(["2"], [build.build_id.value for build in builds])
+
+    def test_query_filters_jobs(self):
+        """
+            Tests that :meth:`Jenkins.query` asks for the folder in the
+            system's scope and only models the jobs that match.
+        """
+        self.jenkins._request_info = Mock()
+        self.jenkins._request_info.return_value = json_response({"jobs": [
+            {"_class": "job", "name": "job1", "url": "url1"},
+            {"_class": "job", "name": "job2", "url": "url2"},
+            {"_class": "job", "name": "other", "url": "url3"}]})
+
+        system = System("test_system", "test", jobs_scope="folder/job*")
+        args = {"job_name": Argument(name="job_name", arg_type=str,
+                                     description="", value=["2$"])}
+
+        self.jenkins.query(system, args)
+
+        self.jenkins._request_info.assert_called_once_with(
+            "job/folder", self.jenkins.jobs_query, {})
+        self.assertEqual(1, len(system.jobs.value))
+        self.assertEqual("job2", system.jobs.value[0].name.value)
+
+    def test_query_lazy_builds(self):
+        """
+            Tests that :meth:`Jenkins.query` leaves the builds of the jobs to
+            be fetched when they are first looked at, if asked to.
+        """
+        histories = {
+            "job/job1": [{"number": 2, "result": "SUCCESS",
+                          "timestamp": 2000},
+                         {"number": 1, "result": "FAILURE",
+                          "timestamp": 1000}],
+            "job/job2": []
+        }
+        jobs = [{"_class": "job", "name": "job1", "url": "url/job/job1/"},
+                {"_class": "job", "name": "job2", "url": "url/job/job2/"}]
+        self.jenkins._request_info = Mock(
+            side_effect=lambda item, query, headers: json_response(
+                jenkins_builds(histories[item], query) if item
+                else {"jobs": jobs}))
+        self.jenkins.lazy_builds = True
+
+        system = System("test_system", "test")
+        args = {"jobs": Argument(name="jobs", arg_type=str, description=""),
+                "builds_since": Argument(name="builds_since", arg_type=int,
+                                         description="", value=[1500])}
+
+        self.jenkins.query(system, args)
+
+        self.jenkins._request_info.assert_called_once_with(
+            "", self.jenkins.jobs_query, {})
+        self.assertEqual(2, len(system.jobs.value))
+
+        builds = system.jobs.value[0].builds.value
+        self.assertEqual(["2"], [build.build_id.value for build in builds])
+        self.assertEqual(3, self.jenkins._request_info.call_count)
+        self.jenkins._request_info.assert_any_call(
+            "job/job1", self.jenkins.job_builds_query, {})
+        self.assertTrue(system.jobs.value[1].is_loaded("builds"))
+        self.assertEqual([], system.jobs.value[1].builds.value)
+
+    def test_query_lazy_builds_not_asked(self):
+        """
+            Tests that :meth:`Jenkins.query` leaves the builds of the jobs
+            alone if they are not asked for, even if they are to be fetched
+            lazily.
+        """
+        self.jenkins._request_info = Mock(
+            return_value=json_response({"jobs": [
+                {"_class": "job", "name": "job1", "url": "url/job/job1/"}]}))
+        self.jenkins.client.get_info = Mock()
+        self.jenkins.lazy_builds = True
+
+        system = System("test_system", "test")
+        args = {"jobs": Argument(name="jobs", arg_type=str, description="")}
+
+        self.jenkins.query(system, args)
+        lines = list(system.jobs.value[0].iter_lines())
+
+        self.assertEqual(["Job: job1", "  URL: url/job/job1/"], lines)
+        self.jenkins._request_info.assert_called_once_with(
+            "", self.jenkins.jobs_query, {})
+        self.jenkins.client.get_info.assert_not_called()
+
+    def test_query_recursive(self):
+        """
+            Tests that :meth:`Jenkins.query` looks inside the folders in
+            scope when the source is recursive.
+        """
+        folder_class = "com.cloudbees.hudson.plugins.folder.Folder"
+        infos = {
+            "": {"jobs": [
+                {"_class": "job", "name": "job1", "url": "url1",
+                 "fullName": "job1"},
+                {"_class": folder_class, "name": "folder", "url": "url2",
+                 "fullName": "folder"}]},
+            "job/folder": {"jobs": [
+                {"_class": "job", "name": "job2", "url": "url3",
+                 "fullName": "folder/job2"}]}
+        }
+        self.jenkins.recursive = True
+        self.jenkins._request_info = Mock(
+            side_effect=lambda item, query, headers: json_response(
+                infos[item]))
+
+        system = System("test_system", "test")
+        args = {"jobs": Argument(name="jobs", arg_type=str,
+                                 description="")}
+
+        self.jenkins.query(system, args)
+
+        self.jenkins._request_info.assert_called_with(
+            "job/folder", "?tree=jobs[name,url,fullName]", {})
+        self.assertEqual(["job1", "folder/job2"],
+                         [job.name.value for job in system.jobs.value])
+
+    def test_query_recursive_same_names(self):
+        """
+            Tests that :meth:`Jenkins.query` keeps apart the jobs of the same
+            name found in different folders.
+        """
+        folder_class = "com.cloudbees.hudson.plugins.folder.Folder"
+        branch_class = "org.jenkinsci.plugins.workflow.job.WorkflowJob"
+        infos = {
+            "": {"jobs": [
+                {"_class": folder_class, "name": name,
+                 "url": f"url/job/{name}/", "fullName": name,
+                 "jobs": [{"_class": branch_class, "name": "main",
+                           "url": f"url/job/{name}/job/main/",
+                           "fullName": f"{name}/main"}]}
+                for name in ("a", "b")]}
+        }
+        self.jenkins.recursive = True
+        self.jenkins.folder_depth = 1
+        self.jenkins._request_info = Mock(
+            side_effect=lambda item, query, headers: json_response(
+                infos[item]))
+
+        system = System("test_system", "test")
+        args = {"jobs": Argument(name="jobs", arg_type=str,
+                                 description="")}
+
+        self.jenkins.query(system, args)
+
+        self.assertEqual(["a/main", "b/main"],
+                         [job.name.value for job in system.jobs.value])
+        self.assertEqual(["url/job/a/job/main/", "url/job/b/job/main/"],
+                         [job.url.value for job in system.jobs.value])
+
     def test_populate_jobs_without_builds(self):
         """
             Tests that the jenkins info is correctly parsed and job models are
@@ -166,6 +810,29 @@ class TestJenkinsSource(TestCase):
         self.assertEqual("2", job2.builds.value[0].build_id.value)
         self.assertEqual("SUCCESS", job2.builds.value[0].status.value)
 
+    def test_populate_jobs_columnar(self):
+        """
+            Tests that builds are added to the columns of their jobs if the
+            source is asked to.
+        """
+        jobs = [{'_class': 'org.jenkinsci.plugins.workflow.job.WorkflowJob',
+                 'name': 'job1', 'url': 'url1',
+                 'builds': [{'number': 13, 'result': 'FAILURE',
+                             'timestamp': 2000},
+                            {'number': 10, 'result': 'SUCCESS',
+                             'timestamp': 1000}]}]
+        self.jenkins.columnar_builds = True
+
+        system = System("test_system", "test")
+        self.jenkins.populate_jobs(system, jobs)
+
+        builds = system.jobs.value[0].builds
+        self.assertIsInstance(builds, BuildColumns)
+        self.assertEqual(["13", "10"],
+                         [build.build_id.value for build in builds])
+        self.assertEqual(2000, builds.get_timestamp(0))
+        self.assertEqual(0.5, builds.pass_rate())
+
 
 class TestJenkinsOSPSource(TestCase):
     """Tests for :class:`Jenkins`.
@@ -0,0 +1,300 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+# pylint: disable=no-member
+import asyncio
+import json
+from shutil import rmtree
+from tempfile import mkdtemp
+from threading import current_thread
+from unittest import TestCase
+from unittest.mock import Mock
+
+import aiohttp
+
+from cibyl.cli.argument import Argument
+from cibyl.exceptions.jenkins import JenkinsError
+from cibyl.models.ci.system import System
+from cibyl.sources.cache import ResponseCache
+from cibyl.sources.circuit_breaker import CircuitBreaker
+from cibyl.sources.jenkins_async import AsyncJenkins
+from cibyl.sources.source import RetryPolicy
+from tests.sources.responses import jenkins_builds
+
+
+class FakeResponse:
+    """Answer of :class:`FakeSession`, which keeps count of the requests
+    in flight.
+    """
+
+    def __init__(self, session, url):
+        self.session = session
+        self.url = url
+
+    async def __aenter__(self):
+        self.session.in_flight += 1
+        self.session.max_in_flight = max(self.session.max_in_flight,
+                                         self.session.in_flight)
+        # Give other requests the chance to start
+        await asyncio.sleep(0.01)
+        return self
+
+    async def __aexit__(self, *_):
+        self.session.in_flight -= 1
+
+    async def read(self):
+        """Body of the answer."""
+        answer = self.session.answers[self.url]
+        if isinstance(answer, Exception):
+            raise answer
+        return json.dumps(answer).encode()
+
+
+class FakeSession:
+    """Stands for :class:`aiohttp.ClientSession`, answering with fixed
+    documents.
+    """
+
+    def __init__(self, answers):
+        self.answers = answers
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_):
+        pass
+
+    def get(self, url):
+        """Sends a request."""
+        self.requests.append(url)
+        return FakeResponse(self, url)
+
+
+class TestAsyncJenkins(TestCase):
+    """Tests for :class:`AsyncJenkins`."""
+
+    def setUp(self):
+        self.directory = mkdtemp()
+        self.jenkins = AsyncJenkins("http://jenkins", "user", "token",
+                                    max_requests_per_host=2)
+        self.jenkins.cache = ResponseCache(path=self.directory)
+        self.jenkins.retry_policy = RetryPolicy(attempts=1)
+        self.jenkins.circuit_breaker = CircuitBreaker()
+
+        self.jobs = [
+            {'_class': 'job', 'name': f'job{i}',
+             'url': f'http://jenkins/job/job{i}/'}
+            for i in range(5)
+        ]
+        self.answers = {
+            'http://jenkins/api/json?tree=jobs[name,url]': {
+                'jobs': self.jobs + [{'_class': 'folder', 'name': 'folder',
+                                      'url': 'http://jenkins/job/folder/'}]
+            }
+        }
+        for i in range(5):
+            self.answers[
+                f'http://jenkins/job/job{i}/api/json'
+                '?tree=allBuilds[number,result,timestamp]'
+            ] = {'allBuilds': [{'number': i, 'result': 'SUCCESS'}]}
+
+        self.session = FakeSession(self.answers)
+        self.jenkins.open_session = Mock(return_value=self.session)
+
+    def tearDown(self):
+        rmtree(self.directory, ignore_errors=True)
+
+    def test_get_jobs(self):
+        """
+            Tests that jobs are listed without asking for their builds if not
+            requested, and that folders are left out.
+        """
+        jobs = asyncio.run(self.jenkins.get_jobs(self.session, False))
+
+        self.assertEqual(self.jobs, jobs)
+        self.assertEqual(1, len(self.session.requests))
+
+    def test_get_jobs_builds(self):
+        """
+            Tests that the builds of the jobs that passed the filters are
+            fetched, and that no more requests than allowed are in flight at
+            the same time.
+        """
+        jobs = asyncio.run(self.jenkins.get_jobs(
+            self.session, True, "", None, "job*", ["[0-3]"]))
+
+        self.assertEqual(['job0', 'job1', 'job2', 'job3'],
+                         [job['name'] for job in jobs])
+        self.assertEqual([{'number': 2, 'result': 'SUCCESS'}],
+                         jobs[2]['builds'])
+        self.assertEqual(5, len(self.session.requests))
+        self.assertEqual(2, self.session.max_in_flight)
+
+    def test_get_jobs_builds_limit(self):
+        """
+            Tests that the number of builds asked for is limited if
+            requested.
+        """
+        self.answers[
+            'http://jenkins/job/job0/api/json'
+            '?tree=allBuilds[number,result,timestamp]{0,3}'
+        ] = {'allBuilds': []}
+
+        jobs = asyncio.run(self.jenkins.get_jobs(
+            self.session, True, "", 3, "job0"))
+
+        self.assertEqual([], jobs[0]['builds'])
+
+    def test_get_jobs_builds_since(self):
+        """
+            Tests that builds are asked for page by page until one of them
+            started before the requested time.
+        """
+        self.jenkins.builds_page_size = 2
+        url = 'http://jenkins/job/job0/api/json' \
+            '?tree=allBuilds[number,result,timestamp]'
+        self.answers[f'{url}{{0,2}}'] = {'allBuilds': [
+            {'number': 4, 'result': 'SUCCESS', 'timestamp': 400},
+            {'number': 3, 'result': 'SUCCESS', 'timestamp': 300}
+        ]}
+        self.answers[f'{url}{{2,4}}'] = {'allBuilds': [
+            {'number': 2, 'result': 'SUCCESS', 'timestamp': 200},
+            {'number': 1, 'result': 'SUCCESS', 'timestamp': 100}
+        ]}
+
+        jobs = asyncio.run(self.jenkins.get_jobs(
+            self.session, True, "", None, "job0", None, 200))
+
+        self.assertEqual([4, 3, 2],
+                         [build['number'] for build in jobs[0]['builds']])
+        self.assertEqual(3, len(self.session.requests))
+
+    def test_get_jobs_builds_since_past_cap(self):
+        """
+            Tests that builds past the newest 100, which is all Jenkins gives
+            out as 'builds', are paged through.
+        """
+        history = [{'number': number, 'result': 'SUCCESS',
+                    'timestamp': number}
+                   for number in range(250, 0, -1)]
+        url = 'http://jenkins/job/job0/api/json' \
+            '?tree=allBuilds[number,result,timestamp]'
+        for start in range(0, 300, 100):
+            query = f'{url}{{{start},{start + 100}}}'
+            self.answers[query] = jenkins_builds(history, query)
+
+        jobs = asyncio.run(self.jenkins.get_jobs(
+            self.session, True, "", None, "job0", None, 51))
+
+        self.assertEqual(list(range(250, 50, -1)),
+                         [build['number'] for build in jobs[0]['builds']])
+
+    def test_get_jobs_recursive(self):
+        """
+            Tests that jobs inside folders are found if the source is
+            recursive.
+        """
+        self.jenkins.recursive = True
+        self.jenkins.folder_depth = 1
+        query = "?tree=jobs[name,url,fullName,jobs[name,url,fullName]]"
+        folder_class = "com.cloudbees.hudson.plugins.folder.Folder"
+        self.answers[f'http://jenkins/api/json{query}'] = {'jobs': [
+            {'_class': folder_class, 'name': 'a', 'fullName': 'a', 'jobs': [
+                {'_class': 'job', 'name': 'job1', 'fullName': 'a/job1'},
+                {'_class': folder_class, 'name': 'b', 'fullName': 'a/b'}]}]}
+        self.answers[f'http://jenkins/job/a/job/b/api/json{query}'] = {
+            'jobs': [{'_class': 'job', 'name': 'job2', 'fullName': 'a/b/job2'},
+                     {'_class': 'job', 'name': 'job1', 'fullName': 'a/job1'}]}
+
+        jobs = asyncio.run(self.jenkins.get_jobs(self.session, False))
+
+        self.assertEqual(['a/job1', 'a/b/job2'],
+                         [job['fullName'] for job in jobs])
+        self.assertEqual(2, len(self.session.requests))
+
+    def test_get_jobs_item(self):
+        """
+            Tests that jobs are listed from the item given.
+        """
+        url = 'http://jenkins/job/folder/api/json?tree=jobs[name,url]'
+        self.answers[url] = {'jobs': []}
+
+        jobs = asyncio.run(self.jenkins.get_jobs(
+            self.session, False, "job/folder"))
+
+        self.assertEqual([], jobs)
+
+    def test_get_info_cached(self):
+        """
+            Tests that answers are reused from the cache.
+        """
+        asyncio.run(self.jenkins.get_jobs(self.session, True))
+        asyncio.run(self.jenkins.get_jobs(self.session, True))
+
+        self.assertEqual(6, len(self.session.requests))
+
+    def test_get_info_cache_off_loop(self):
+        """
+            Tests that the cache, which is on disk, is not used from the
+            thread running the event loop.
+        """
+        threads = []
+        cache = self.jenkins.cache
+        self.jenkins.cache = Mock()
+        self.jenkins.cache.get.side_effect = \
+            lambda *args: threads.append(current_thread()) or cache.get(*args)
+        self.jenkins.cache.put.side_effect = \
+            lambda *args: threads.append(current_thread()) or cache.put(*args)
+
+        asyncio.run(self.jenkins.get_jobs(self.session, False))
+
+        self.assertEqual(2, len(threads))
+        self.assertNotIn(current_thread(), threads)
+
+    def test_get_info_connection_error(self):
+        """
+            Tests that connection errors are wrapped as JenkinsError, retried
+            as such.
+        """
+        url = 'http://jenkins/api/json?tree=jobs[name,url]'
+        self.answers[url] = aiohttp.ClientConnectionError("refused")
+        self.jenkins.retry_policy = RetryPolicy(attempts=2, backoff=0,
+                                                jitter=0)
+
+        with self.assertRaises(JenkinsError) as context:
+            asyncio.run(self.jenkins.get_info(self.session, url))
+
+        self.assertIsInstance(context.exception.__cause__, ConnectionError)
+        self.assertEqual(2, len(self.session.requests))
+
+    def test_query(self):
+        """
+            Tests that the query fills the system up with the jobs and their
+            builds.
+        """
+        system = System("test_system", "test", jobs_scope="job[12]")
+        args = {"jobs": Argument(name="jobs", arg_type=str, description=""),
+                "builds": Argument(name="builds", arg_type=str,
+                                   description="", value=[""])}
+
+        self.jenkins.query(system, args)
+
+        self.assertEqual(['job1', 'job2'],
+                         [job.name.value for job in system.jobs.value])
+        builds = system.jobs.value[0].builds.value
+        self.assertEqual(["1"], [build.build_id.value for build in builds])
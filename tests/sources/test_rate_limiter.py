@@ -0,0 +1,50 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+from unittest import TestCase
+from unittest.mock import patch
+
+from cibyl.sources.rate_limiter import RateLimiter
+
+
+class TestRateLimiter(TestCase):
+    """Tests for :class:`RateLimiter`.
+    """
+
+    @patch('cibyl.sources.rate_limiter.time')
+    def test_acquire(self, time):
+        """Checks that requests past the burst wait for their turn.
+        """
+        now = [100.0]
+        time.monotonic.side_effect = lambda: now[0]
+
+        def sleep(seconds):
+            now[0] += seconds
+
+        time.sleep.side_effect = sleep
+
+        limiter = RateLimiter(rate=2, burst=2)
+
+        limiter.acquire()
+        limiter.acquire()
+        time.sleep.assert_not_called()
+
+        limiter.acquire()
+        time.sleep.assert_called_once_with(0.5)
+
+        now[0] += 10
+        limiter.acquire()
+        limiter.acquire()
+        self.assertEqual(1, time.sleep.call_count)
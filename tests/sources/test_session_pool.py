@@ -0,0 +1,91 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+from unittest import TestCase
+
+from requests import Response
+
+from cibyl.sources.session_pool import SessionPool, record_size
+from cibyl.sources.timings import REQUEST_TIMINGS
+
+
+class TestSessionPool(TestCase):
+    """Tests for :class:`SessionPool`.
+    """
+
+    def setUp(self):
+        self.pool = SessionPool()
+
+    def test_same_host_shares_session(self):
+        """Checks that URLs on the same host get the same session.
+        """
+        session1 = self.pool.get_session('https://host/jenkins1/', 'cert')
+        session2 = self.pool.get_session('https://host/jenkins2/', 'cert')
+
+        self.assertIs(session1, session2)
+        self.assertEqual(1, len(self.pool))
+
+    def test_different_keys_get_different_sessions(self):
+        """Checks that hosts, certificates and credentials all make for
+        different sessions.
+        """
+        session = self.pool.get_session('https://host/', 'cert', 'user')
+
+        self.assertIsNot(
+            session, self.pool.get_session('https://other/', 'cert', 'user'))
+        self.assertIsNot(
+            session, self.pool.get_session('https://host/', None, 'user'))
+        self.assertIsNot(
+            session, self.pool.get_session('https://host/', 'cert', 'other'))
+
+    def test_session_settings(self):
+        """Checks that sessions are built following the pool's settings.
+        """
+        self.pool.configure(pool_size=3, keep_alive=False)
+
+        session = self.pool.get_session('https://host/', 'path/to/cert.pem')
+        adapter = session.get_adapter('https://host/')
+
+        self.assertEqual('path/to/cert.pem', session.verify)
+        # pylint: disable=protected-access
+        self.assertEqual(3, adapter._pool_maxsize)
+        self.assertEqual('close', session.headers['Connection'])
+
+    def test_close(self):
+        """Checks that closing the pool empties it.
+        """
+        self.pool.get_session('https://host/')
+        self.pool.close()
+
+        self.assertEqual(0, len(self.pool))
+
+
+class TestRecordSize(TestCase):
+    """Tests for :func:`record_size`.
+    """
+
+    def test_record_size(self):
+        """Checks that the size of responses is added to the call in
+        progress.
+        """
+        response = Response()
+        response._content = b'0123456789'  # pylint: disable=protected-access
+        response.headers['Content-Length'] = '100'
+
+        with REQUEST_TIMINGS.measure('host', 'test') as record:
+            record_size(response)
+            record_size(response, stream=True)
+
+        self.assertEqual(110, record.size)
@@ -0,0 +1,348 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+import asyncio
+from contextvars import copy_context
+from unittest import TestCase
+from unittest.mock import AsyncMock, Mock, patch
+
+from aiohttp import ClientResponseError
+from requests import HTTPError, Response
+from requests.exceptions import ConnectionError as RequestsConnectionError
+
+from cibyl.cli.argument import Argument
+from cibyl.sources.circuit_breaker import CircuitBreaker, CircuitOpenError
+from cibyl.sources.source import (RetryPolicy, Source, filter_jobs,
+                                  read_jobs_query, safe_request_generic)
+from cibyl.sources.timings import REQUEST_TIMINGS
+
+
+class CustomError(Exception):
+    """Error raised by the requests under test."""
+
+
+def http_error(status, headers=None):
+    """Builds an error as raised by requests for an HTTP status code.
+    """
+    response = Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    return HTTPError(response=response)
+
+
+class TestRetryPolicy(TestCase):
+    """Tests for :class:`RetryPolicy`.
+    """
+
+    def setUp(self):
+        self.policy = RetryPolicy(backoff=1, max_backoff=10, jitter=0)
+
+    def test_is_retryable(self):
+        """Checks which errors are worth retrying.
+        """
+        self.assertTrue(self.policy.is_retryable(http_error(502)))
+        self.assertTrue(self.policy.is_retryable(RequestsConnectionError()))
+        self.assertFalse(self.policy.is_retryable(http_error(404)))
+        self.assertFalse(self.policy.is_retryable(ValueError()))
+
+    def test_is_retryable_wrapped(self):
+        """Checks that the error that caused another one is looked into.
+        """
+        try:
+            try:
+                raise http_error(503)
+            except HTTPError as ex:
+                raise ValueError from ex
+        except ValueError as ex:
+            self.assertTrue(self.policy.is_retryable(ex))
+
+    def test_exponential_delay(self):
+        """Checks that the delay doubles on each attempt up to a maximum.
+        """
+        self.assertEqual(
+            [1, 2, 4, 8, 10, 10],
+            [self.policy.get_delay(attempt) for attempt in range(1, 7)])
+
+    def test_jitter(self):
+        """Checks that jitter adds up to the given fraction of the delay.
+        """
+        self.policy.jitter = 0.5
+
+        for _ in range(100):
+            self.assertTrue(1 <= self.policy.get_delay(1) <= 1.5)
+
+    def test_retry_after(self):
+        """Checks that the host's 'Retry-After' header is honored.
+        """
+        error = http_error(503, {'Retry-After': '7'})
+        self.assertEqual(7, self.policy.get_delay(1, error))
+
+        error = http_error(503, {'Retry-After': '300'})
+        self.assertEqual(10, self.policy.get_delay(1, error))
+
+        self.policy.retry_after = False
+        self.assertEqual(1, self.policy.get_delay(1, error))
+
+    def test_aiohttp_errors(self):
+        """Checks that errors raised by aiohttp are understood too.
+        """
+        error = ClientResponseError(Mock(), (), status=429,
+                                    headers={'Retry-After': '3'})
+        self.assertTrue(self.policy.is_retryable(error))
+        self.assertEqual(3, self.policy.get_delay(1, error))
+
+        self.assertTrue(self.policy.is_retryable(ConnectionError()))
+
+
+class TestReadJobsQuery(TestCase):
+    """Tests for :func:`read_jobs_query`.
+    """
+
+    def test_not_about_jobs(self):
+        """Checks that queries not on jobs are told apart.
+        """
+        self.assertIsNone(read_jobs_query({}))
+
+    def test_builds(self):
+        """Checks that the arguments on builds are read.
+        """
+        args = {
+            'job_name': Argument('job_name', str, '', value=['job']),
+            'builds_limit': Argument('builds_limit', int, '', value=[3]),
+            'builds_since': Argument('builds_since', int, '', value=100)
+        }
+
+        query = read_jobs_query(args)
+
+        self.assertEqual(['job'], query.job_names)
+        self.assertEqual(3, query.builds_limit)
+        self.assertEqual(100, query.builds_since)
+        self.assertTrue(query.get_builds)
+
+    def test_jobs(self):
+        """Checks that builds are not asked for unless requested.
+        """
+        query = read_jobs_query({'jobs': Argument('jobs', str, '')})
+
+        self.assertIsNone(query.job_names)
+        self.assertIsNone(query.builds_limit)
+        self.assertFalse(query.get_builds)
+
+
+class TestFilterJobs(TestCase):
+    """Tests for :func:`filter_jobs`.
+    """
+
+    def test_filter_jobs(self):
+        """Checks that jobs are filtered by scope and name.
+        """
+        jobs = [{"name": "tripleo-master"}, {"name": "tripleo-train"},
+                {"name": "other-master"}]
+
+        self.assertEqual(jobs, list(filter_jobs(jobs)))
+        self.assertEqual(
+            ["tripleo-master", "tripleo-train"],
+            [job["name"] for job in filter_jobs(jobs, "tripleo-*")])
+        self.assertEqual(
+            ["tripleo-master", "other-master"],
+            [job["name"] for job in filter_jobs(jobs, "*", ["master$"])])
+        self.assertEqual(
+            ["tripleo-master"],
+            [job["name"] for job in filter_jobs(jobs, "tripleo-*",
+                                                ["master"])])
+
+
+@patch('cibyl.sources.source.time.sleep')
+class TestSafeRequestRetries(TestCase):
+    """Tests for the retries of :func:`safe_request_generic`.
+    """
+
+    def setUp(self):
+        self.source = Source('source')
+        self.source.retry_policy = RetryPolicy(attempts=3, jitter=0)
+
+    def test_retries_until_success(self, sleep):
+        """Checks that failed calls are made again until they work.
+        """
+        call = Mock(side_effect=[http_error(502), http_error(503), 'result'])
+        request = safe_request_generic(call, CustomError)
+
+        self.assertEqual('result', request(self.source))
+        self.assertEqual(3, call.call_count)
+        self.assertEqual([((0.5,),), ((1.0,),)], sleep.call_args_list)
+        self.assertEqual(2, REQUEST_TIMINGS.records[-1].retries)
+
+    def test_gives_up_after_attempts(self, _):
+        """Checks that the error is raised once attempts run out.
+        """
+        call = Mock(side_effect=http_error(502))
+        request = safe_request_generic(call, CustomError)
+
+        self.assertRaises(CustomError, request, self.source)
+        self.assertEqual(3, call.call_count)
+
+    def test_no_retries_on_other_errors(self, sleep):
+        """Checks that errors that are not worth it are not retried.
+        """
+        call = Mock(side_effect=http_error(404))
+        request = safe_request_generic(call, CustomError)
+
+        self.assertRaises(CustomError, request, self.source)
+        self.assertEqual(1, call.call_count)
+        sleep.assert_not_called()
+
+    def test_generator_retried_before_first_item(self, _):
+        """Checks that generators are only retried if they gave nothing yet.
+        """
+        calls = []
+
+        def call(_):
+            calls.append(1)
+            if len(calls) == 1:
+                raise http_error(502)
+            yield 1
+            raise http_error(502)
+
+        request = safe_request_generic(call, CustomError)
+        items = request(self.source)
+
+        self.assertEqual(1, next(items))
+        self.assertRaises(CustomError, next, items)
+        self.assertEqual(2, len(calls))
+
+    def test_nested_not_retried(self, _):
+        """Checks that errors coming out of a nested call, which retried
+        them already, are not retried again.
+        """
+        inner = Mock(side_effect=http_error(502))
+        outer = Mock(side_effect=safe_request_generic(inner, CustomError))
+        request = safe_request_generic(outer, CustomError)
+
+        self.assertRaises(CustomError, request, self.source)
+        self.assertEqual(1, outer.call_count)
+        self.assertEqual(3, inner.call_count)
+
+    @patch('cibyl.sources.source.asyncio.sleep')
+    def test_coroutine_retries(self, async_sleep, sleep):
+        """Checks that coroutines are retried without blocking the loop.
+        """
+        async def call(*args):
+            return await mock(*args)
+
+        mock = AsyncMock(side_effect=[http_error(502), 'result'])
+        request = safe_request_generic(call, CustomError)
+
+        self.assertEqual('result', asyncio.run(request(self.source)))
+        self.assertEqual(2, mock.call_count)
+        async_sleep.assert_awaited_once_with(0.5)
+        sleep.assert_not_called()
+
+
+class TestSafeRequestCircuitBreaker(TestCase):
+    """Tests for the circuit breaker of :func:`safe_request_generic`.
+    """
+
+    def setUp(self):
+        self.source = Source('source', 'https://host/jenkins/')
+        self.source.retry_policy = RetryPolicy(attempts=1)
+        self.source.circuit_breaker = CircuitBreaker(min_requests=2)
+
+    def test_short_circuits_unhealthy_host(self):
+        """Checks that calls stop being made once the host is down.
+        """
+        call = Mock(side_effect=http_error(503))
+        request = safe_request_generic(call, CustomError)
+
+        self.assertRaises(CustomError, request, self.source)
+        self.assertRaises(CustomError, request, self.source)
+
+        with self.assertRaises(CustomError) as context:
+            request(self.source)
+
+        self.assertIsInstance(context.exception.__cause__, CircuitOpenError)
+        self.assertEqual(2, call.call_count)
+
+    def test_client_errors_do_not_count(self):
+        """Checks that errors not caused by the host's health are ignored.
+        """
+        call = Mock(side_effect=http_error(404))
+        request = safe_request_generic(call, CustomError)
+
+        for _ in range(3):
+            self.assertRaises(CustomError, request, self.source)
+
+        self.assertEqual(3, call.call_count)
+
+
+class TestSafeRequestTimings(TestCase):
+    """Tests for the timings recorded by :func:`safe_request_generic`.
+    """
+
+    def setUp(self):
+        self.source = Source('source', 'https://host/jenkins/')
+        self.source.circuit_breaker = CircuitBreaker()
+
+    @patch('cibyl.sources.timings.time.perf_counter')
+    def test_generator_leaves_out_consumer(self, perf_counter):
+        """Checks that the time spent on items by the caller of a generator
+        is not recorded.
+        """
+        def call(_):
+            yield from (1, 2)
+
+        perf_counter.side_effect = [0, 1, 10, 11, 20, 21]
+        request = safe_request_generic(call, CustomError)
+
+        self.assertEqual([1, 2], list(request(self.source)))
+
+        record = REQUEST_TIMINGS.records[-1]
+        self.assertEqual('call', record.endpoint)
+        self.assertEqual(3, record.latency)
+        self.assertFalse(record.failed)
+
+    def test_generator_closed_elsewhere(self):
+        """Checks that a generator left early, from another context, is
+        recorded and not taken as failed.
+        """
+        def call(_):
+            yield from (1, 2)
+
+        request = safe_request_generic(call, CustomError)
+        items = request(self.source)
+
+        self.assertEqual(1, next(items))
+        copy_context().run(items.close)
+
+        record = REQUEST_TIMINGS.records[-1]
+        self.assertEqual('call', record.endpoint)
+        self.assertFalse(record.failed)
+        self.assertIsNone(REQUEST_TIMINGS.current)
+
+    def test_nested_failure_counted_once(self):
+        """Checks that a failure coming out of a nested call is only counted
+        on it, both by the timings and the circuit breaker.
+        """
+        inner = safe_request_generic(Mock(side_effect=http_error(500)),
+                                     CustomError)
+        request = safe_request_generic(Mock(side_effect=inner), CustomError)
+        self.source.retry_policy = RetryPolicy(attempts=1)
+
+        with patch.object(self.source.circuit_breaker, 'record') as record:
+            self.assertRaises(CustomError, request, self.source)
+
+        record.assert_called_once_with('host', False)
+        records = REQUEST_TIMINGS.records[-2:]
+        self.assertEqual([True, False],
+                         [record.failed for record in records])
@@ -0,0 +1,75 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+from unittest import TestCase
+
+from cibyl.exceptions.config import InvalidConfiguration
+from cibyl.sources.jenkins import Jenkins, JenkinsOSP
+from cibyl.sources.source_factory import SourceFactory
+from cibyl.sources.zuul.source import Zuul
+
+
+class TestSourceFactory(TestCase):
+    """Tests for :class:`SourceFactory`.
+    """
+
+    def test_create_jenkins(self):
+        """Checks that a Jenkins source is built from its entry.
+        """
+        source = SourceFactory.create_source(
+            'jenkins1', 'jenkins', url='url/to/jenkins/',
+            username='user', token='token')
+
+        self.assertIsInstance(source, Jenkins)
+        self.assertEqual('jenkins1', source.name)
+        self.assertEqual('url/to/jenkins/', source.url)
+
+    def test_create_jenkins_osp(self):
+        """Checks that a Jenkins OSP source is built from its entry.
+        """
+        source = SourceFactory.create_source(
+            'osp', 'jenkins_osp', url='url/to/jenkins/',
+            username='user', token='token')
+
+        self.assertIsInstance(source, JenkinsOSP)
+
+    def test_create_zuul(self):
+        """Checks that a Zuul source is built from its entry, and that its
+        retry policy reaches its API.
+        """
+        source = SourceFactory.create_source(
+            'zuul1', 'zuul', url='https://host/zuul/', tenants=['openstack'],
+            retry={'attempts': 5})
+
+        self.assertIsInstance(source, Zuul)
+        self.assertEqual(['openstack'], source.tenants)
+        self.assertEqual(5, source.api.retry_policy.attempts)
+
+    def test_retry_policy(self):
+        """Checks that the retry policy is taken from the source's entry.
+        """
+        source = SourceFactory.create_source(
+            'jenkins1', 'jenkins', url='url/to/jenkins/',
+            username='user', token='token',
+            retry={'attempts': 5, 'statuses': [500]})
+
+        self.assertEqual(5, source.retry_policy.attempts)
+        self.assertEqual([500], source.retry_policy.statuses)
+
+    def test_unknown_driver(self):
+        """Checks that an error is raised for unknown drivers.
+        """
+        self.assertRaises(InvalidConfiguration,
+                          SourceFactory.create_source, 'src', 'unknown')
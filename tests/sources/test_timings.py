@@ -0,0 +1,127 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+import json
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from cibyl.sources.timings import RequestRecord, RequestTimings
+
+
+class TestRequestTimings(TestCase):
+    """Tests for :class:`RequestTimings`.
+    """
+
+    def setUp(self):
+        self.timings = RequestTimings()
+
+    def test_measure(self):
+        """Checks that calls are recorded together with their annotations.
+        """
+        with self.timings.measure('host', 'get_jobs') as record:
+            self.assertIs(record, self.timings.current)
+            self.timings.add_size(10)
+            self.timings.add_size(5)
+            self.timings.mark_cache_hit()
+
+        self.assertIsNone(self.timings.current)
+        self.assertEqual([record], self.timings.records)
+        self.assertEqual(15, record.size)
+        self.assertTrue(record.cache_hit)
+        self.assertFalse(record.failed)
+        self.assertGreaterEqual(record.latency, 0)
+
+    def test_measure_failure(self):
+        """Checks that calls ending in an error are marked as failed.
+        """
+        with self.assertRaises(ValueError):
+            with self.timings.measure('host', 'get_jobs'):
+                raise ValueError
+
+        self.assertTrue(self.timings.records[0].failed)
+
+    def test_measure_nested_failure(self):
+        """Checks that a failure coming out of a nested call is only counted
+        on it.
+        """
+        with self.assertRaises(ValueError):
+            with self.timings.measure('host', 'get_jobs'):
+                with self.timings.measure('host', 'get_builds'):
+                    raise ValueError
+
+        self.assertEqual([True, False],
+                         [record.failed for record in self.timings.records])
+
+    def test_track(self):
+        """Checks that steps of a call add up to its latency.
+        """
+        record = RequestRecord('host', 'get_jobs')
+
+        for _ in range(2):
+            with self.timings.track(record):
+                self.assertIs(record, self.timings.current)
+                self.timings.add_size(1)
+
+        self.assertIsNone(self.timings.current)
+        self.assertEqual([], self.timings.records)
+
+        self.timings.add(record)
+
+        self.assertEqual([record], self.timings.records)
+        self.assertEqual(2, record.size)
+
+    def test_annotations_outside_calls(self):
+        """Checks that annotations with no call in progress are ignored.
+        """
+        self.timings.add_size(10)
+        self.timings.mark_cache_hit()
+
+        self.assertEqual([], self.timings.records)
+
+    def test_summary(self):
+        """Checks that calls are aggregated by host and endpoint.
+        """
+        for host, endpoint in (('h1', 'get_jobs'), ('h1', 'get_jobs'),
+                               ('h2', 'info')):
+            with self.timings.measure(host, endpoint):
+                self.timings.add_size(1)
+
+        summary = {(row['host'], row['endpoint']): row
+                   for row in self.timings.summary()}
+
+        self.assertEqual(2, summary[('h1', 'get_jobs')]['calls'])
+        self.assertEqual(2, summary[('h1', 'get_jobs')]['bytes'])
+        self.assertEqual(1, summary[('h2', 'info')]['calls'])
+
+        table = self.timings.format_table().splitlines()
+        self.assertEqual(3, len(table))
+        self.assertTrue(table[0].startswith('host'))
+
+    def test_dump(self):
+        """Checks that calls are written down to a JSON file.
+        """
+        with self.timings.measure('host', 'get_jobs'):
+            pass
+
+        with TemporaryDirectory() as directory:
+            file = os.path.join(directory, 'timings.json')
+            self.timings.dump(file)
+
+            with open(file, 'r', encoding='utf8') as buffer:
+                data = json.load(buffer)
+
+        self.assertEqual(1, len(data['summary']))
+        self.assertEqual('get_jobs', data['requests'][0]['endpoint'])
@@ -13,9 +13,15 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 """
+import json
+from shutil import rmtree
+from tempfile import mkdtemp
 from unittest import TestCase
-from unittest.mock import Mock, PropertyMock
+from unittest.mock import MagicMock, Mock
 
+from requests import Response
+
+from cibyl.sources.cache import ResponseCache
 from cibyl.sources.zuul.api import ZuulAPI, ZuulAPIError, safe_request
 
 
@@ -78,18 +84,111 @@ class TestZuulAPIFromUrl(TestCase):
         self.assertEqual(None, api.cert)
         self.assertEqual(auth_token, api.auth_token)
 
+    def test_sessions_are_shared(self):
+        """Checks that APIs on the same host reuse the same session.
+        """
+        api1 = ZuulAPI.from_url('https://host/zuul1/', 'cert', 'token')
+        api2 = ZuulAPI.from_url('https://host/zuul2/', 'cert', 'token')
+
+        # pylint: disable=protected-access
+        self.assertIs(api1._client.session, api2._client.session)
+        self.assertIsNotNone(api1._client.session.auth)
+
 
 class TestZuulAPI(TestCase):
     """Tests for :class:`ZuulAPI`.
     """
 
+    def setUp(self):
+        self.directory = mkdtemp()
+
+    def tearDown(self):
+        rmtree(self.directory, ignore_errors=True)
+
     def test_info(self):
         """Tests that the correct info from :meth:`ZuulAPI.info` is
-        retrieved.
+        retrieved, and that it is only downloaded again if it changed.
+        """
+        info = {'info': {'capabilities': {}}}
+
+        response = Response()
+        response.status_code = 200
+        response.headers['ETag'] = '"v1"'
+        response._content = json.dumps(info).encode()  # pylint: disable=W0212
+
+        client = Mock()
+        client.base_url = 'https://host/zuul/api/'
+        client.session.get.return_value = response
+
+        api = ZuulAPI(client)
+        api.cache = ResponseCache(self.directory, ttl=-1)
+        api.info_ttl = -1
+
+        self.assertEqual(info, api.info())
+
+        response.status_code = 304
+        response._content = b''  # pylint: disable=W0212
+
+        self.assertEqual(info, api.info())
+        client.session.get.assert_called_with(
+            'https://host/zuul/api/info', headers={'If-None-Match': '"v1"'})
+
+    def test_info_ttl(self):
+        """Tests that info is kept on the cache for its own time-to-live.
         """
+        response = Response()
+        response.status_code = 200
+        response._content = b'{"info": {}}'  # pylint: disable=W0212
+
+        client = Mock()
+        client.base_url = 'https://host/zuul/api/'
+        client.session.get.return_value = response
+
+        api = ZuulAPI(client)
+        api.cache = ResponseCache(self.directory, ttl=-1)
+
+        api.info()
+        api.info()
+
+        client.session.get.assert_called_once()
+
+    def test_builds(self):
+        """Tests that pages of builds are asked for with their bounds and
+        filters.
+        """
+        response = Response()
+        response.status_code = 200
+        response._content = b'[{"uuid": "1"}]'  # pylint: disable=W0212
+
+        client = Mock()
+        client.base_url = 'https://host/zuul/api/'
+        client.session.get.return_value = response
+
+        api = ZuulAPI(client)
+
+        self.assertEqual([{'uuid': '1'}],
+                         api.builds('my tenant', 100, 50, {'project': 'p'}))
+        client.session.get.assert_called_once_with(
+            'https://host/zuul/api/tenant/my%20tenant/builds',
+            params={'project': 'p', 'skip': 100, 'limit': 50})
+
+    def test_status(self):
+        """Tests that the pipelines on the status are decoded as they
+        arrive.
+        """
+        response = MagicMock()
+        response.__enter__.return_value = response
+        response.iter_content.return_value = [
+            b'{"zuul_version": "4", "pipelines": [{"name": "ch',
+            b'eck"}, {"name": "gate"}]}']
+
         client = Mock()
-        client.info = PropertyMock()
+        client.base_url = 'https://host/zuul/api/'
+        client.session.get.return_value = response
 
         api = ZuulAPI(client)
 
-        self.assertEqual(client.info, api.info())
+        self.assertEqual([{'name': 'check'}, {'name': 'gate'}],
+                         list(api.status('tenant')))
+        client.session.get.assert_called_once_with(
+            'https://host/zuul/api/tenant/tenant/status', stream=True)
@@ -14,10 +14,11 @@
 #    under the License.
 """
 from unittest import TestCase
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 from cibyl.sources.zuul.api import ZuulAPIError
 from cibyl.sources.zuul.client import ZuulClient, ZuulClientError
+from cibyl.utils.dates import utc_to_timestamp
 
 
 class TestClient(TestCase):
@@ -26,7 +27,7 @@ class TestClient(TestCase):
 
     def test_connect_throws_error_on_failed_request(self):
         """Checks that a :class:`ZuulClientError` is raised if no connection
-        can be made with the host.
+        can be made with the host, once the first request is made.
         """
 
         def raise_api_error():
@@ -37,5 +38,98 @@ class TestClient(TestCase):
         api.info.side_effect = raise_api_error
 
         client = ZuulClient(api)
+        client.connect()
 
-        self.assertRaises(ZuulClientError, client.connect)
+        api.info.assert_not_called()
+        self.assertRaises(ZuulClientError, client.get_tenants)
+
+    def test_connect_verified_once(self):
+        """Checks that errors after a first successful request are left as
+        they are.
+        """
+        api = Mock()
+        api.jobs.side_effect = [[], ZuulAPIError]
+
+        client = ZuulClient(api)
+        client.connect()
+        client.get_jobs('tenant')
+
+        self.assertRaises(ZuulAPIError, client.get_jobs, 'tenant')
+
+
+class TestTenants(TestCase):
+    """Test cases for the tenant requests of :class:`ZuulClient`.
+    """
+
+    def test_get_tenants(self):
+        """Checks that tenants are asked for unless the host is dedicated
+        to one.
+        """
+        api = Mock()
+        api.info.return_value = {'info': {'tenant': None}}
+        api.tenants.return_value = [{'name': 't1'}, {'name': 't2'}]
+
+        client = ZuulClient(api)
+
+        self.assertEqual(['t1', 't2'], client.get_tenants())
+
+        api.info.return_value = {'info': {'tenant': 't3'}}
+
+        self.assertEqual(['t3'], client.get_tenants())
+        api.tenants.assert_called_once()
+
+    @patch('cibyl.sources.zuul.client.RateLimiter')
+    def test_rate_limit(self, limiter):
+        """Checks that each tenant has a rate limiter of its own.
+        """
+        api = Mock()
+        client = ZuulClient(api, tenant_rate_limit=5)
+
+        client.get_jobs('t1')
+        client.get_jobs('t1')
+        client.get_jobs('t2')
+
+        self.assertEqual(2, limiter.call_count)
+        self.assertEqual(3, limiter.return_value.acquire.call_count)
+        api.jobs.assert_called_with('t2')
+
+
+class TestGetBuilds(TestCase):
+    """Test cases for :meth:`ZuulClient.get_builds`.
+    """
+
+    def setUp(self):
+        self.builds = [
+            {'uuid': str(index),
+             'start_time': f'2022-01-{31 - index // 10:02d}T00:00:00'}
+            for index in range(25)
+        ]
+
+        self.api = Mock()
+        self.api.builds.side_effect = \
+            lambda tenant, skip, limit, filters: self.builds[skip:skip + limit]
+
+        self.client = ZuulClient(self.api)
+
+    def test_all_pages(self):
+        """Checks that pages are requested until a short one comes back,
+        and builds handed out in order.
+        """
+        builds = list(self.client.get_builds('tenant', page_size=10,
+                                             max_requests=2))
+
+        self.assertEqual(self.builds, builds)
+        self.assertEqual(
+            [0, 10, 20, 30],
+            sorted(call.args[1] for call in self.api.builds.call_args_list))
+
+    def test_cutoff(self):
+        """Checks that no builds older than the cutoff are handed out.
+        """
+        since = utc_to_timestamp('2022-01-30T00:00:00')
+
+        builds = list(self.client.get_builds('tenant', since, page_size=5,
+                                             max_requests=2))
+
+        self.assertEqual(self.builds[:20], builds)
+        self.assertLessEqual(self.api.builds.call_count, 6)
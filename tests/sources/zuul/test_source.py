@@ -0,0 +1,246 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+# pylint: disable=no-member
+from threading import Barrier
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from cibyl.cli.argument import Argument
+from cibyl.models.ci.build import Build
+from cibyl.models.ci.system import ZuulSystem
+from cibyl.sources.zuul.api import ZuulAPIError
+from cibyl.sources.zuul.client import ZuulClient
+from cibyl.sources.zuul.source import Zuul
+
+
+class TestZuulSource(TestCase):
+    """Tests for :class:`Zuul`.
+    """
+
+    def setUp(self):
+        self.zuul = Zuul('https://host/zuul/', tenants=['openstack'])
+        self.zuul.api = Mock()
+        self.zuul.client = Mock()
+        self.builds = [
+            {'uuid': 'b4', 'job_name': 'job1', 'pipeline': 'gate',
+             'result': 'SUCCESS'},
+            {'uuid': 'b3', 'job_name': 'job1', 'pipeline': 'check',
+             'result': 'FAILURE'},
+            {'uuid': 'b2', 'job_name': 'job2', 'pipeline': 'check',
+             'result': 'SUCCESS'},
+            {'uuid': 'b1', 'job_name': 'job1', 'pipeline': 'check',
+             'result': 'SUCCESS'},
+        ]
+
+    def test_query_jobs(self):
+        """Checks that the jobs of all tenants are modeled, with the tenants
+        queried at the same time.
+        """
+        barrier = Barrier(2, timeout=5)
+
+        def get_jobs(tenant):
+            # Both tenants must be in flight for this to go through
+            barrier.wait()
+            return [{'name': 'job1'}, {'name': f'{tenant}-job'}]
+
+        self.zuul.tenants = None
+        self.zuul.client = ZuulClient(self.zuul.api)
+        self.zuul.api.info.return_value = {'info': {'tenant': None}}
+        self.zuul.api.tenants.return_value = [{'name': 't1'}, {'name': 't2'}]
+        self.zuul.api.jobs.side_effect = get_jobs
+
+        system = ZuulSystem('zuul', jobs_scope='t*')
+        args = {'jobs': Argument(name='jobs', arg_type=str, description='')}
+
+        self.zuul.query(system, args)
+
+        self.assertEqual(['t1-job', 't2-job'],
+                         sorted(job.name.value for job in system.jobs))
+
+    def test_query_builds(self):
+        """Checks that builds are modeled into the jobs of the system and
+        those of their pipelines.
+        """
+        self.zuul.client.get_builds.return_value = iter(self.builds)
+
+        system = ZuulSystem('zuul')
+        args = {'jobs': Argument(name='jobs', arg_type=str, description=''),
+                'builds_limit': Argument(name='builds_limit', arg_type=int,
+                                         description='', value=[2]),
+                'builds_since': Argument(name='builds_since', arg_type=int,
+                                         description='', value=1)}
+
+        self.zuul.query(system, args)
+
+        self.zuul.client.get_builds.assert_called_once_with(
+            'openstack', 1, None, 100, 4)
+
+        jobs = {job.name.value: job for job in system.jobs}
+        self.assertEqual(['b4', 'b3'], [build.build_id.value
+                                        for build in jobs['job1'].builds])
+        self.assertEqual(['b2'], [build.build_id.value
+                                  for build in jobs['job2'].builds])
+
+        pipelines = {pipeline.name.value: pipeline
+                     for pipeline in system.pipelines}
+        self.assertEqual(['gate', 'check'], list(pipelines))
+        self.assertEqual(['job1', 'job2'],
+                         [job.name.value for job in pipelines['check'].jobs])
+        self.assertEqual(
+            ['b3'],
+            [build.build_id.value
+             for build in pipelines['check'].jobs[0].builds])
+
+    def test_populate_builds_models_kept(self):
+        """Checks that builds past the limit are not modeled at all.
+        """
+        system = ZuulSystem('zuul')
+
+        with patch('cibyl.sources.zuul.source.Build.from_records',
+                   wraps=Build.from_records) as from_records:
+            self.zuul.populate_builds(system, iter(self.builds), 1)
+
+        self.assertEqual(['b4', 'b2'],
+                         [build['uuid'] for call in from_records.call_args_list
+                          for build in call.args[0]])
+        self.assertEqual(['job1', 'job2'],
+                         [job.name.value for job in system.jobs])
+
+    def test_query_builds_limit_across_tenants(self):
+        """Checks that the newest builds of each job are kept, whichever
+        tenant they come from and whenever it is done.
+        """
+        builds = {
+            't1': [{'uuid': 'old', 'job_name': 'job1', 'pipeline': 'check',
+                    'result': 'SUCCESS', 'start_time': '2022-03-01T10:00:00'}],
+            't2': [{'uuid': 'new', 'job_name': 'job1', 'pipeline': 'check',
+                    'result': 'SUCCESS', 'start_time': '2022-03-02T10:00:00'}]
+        }
+        self.zuul.tenants = ['t1', 't2']
+        self.zuul.client.get_jobs.return_value = [{'name': 'job1'}]
+        self.zuul.client.get_builds.side_effect = \
+            lambda tenant, *_: iter(builds[tenant])
+
+        system = ZuulSystem('zuul')
+        args = {'jobs': Argument(name='jobs', arg_type=str, description=''),
+                'builds_limit': Argument(name='builds_limit', arg_type=int,
+                                         description='', value=[1])}
+
+        self.zuul.query(system, args)
+
+        self.assertEqual(['new'], [build.build_id.value
+                                   for build in system.jobs[0].builds])
+
+    def test_query_tenant_error(self):
+        """Checks that a tenant failing fails the query, without waiting
+        for the others to be consumed.
+        """
+        self.zuul.tenants = ['t1', 't2']
+        self.zuul.tenant_chunk_size = 1
+
+        def get_jobs(tenant):
+            if tenant == 't2':
+                raise ZuulAPIError('down')
+            return ({'name': f'job{index}'} for index in range(100))
+
+        self.zuul.client.get_jobs.side_effect = get_jobs
+
+        system = ZuulSystem('zuul')
+        args = {'jobs': Argument(name='jobs', arg_type=str, description='')}
+
+        self.assertRaises(ZuulAPIError, self.zuul.query, system, args)
+
+    def get_job_builds(self, *args):
+        """Builds of the job a call to the client is narrowed to."""
+        filters = args[2]
+        return (build for build in self.builds
+                if build['job_name'] == filters['job_name'])
+
+    def test_query_builds_job_name(self):
+        """Checks that only the builds of the jobs asked for are requested.
+        """
+        self.zuul.client.get_jobs.return_value = [{'name': 'job1'},
+                                                  {'name': 'job2'}]
+        self.zuul.client.get_builds.side_effect = self.get_job_builds
+
+        system = ZuulSystem('zuul')
+        args = {'job_name': Argument(name='job_name', arg_type=str,
+                                     description='', value=['2$']),
+                'builds': Argument(name='builds', arg_type=str,
+                                   description='')}
+
+        self.zuul.query(system, args)
+
+        self.zuul.client.get_builds.assert_called_once_with(
+            'openstack', None, {'job_name': 'job2'}, 100, 1)
+        self.assertEqual(['job2'], [job.name.value for job in system.jobs])
+
+    def test_query_builds_limit_per_job(self):
+        """Checks that, with a limit and no cutoff, a single page of that
+        many builds is requested for each job in scope.
+        """
+        self.zuul.client.get_jobs.return_value = [{'name': 'job1'},
+                                                  {'name': 'job2'},
+                                                  {'name': 'other'}]
+        self.zuul.client.get_builds.side_effect = self.get_job_builds
+
+        system = ZuulSystem('zuul', jobs_scope='job*')
+        args = {'jobs': Argument(name='jobs', arg_type=str, description=''),
+                'builds_limit': Argument(name='builds_limit', arg_type=int,
+                                         description='', value=[2])}
+
+        self.zuul.query(system, args)
+
+        self.assertCountEqual(
+            [('openstack', None, {'job_name': 'job1'}, 2, 1),
+             ('openstack', None, {'job_name': 'job2'}, 2, 1)],
+            [call.args for call in
+             self.zuul.client.get_builds.call_args_list])
+
+        jobs = {job.name.value: job for job in system.jobs}
+        self.assertEqual(['b4', 'b3'], [build.build_id.value
+                                        for build in jobs['job1'].builds])
+        self.assertEqual(['b2'], [build.build_id.value
+                                  for build in jobs['job2'].builds])
+
+    def test_poll_status(self):
+        """Checks that the status of all tenants is modeled, and that only
+        what changed is reported.
+        """
+        snapshots = {
+            't1': [{('check', '1,1', 'job1'): 'QUEUED'},
+                   {('check', '1,1', 'job1'): 'RUNNING'}],
+            't2': [{('gate', '2,1', 'job2'): 'RUNNING',
+                    ('check', '1,1', 'job1'): 'QUEUED'},
+                   {('gate', '2,1', 'job2'): 'RUNNING',
+                    ('check', '1,1', 'job1'): 'QUEUED'}],
+        }
+        self.zuul.tenants = ['t1', 't2']
+        self.zuul.client.get_status.side_effect = \
+            lambda tenant: snapshots[tenant].pop(0)
+
+        system = ZuulSystem('zuul')
+
+        self.assertEqual(3, len(self.zuul.poll_status(system)))
+
+        changes = self.zuul.poll_status(system)
+
+        # Same pipeline and change on another tenant, which did not change
+        self.assertEqual(['t1/check: 1,1 job1 QUEUED -> RUNNING'],
+                         [str(change) for change in changes])
+        self.assertEqual(['check', 'gate'],
+                         sorted(pipeline.name.value
+                                for pipeline in system.pipelines))
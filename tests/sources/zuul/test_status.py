@@ -0,0 +1,92 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+# pylint: disable=no-member
+from unittest import TestCase
+
+from cibyl.sources.zuul.status import (StatusChange, build_pipelines,
+                                       diff_snapshots, take_snapshot)
+
+
+class TestStatus(TestCase):
+    """Test cases for the handling of Zuul's status.
+    """
+
+    def setUp(self):
+        self.pipelines = [
+            {'name': 'check', 'change_queues': [
+                {'heads': [[
+                    {'id': '1,1', 'jobs': [
+                        {'name': 'job1', 'result': 'SUCCESS'},
+                        {'name': 'job2', 'start_time': 100},
+                        {'name': 'job3'}]},
+                    {'id': None, 'ref': 'refs/heads/master', 'jobs': [
+                        {'name': 'job1'}]}
+                ]]}
+            ]},
+            {'name': 'gate', 'change_queues': []}
+        ]
+
+    def test_take_snapshot(self):
+        """Checks that the state of every job is taken.
+        """
+        self.assertEqual(
+            {('check', '1,1', 'job1'): 'SUCCESS',
+             ('check', '1,1', 'job2'): 'RUNNING',
+             ('check', '1,1', 'job3'): 'QUEUED',
+             ('check', 'refs/heads/master', 'job1'): 'QUEUED'},
+            take_snapshot(iter(self.pipelines)))
+
+    def test_diff_snapshots(self):
+        """Checks that only jobs that changed are reported.
+        """
+        old = {('check', '1,1', 'job1'): 'RUNNING',
+               ('check', '1,1', 'job2'): 'QUEUED',
+               ('gate', '2,1', 'job1'): 'RUNNING'}
+        new = {('check', '1,1', 'job1'): 'SUCCESS',
+               ('check', '1,1', 'job2'): 'QUEUED',
+               ('check', '3,1', 'job1'): 'QUEUED'}
+
+        self.assertEqual(
+            [StatusChange('check', '1,1', 'job1', 'RUNNING', 'SUCCESS'),
+             StatusChange('check', '3,1', 'job1', None, 'QUEUED'),
+             StatusChange('gate', '2,1', 'job1', 'RUNNING', None)],
+            diff_snapshots(old, new))
+
+    def test_status_change_str(self):
+        """Checks how changes are printed.
+        """
+        self.assertEqual(
+            'gate: 2,1 job1 RUNNING -> -',
+            str(StatusChange('gate', '2,1', 'job1', 'RUNNING', None)))
+        self.assertEqual(
+            't1/gate: 2,1 job1 - -> QUEUED',
+            str(StatusChange('gate', '2,1', 'job1', new='QUEUED',
+                             tenant='t1')))
+
+    def test_build_pipelines(self):
+        """Checks that snapshots are modeled into pipelines.
+        """
+        pipelines = build_pipelines(take_snapshot(self.pipelines))
+
+        self.assertEqual(['check'],
+                         [pipeline.name.value for pipeline in pipelines])
+        jobs = pipelines[0].jobs
+        self.assertEqual(['job1', 'job2', 'job3'],
+                         [job.name.value for job in jobs])
+        self.assertEqual(
+            [('1,1', 'SUCCESS'), ('refs/heads/master', 'QUEUED')],
+            [(build.build_id.value, build.status.value)
+             for build in jobs[0].builds])
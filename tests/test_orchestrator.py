@@ -13,12 +13,18 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 """
+import time
+from concurrent.futures import Future
+from threading import Barrier, Timer
 from unittest import TestCase
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
+from cibyl.cli.argument import Argument
 from cibyl.config import Config
 from cibyl.exceptions.config import InvalidConfiguration
+from cibyl.models.ci.system import System
 from cibyl.orchestrator import Orchestrator
+from cibyl.sources.jenkins import Jenkins
 
 
 class TestOrchestrator(TestCase):
@@ -102,3 +108,191 @@ class TestOrchestrator(TestCase):
             self.orchestrator.environments[0].systems[0].name.value, 'system3')
         self.assertEqual(
             self.orchestrator.environments[0].systems[1].name.value, 'system4')
+
+    def test_orchestrator_create_ci_environments_sources(self):
+        """Testing that sources are built out of the systems' entries"""
+        self.orchestrator.config = Mock(Config())
+        self.orchestrator.config.data = {
+            'environments': {
+                'env1': {
+                    'system1': {
+                        'system_type': 'jenkins',
+                        'sources': {
+                            'jenkins1': {
+                                'driver': 'jenkins',
+                                'url': 'url/to/jenkins/',
+                                'username': 'user',
+                                'token': 'token'}}}}}}
+
+        self.orchestrator.create_ci_environments()
+
+        sources = self.orchestrator.environments[0].systems[0].sources
+        self.assertEqual(1, len(sources.value))
+        self.assertIsInstance(sources[0], Jenkins)
+        self.assertEqual('jenkins1', sources[0].name)
+
+    def test_orchestrator_run_query_queries_all_systems(self):
+        """Testing that run_query reaches the sources of every system"""
+        self.orchestrator.config = Mock(Config())
+        self.orchestrator.config.data = self.valid_multiple_envs_config_data
+        self.orchestrator.create_ci_environments()
+
+        sources = []
+        for environment in self.orchestrator.environments:
+            for system in environment.systems:
+                source = Mock()
+                system.sources.append(source)
+                sources.append((source, system))
+
+        self.orchestrator.parser.ci_args = {
+            'jobs': Argument(name='jobs', arg_type=str, description='',
+                             func='get_jobs', level=1)}
+        self.orchestrator.run_query()
+
+        for source, system in sources:
+            source.query.assert_called_once_with(
+                system, self.orchestrator.parser.ci_args)
+
+    def test_orchestrator_start_query(self):
+        """Testing that start_query returns the query of every system"""
+        self.orchestrator.config = Mock(Config())
+        self.orchestrator.config.data = self.valid_multiple_envs_config_data
+        self.orchestrator.create_ci_environments()
+
+        systems = []
+        for environment in self.orchestrator.environments:
+            for system in environment.systems:
+                system.sources.append(Mock())
+                systems.append(system)
+
+        self.orchestrator.parser.ci_args = {
+            'jobs': Argument(name='jobs', arg_type=str, description='',
+                             func='get_jobs', level=1)}
+        queries = self.orchestrator.start_query()
+        self.orchestrator.wait_queries(queries)
+
+        self.assertEqual(3, len(queries))
+        for system in queries.values():
+            self.assertIn(system, systems)
+            system.sources[0].query.assert_called_once_with(
+                system, self.orchestrator.parser.ci_args)
+
+    def test_orchestrator_start_query_no_args(self):
+        """Testing that start_query has nothing to start without
+        arguments"""
+        self.assertEqual({}, self.orchestrator.start_query())
+
+    def test_orchestrator_query_systems_is_concurrent(self):
+        """Testing that systems are queried at the same time"""
+        self.orchestrator.config = Mock(Config())
+        self.orchestrator.config.data = self.valid_multiple_envs_config_data
+        self.orchestrator.create_ci_environments()
+
+        # Only passes if all three sources are waiting at once
+        barrier = Barrier(3, timeout=5)
+        for environment in self.orchestrator.environments:
+            for system in environment.systems:
+                source = Mock()
+                source.query.side_effect = lambda *_: barrier.wait()
+                system.sources.append(source)
+
+        self.orchestrator.query_systems({}, max_workers=3)
+
+        self.assertFalse(barrier.broken)
+
+    def test_orchestrator_query_systems_raises_errors(self):
+        """Testing that errors from a worker reach the caller"""
+        self.orchestrator.config = Mock(Config())
+        self.orchestrator.config.data = self.valid_single_env_config_data
+        self.orchestrator.create_ci_environments()
+
+        source = Mock()
+        source.query.side_effect = ValueError
+        self.orchestrator.environments[0].systems[0].sources.append(source)
+
+        with self.assertRaises(ValueError):
+            self.orchestrator.query_systems({})
+
+    def test_orchestrator_query_systems_logs_others(self):
+        """Testing that the errors of the queries that were running when
+        one failed are logged"""
+        self.orchestrator.config = Mock(Config())
+        self.orchestrator.config.data = self.valid_multiple_envs_config_data
+        self.orchestrator.create_ci_environments()
+
+        barrier = Barrier(2, timeout=5)
+
+        def fail(*_):
+            barrier.wait()
+            raise ValueError
+
+        def fail_later(*_):
+            barrier.wait()
+            time.sleep(0.1)
+            raise KeyError
+
+        systems = [system for environment in self.orchestrator.environments
+                   for system in environment.systems]
+        for system, query in zip(systems, (fail, fail_later, None)):
+            source = Mock()
+            source.query.side_effect = query
+            system.sources.append(source)
+
+        with self.assertLogs('cibyl.orchestrator', 'ERROR') as logs:
+            with self.assertRaises(ValueError):
+                self.orchestrator.query_systems({}, max_workers=2)
+
+        self.assertEqual(1, len(logs.records))
+        self.assertIs(KeyError, logs.records[0].exc_info[0])
+
+    def test_orchestrator_cancel_queries(self):
+        """Testing that queries not yet started are cancelled, and that the
+        running ones are waited for"""
+        pending, running, failed = Future(), Future(), Future()
+        running.set_running_or_notify_cancel()
+        failed.set_running_or_notify_cancel()
+        error = ValueError()
+        failed.set_exception(error)
+        Timer(0.1, running.set_exception, [KeyError()]).start()
+
+        queries = {future: System(name, 'jenkins') for future, name in
+                   ((pending, 's1'), (running, 's2'), (failed, 's3'))}
+
+        with self.assertLogs('cibyl.orchestrator', 'ERROR') as logs:
+            Orchestrator.cancel_queries(queries, error)
+
+        self.assertTrue(pending.cancelled())
+        self.assertEqual(1, len(logs.records))
+        self.assertIs(KeyError, logs.records[0].exc_info[0])
+
+    @patch('builtins.print')
+    def test_orchestrator_report_timings(self, mock_print):
+        """Testing that timings are only printed when asked for"""
+        self.orchestrator.report_timings()
+        mock_print.assert_not_called()
+
+        self.orchestrator.parser.app_args = {'timings': True}
+        self.orchestrator.report_timings()
+        mock_print.assert_called_once()
+
+    @patch('cibyl.orchestrator.time.sleep')
+    def test_orchestrator_watch(self, sleep):
+        """Testing that the status of sources is polled and its changes
+        published"""
+        self.orchestrator.config = Mock(Config())
+        self.orchestrator.config.data = self.valid_single_env_config_data
+        self.orchestrator.create_ci_environments()
+        self.orchestrator.publisher = Mock()
+
+        source = Mock()
+        source.poll_status.side_effect = [['change1'], []]
+        system = self.orchestrator.environments[0].systems[0]
+        system.sources.append(source)
+
+        self.orchestrator.watch(2.5, iterations=2)
+
+        self.assertEqual(2, source.poll_status.call_count)
+        source.poll_status.assert_called_with(system)
+        sleep.assert_called_once_with(2.5)
+        self.orchestrator.publisher.publish_changes.assert_any_call(
+            ['change1'])
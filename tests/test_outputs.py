@@ -0,0 +1,154 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+import json
+import sys
+from io import StringIO
+from unittest import TestCase
+from unittest.mock import MagicMock, Mock, patch
+
+from cibyl.exceptions.output import OutputError
+from cibyl.models.ci.build import Build
+from cibyl.models.ci.build_columns import BuildColumns
+from cibyl.models.ci.environment import Environment
+from cibyl.models.ci.job import Job
+from cibyl.outputs import (COLUMNS, iter_json, iter_json_lines, iter_rows,
+                           write_csv, write_parquet)
+from cibyl.publisher import BufferedWriter
+
+
+class TestOutputs(TestCase):
+    """Testing the machine-readable outputs"""
+
+    def setUp(self):
+        self.environment = Environment("env1")
+        self.environment.add_system("system1", "jenkins")
+        self.environment.add_system("system2", "jenkins")
+
+        system = self.environment.systems.get("system1")
+        job = Job("job1", url="url1")
+        job.add_build(Build("1", "SUCCESS"))
+        job.add_build(Build("2"))
+        system.add_job(job)
+        system.add_job(Job("job2"))
+
+        self.rows = [
+            ("env1", "system1", "jenkins", "job1", "url1", "1", "SUCCESS"),
+            ("env1", "system1", "jenkins", "job1", "url1", "2", None),
+            ("env1", "system1", "jenkins", "job2", None, None, None),
+            ("env1", "system2", "jenkins", None, None, None, None)
+        ]
+
+    def test_iter_rows(self):
+        """Testing that there is a row for each build and for whatever has
+        nothing below it"""
+        self.assertEqual(self.rows, list(iter_rows([self.environment])))
+
+        self.assertEqual([("env2",) + (None,) * 6],
+                         list(iter_rows([Environment("env2")])))
+
+    def test_iter_rows_columns(self):
+        """Testing that builds held in columns are not modeled"""
+        builds = BuildColumns('builds')
+        builds.add("1", "SUCCESS")
+        job = Job("job3", columnar=True)
+        job.builds = builds
+        self.environment.systems.get("system2").add_job(job)
+
+        with patch.object(BuildColumns, '__getitem__') as getitem:
+            rows = list(iter_rows([self.environment]))
+
+        getitem.assert_not_called()
+        self.assertEqual(
+            ("env1", "system2", "jenkins", "job3", None, "1", "SUCCESS"),
+            rows[-1])
+
+    def test_iter_rows_get_jobs(self):
+        """Testing that the jobs of each system are asked for"""
+        get_jobs = Mock(return_value=[Job("job3")])
+
+        rows = list(iter_rows([self.environment], get_jobs))
+
+        self.assertEqual(2, get_jobs.call_count)
+        self.assertEqual(
+            [("env1", "system1", "jenkins", "job3", None, None, None),
+             ("env1", "system2", "jenkins", "job3", None, None, None)],
+            rows)
+
+    def test_iter_json(self):
+        """Testing that environments are serialized as a JSON document"""
+        document = json.loads("".join(iter_json([self.environment,
+                                                 Environment("env2")])))
+
+        self.assertEqual(
+            [{'name': 'env1', 'systems': [
+                {'name': 'system1', 'system_type': 'jenkins', 'jobs': [
+                    {'name': 'job1', 'url': 'url1', 'builds': [
+                        {'build_id': '1', 'status': 'SUCCESS'},
+                        {'build_id': '2', 'status': None}]},
+                    {'name': 'job2', 'url': None, 'builds': []}]},
+                {'name': 'system2', 'system_type': 'jenkins', 'jobs': []}]},
+             {'name': 'env2', 'systems': []}],
+            document)
+
+    def test_iter_json_lines(self):
+        """Testing that there is an object for each row"""
+        lines = list(iter_json_lines([self.environment]))
+
+        self.assertEqual([dict(zip(COLUMNS, row)) for row in self.rows],
+                         [json.loads(line) for line in lines])
+
+    def test_write_csv(self):
+        """Testing that there is a record for each row"""
+        output = StringIO()
+
+        with BufferedWriter(output) as writer:
+            write_csv([self.environment], writer)
+
+        self.assertEqual(
+            "environment,system,system_type,job,job_url,build_id,"
+            "build_status\n"
+            "env1,system1,jenkins,job1,url1,1,SUCCESS\n"
+            "env1,system1,jenkins,job1,url1,2,\n"
+            "env1,system1,jenkins,job2,,,\n"
+            "env1,system2,jenkins,,,,\n",
+            output.getvalue())
+
+    def test_write_parquet(self):
+        """Testing that rows are written in batches"""
+        pyarrow = MagicMock()
+        output = Mock()
+
+        with patch.dict(sys.modules, {'pyarrow': pyarrow,
+                                      'pyarrow.parquet': pyarrow.parquet}):
+            write_parquet([self.environment], output, batch_size=3)
+
+        pyarrow.parquet.ParquetWriter.assert_called_once_with(
+            output, pyarrow.schema.return_value)
+        writer = pyarrow.parquet.ParquetWriter.return_value.__enter__\
+            .return_value
+        self.assertEqual(2, writer.write_batch.call_count)
+
+        columns = [call.args[0]
+                   for call in pyarrow.array.call_args_list]
+        self.assertEqual(2 * len(COLUMNS), len(columns))
+        self.assertEqual(["job1", "job1", "job2"], columns[3])
+        self.assertEqual([None], columns[len(COLUMNS) + 3])
+
+    def test_write_parquet_missing_pyarrow(self):
+        """Testing that parquet cannot be written without pyarrow"""
+        with patch.dict(sys.modules, {'pyarrow': None}):
+            self.assertRaises(OutputError, write_parquet,
+                              [self.environment], Mock())
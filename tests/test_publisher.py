@@ -13,11 +13,21 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 """
+import json
+import os
+import sys
+from concurrent.futures import Future
+from io import StringIO
+from tempfile import TemporaryDirectory
+from threading import Thread
 from unittest import TestCase
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
+from cibyl.exceptions.output import OutputError
+from cibyl.models.ci.build import Build
 from cibyl.models.ci.environment import Environment
-from cibyl.publisher import Publisher
+from cibyl.models.ci.job import Job
+from cibyl.publisher import BufferedWriter, Publisher, follow
 
 
 class TestOrchestrator(TestCase):
@@ -34,3 +44,132 @@ class TestOrchestrator(TestCase):
         self.publisher.publish(environments=[self.environment],
                                dest="terminal")
         mock_print.assert_called_with(self.environment)
+
+    def test_publisher_stream(self):
+        """Testing Publisher stream method follows the jobs of systems
+        being queried"""
+        self.environment.add_system("system1", "jenkins",
+                                    sources=[Mock(streams_jobs=True)])
+        system = self.environment.systems.get("system1")
+
+        query = Future()
+        output = StringIO()
+
+        def add_jobs():
+            system.add_job(Job("job1"))
+            system.add_job(Job("job2"))
+            query.set_result(system)
+
+        Thread(target=add_jobs).start()
+        self.publisher.stream([self.environment], {query: system},
+                              output=output)
+
+        self.assertEqual(f"Environment: {self.env_name}\n"
+                         "  System: system1 (type: jenkins)\n"
+                         "    Job: job1\n"
+                         "    Job: job2\n",
+                         output.getvalue())
+
+    def test_publisher_stream_error(self):
+        """Testing Publisher stream method raises the error of a query"""
+        self.environment.add_system("system1", "jenkins")
+        system = self.environment.systems.get("system1")
+
+        query = Future()
+        query.set_exception(ValueError("error"))
+
+        with self.assertRaises(ValueError):
+            self.publisher.stream([self.environment], {query: system},
+                                  output=StringIO())
+
+    def test_publisher_stream_format(self):
+        """Testing Publisher stream method writes the chosen format"""
+        self.environment.add_system("system1", "jenkins")
+        self.environment.systems.get("system1").add_job(Job("job1"))
+        output = StringIO()
+
+        self.publisher.stream([self.environment], output=output,
+                              output_format='jsonl')
+
+        self.assertEqual(
+            {'environment': self.env_name, 'system': 'system1',
+             'system_type': 'jenkins', 'job': 'job1', 'job_url': None,
+             'build_id': None, 'build_status': None},
+            json.loads(output.getvalue()))
+
+    def test_publisher_stream_file(self):
+        """Testing Publisher stream method writes to a file"""
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'output.json')
+
+            self.publisher.stream([self.environment], dest=path,
+                                  output_format='json')
+
+            with open(path, encoding='utf-8') as file:
+                self.assertEqual([{'name': self.env_name, 'systems': []}],
+                                 json.load(file))
+
+    def test_publisher_stream_parquet_missing_pyarrow(self):
+        """Testing Publisher stream method leaves no file behind when
+        parquet cannot be written"""
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'output.parquet')
+
+            with patch.dict(sys.modules, {'pyarrow': None}):
+                self.assertRaises(OutputError, self.publisher.stream,
+                                  [self.environment], dest=path,
+                                  output_format='parquet')
+
+            self.assertFalse(os.path.exists(path))
+
+
+class TestBufferedWriter(TestCase):
+    """Testing BufferedWriter class"""
+
+    def test_write_holds_lines(self):
+        """Testing that lines are held back until flushed"""
+        output = StringIO()
+
+        with BufferedWriter(output, flush_interval=60) as writer:
+            writer.write("line1")
+            writer.write("line2")
+            self.assertEqual("", output.getvalue())
+
+        self.assertEqual("line1\nline2\n", output.getvalue())
+
+    def test_write_buffer_size(self):
+        """Testing that lines are written once the buffer is full"""
+        output = StringIO()
+        writer = BufferedWriter(output, buffer_size=8, flush_interval=60)
+
+        writer.write("line1")
+        self.assertEqual("", output.getvalue())
+        writer.write("line2")
+        self.assertEqual("line1\nline2\n", output.getvalue())
+
+
+class TestFollow(TestCase):
+    """Testing follow function"""
+
+    def test_follow_finished(self):
+        """Testing that all items are gone through if there is no query"""
+        job = Job("job1")
+        job.add_build(Build("1"))
+
+        self.assertEqual(job.builds.value, list(follow(job.builds, None)))
+
+    def test_follow_running(self):
+        """Testing that items added while waiting are gone through"""
+        job = Job("job1")
+        query = Future()
+        on_wait = Mock()
+
+        def add_build():
+            job.add_build(Build("1"))
+            query.set_result(None)
+
+        on_wait.side_effect = add_build
+
+        self.assertEqual([Build("1")],
+                         list(follow(job.builds, query, on_wait)))
+        on_wait.assert_called_once_with()
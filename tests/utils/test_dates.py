@@ -0,0 +1,45 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+from argparse import ArgumentTypeError
+from unittest import TestCase
+
+from cibyl.utils.dates import parse_date, utc_to_timestamp
+
+
+class TestParseDate(TestCase):
+    """Test cases for the 'parse_date' function.
+    """
+
+    def test_parse_date(self):
+        """Checks that dates are turned into milliseconds since the epoch.
+        """
+        self.assertEqual(0, parse_date('1970-01-01T00:00:00+00:00'))
+        self.assertEqual(86400000, parse_date('1970-01-02T00:00:00+00:00'))
+
+    def test_invalid_date(self):
+        """Checks that an error is raised for dates not in ISO format.
+        """
+        self.assertRaises(ArgumentTypeError, parse_date, 'yesterday')
+
+
+class TestUtcToTimestamp(TestCase):
+    """Test cases for the 'utc_to_timestamp' function.
+    """
+
+    def test_utc_to_timestamp(self):
+        """Checks that dates with no time zone are taken as UTC.
+        """
+        self.assertEqual(86400000, utc_to_timestamp('1970-01-02T00:00:00'))
@@ -0,0 +1,111 @@
+"""
+#    Copyright 2022 Red Hat
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+import json
+from unittest import TestCase
+from unittest.mock import patch
+
+from cibyl.utils.json import JSONStreamError, iter_array
+
+
+def split(document, size):
+    """Cuts a document into chunks of the given size.
+    """
+    return [document[i:i + size] for i in range(0, len(document), size)]
+
+
+class TestIterArray(TestCase):
+    """Tests for :func:`iter_array`.
+    """
+
+    def setUp(self):
+        self.jobs = [{'name': 'jób1', 'number': 12345},
+                     {'name': 'job2', 'builds': [{'number': 1}]}]
+        self.document = json.dumps({
+            '_class': 'hudson.model.Hudson',
+            'views': [{'jobs': ['not these']}],
+            'jobs': self.jobs,
+            'after': 3.1415
+        }).encode('utf-8')
+
+    def test_any_chunk_size(self):
+        """Checks that the items are decoded no matter where the document is
+        cut.
+        """
+        for size in (1, 2, 3, 7, 64, len(self.document)):
+            self.assertEqual(
+                self.jobs, list(iter_array(split(self.document, size),
+                                           'jobs')))
+
+    def test_text_chunks(self):
+        """Checks that already decoded chunks are accepted too.
+        """
+        self.assertEqual(
+            self.jobs,
+            list(iter_array(split(self.document.decode('utf-8'), 5), 'jobs')))
+
+    def test_missing_or_empty_array(self):
+        """Checks that nothing is returned if there are no items.
+        """
+        self.assertEqual([], list(iter_array([b'{}'], 'jobs')))
+        self.assertEqual([], list(iter_array([b'{"jobs": []}'], 'jobs')))
+        self.assertEqual([], list(iter_array([b'{"a": 1}'], 'jobs')))
+
+    def test_is_lazy(self):
+        """Checks that items are returned before the whole document is read.
+        """
+
+        def chunks():
+            yield b'{"jobs": [{"name": "job1"}, '
+            raise AssertionError('Read too far')
+
+        items = iter_array(chunks(), 'jobs')
+
+        self.assertEqual({'name': 'job1'}, next(items))
+
+    def test_invalid_document(self):
+        """Checks that an error is raised on malformed documents.
+        """
+        with self.assertRaises(JSONStreamError):
+            list(iter_array([b'{"jobs": [{"name": '], 'jobs'))
+
+        with self.assertRaises(JSONStreamError):
+            list(iter_array([b'["jobs"]'], 'jobs'))
+
+    def test_tricky_strings(self):
+        """Checks that brackets and escaped quotes inside strings do not
+        end items early, wherever the document is cut.
+        """
+        jobs = [{'name': 'a\\"]}[{"'}, {'name': '\\', 'n': [-1.5e3]}, 'x']
+        document = json.dumps({'jobs': jobs}).encode('utf-8')
+
+        for size in range(1, 12):
+            self.assertEqual(
+                jobs, list(iter_array(split(document, size), 'jobs')))
+
+    def test_large_item_decoded_once(self):
+        """Checks that an item spanning many chunks is decoded only once.
+        """
+        item = {'builds': [{'number': number} for number in range(1000)]}
+        document = json.dumps({'jobs': [item]}).encode('utf-8')
+
+        with patch('cibyl.utils.json.json.JSONDecoder.raw_decode',
+                   autospec=True,
+                   side_effect=json.JSONDecoder.raw_decode) as raw_decode:
+            self.assertEqual(
+                [item], list(iter_array(split(document, 16), 'jobs')))
+
+        # The key and the item
+        self.assertEqual(2, raw_decode.call_count)